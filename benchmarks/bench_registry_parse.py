@@ -0,0 +1,106 @@
+"""Benchmark manifest parsing on a synthetic registry (serial vs. parallel walker).
+
+Usage:
+    python benchmarks/bench_registry_parse.py [--items 10000] [--workers 1 2 4 8]
+
+Builds a throwaway registry with the given number of items spread over agents,
+rules, skills, workflows, and bundles, then times _scan_registry_items (the
+uncached manifest walk) for each worker count, the git-object scan used for cache
+snapshots (with and without a committed index.json), and catalog reads.
+"""
+
+import argparse
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+
+from forge.core.models import RegistrySnapshot
+from forge.core.registry import (
+    _available_cpus,
+    _scan_git_registry_items,
+    _scan_registry_items,
+    get_registry_items,
+    load_catalog_items,
+    parse_workers,
+)
+from forge.core.registry_cache import save_snapshot
+from forge.core.registry_index import write_registry_index
+
+CATEGORIES = ("agents", "rules", "skills", "workflows", "bundles")
+
+
+def build_registry(root: Path, count: int) -> None:
+    """Write count items with realistic manifests under root."""
+    for n in range(count):
+        category = CATEGORIES[n % len(CATEGORIES)]
+        item_dir = root / category / f"item-{n:05d}"
+        item_dir.mkdir(parents=True)
+        manifest = (
+            f"version: '1.{n % 10}.0'\n"
+            "project_types: [backend, data, infra]\n"
+            f"description: Synthetic {category[:-1]} number {n} used to benchmark manifests\n"
+        )
+        if category == "bundles":
+            manifest += "items:\n  - kind: rule\n    id: item-00001\n"
+            manifest += "  - kind: skill\n    id: item-00002\n"
+        (item_dir / "manifest.yaml").write_text(manifest, encoding="utf-8")
+        (item_dir / "README.md").write_text(f"# Item {n}\n", encoding="utf-8")
+
+
+def _time(fn, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=10_000)
+    cpus = _available_cpus()
+    parser.add_argument(
+        "--workers", type=int, nargs="+", default=[n for n in (1, 2, 4, 8) if n <= cpus] + [cpus]
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "registry"
+        build_registry(root, args.items)
+        default = parse_workers(args.items)
+        print(f"{args.items} items, {cpus} usable CPU(s), default {default} worker(s)")
+
+        baseline = None
+        for workers in sorted(set(args.workers)):
+            elapsed = _time(lambda: _scan_registry_items(root, workers=workers), repeat=1)
+            baseline = baseline or elapsed
+            print(f"  walk, {workers} worker(s): {elapsed:7.3f}s  ({baseline / elapsed:.1f}x)")
+
+        # No auto-gc: a background gc started by a commit makes the explicit one fail.
+        git = ["git", "-c", "user.email=bench@example.com", "-c", "user.name=bench"]
+        git += ["-c", "gc.auto=0"]
+        subprocess.run([*git, "init", "-q"], cwd=root, check=True)
+        subprocess.run([*git, "add", "-A"], cwd=root, check=True)
+        subprocess.run([*git, "commit", "-qm", "bench"], cwd=root, check=True)
+        subprocess.run([*git, "gc", "-q"], cwd=root, check=True)  # fetched mirrors are packed
+        git_scan = _time(lambda: _scan_git_registry_items(root, "HEAD"), repeat=1)
+        print(f"  git ls-tree + cat-file: {git_scan:7.3f}s  ({baseline / git_scan:.1f}x)")
+
+        # Plain directories ignore index.json; a committed one is read from git objects.
+        write_registry_index(root)
+        subprocess.run([*git, "add", "index.json"], cwd=root, check=True)
+        subprocess.run([*git, "commit", "-qm", "index"], cwd=root, check=True)
+        index_scan = _time(lambda: _scan_git_registry_items(root, "HEAD"))
+        print(f"  git + index.json:       {index_scan:7.3f}s  ({baseline / index_scan:.1f}x)")
+        (root / "index.json").unlink()
+
+        save_snapshot(root, RegistrySnapshot(url="bench", commit="bench", created_at=time.time()))
+        get_registry_items(root)
+        print(f"  catalog cache read:     {_time(lambda: load_catalog_items(root)):7.3f}s")
+        print(f"  + RegistryItem models:  {_time(lambda: get_registry_items(root)):7.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""forge cache: inspect and prune the local registry cache."""
+
+import time
+
+import typer
+from rich.console import Console
+from rich.table import Table
+
+from forge.core.cache_gc import (
+    cache_limits_from_env,
+    clear_cache,
+    gc_cache,
+    gc_store,
+    list_cache_entries,
+    mirror_sizes,
+    store_usage,
+)
+
+cache_app = typer.Typer(help="Inspect and prune the registry cache (~/.forge/cache).")
+
+
+def _format_size(size_bytes: int) -> str:
+    """Return a human-readable size (e.g. 12.3 MB)."""
+    size = float(size_bytes)
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+def _format_age(timestamp: float) -> str:
+    """Return how long ago timestamp was (e.g. 3h ago)."""
+    if timestamp <= 0:
+        return "never"
+    seconds = max(0.0, time.time() - timestamp)
+    for unit, span in (("d", 86400), ("h", 3600), ("m", 60)):
+        if seconds >= span:
+            return f"{int(seconds // span)}{unit} ago"
+    return "just now"
+
+
+@cache_app.command("ls")
+def cache_ls_cmd() -> None:
+    """List cached registry snapshots with size and last use."""
+    infos = list_cache_entries()
+    assets, asset_bytes = store_usage()
+    if not infos:
+        typer.echo("Registry cache is empty.")
+        if assets:
+            typer.echo(f"Asset store: {assets} asset(s), {_format_size(asset_bytes)}.")
+        return
+    table = Table(show_header=True, header_style="bold")
+    table.add_column("Registry")
+    table.add_column("Refs")
+    table.add_column("Commit", style="dim")
+    table.add_column("Mode", style="dim")
+    table.add_column("Size", justify="right")
+    table.add_column("Last used", style="dim")
+    for i in infos:
+        table.add_row(
+            i.url,
+            ", ".join(i.refs) or "—",
+            i.commit[:12],
+            i.mode,
+            _format_size(i.size_bytes),
+            _format_age(i.last_used),
+        )
+    Console().print(table)
+    mirrors = mirror_sizes()
+    total = sum(i.size_bytes for i in infos) + sum(mirrors.values())
+    typer.echo(f"{len(infos)} snapshot(s), {len(mirrors)} mirror(s), {_format_size(total)} total.")
+    typer.echo(f"Asset store: {assets} asset(s), {_format_size(asset_bytes)}.")
+
+
+@cache_app.command("gc")
+def cache_gc_cmd(
+    max_mb: float | None = typer.Option(
+        None,
+        "--max-mb",
+        help="Evict least-recently-used snapshots until the cache fits"
+        " (default FORGE_CACHE_MAX_MB)",
+    ),
+    max_age_days: float | None = typer.Option(
+        None,
+        "--max-age-days",
+        help="Evict snapshots unused for this many days (default FORGE_CACHE_MAX_AGE_DAYS)",
+    ),
+) -> None:
+    """Evict unreferenced, old, or least-recently-used snapshots, then unreferenced store assets."""
+    env_bytes, env_age = cache_limits_from_env()
+    max_bytes = int(max_mb * 1024 * 1024) if max_mb is not None else env_bytes
+    max_age = max_age_days * 86400 if max_age_days is not None else env_age
+    evicted = gc_cache(max_bytes=max_bytes, max_age_seconds=max_age)
+    removed, freed = gc_store()
+    if not evicted and not removed:
+        typer.echo("Nothing to evict.")
+        return
+    for i in evicted:
+        typer.echo(f"Evicted {i.url} @ {i.commit[:12]} ({_format_size(i.size_bytes)}).")
+    if removed:
+        typer.echo(f"Removed {removed} unreferenced store asset(s) ({_format_size(freed)}).")
+
+
+@cache_app.command("clear")
+def cache_clear_cmd(
+    yes: bool = typer.Option(False, "--yes", "-y", help="Do not ask for confirmation"),
+) -> None:
+    """Remove all cached registries."""
+    if not yes and not typer.confirm("Remove all cached registries?"):
+        raise typer.Exit(1)
+    removed = clear_cache()
+    typer.echo(f"Cleared registry cache ({removed} snapshot(s) removed).")
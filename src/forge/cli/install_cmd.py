@@ -1,19 +1,99 @@
-"""forge install: install an agent, rule, skill, or bundle."""
+"""forge install: install agents, rules, skills, workflows, prompts, or bundles."""
 
-from forge.core.install import install_bundle, install_item
+from pathlib import Path
+
+from forge.core.install import install_items
+from forge.core.models import LINK_MODES
 from forge.core.project import find_project_root, load_config
-from forge.core.registry import fetch_registry, get_registry_items
+from forge.core.registry import fetch_registry, get_registry_items_by_key
 from forge.core.validation import is_compatible_with_project_types
 import typer
 
+_KINDS = ("agent", "rule", "skill", "bundle", "workflow", "prompt")
+
+
+def _parse_item_args(tokens: list[str]) -> list[tuple[str, str]]:
+    """Turn ``kind id [id ...] [kind id ...]`` into (kind, id) pairs, dropping duplicates.
+
+    Raises:
+        ValueError: If an id comes before any kind, or a kind has no ids.
+    """
+    pairs: dict[tuple[str, str], None] = {}
+    kind: str | None = None
+    pending = False
+    for token in tokens:
+        if token in _KINDS:
+            if pending:
+                raise ValueError(f"No ids given after kind {kind}.")
+            kind, pending = token, True
+        elif kind is None:
+            raise ValueError(
+                f"Kind must be agent, rule, skill, bundle, workflow, or prompt; got {token}."
+            )
+        else:
+            pairs[(kind, token)] = None
+            pending = False
+    if pending or kind is None:
+        raise ValueError(
+            f"No ids given after kind {kind}." if kind else "Give a kind and at least one id."
+        )
+    return list(pairs)
+
+
+def _read_items_file(path: Path) -> list[str]:
+    """Return the kind/id tokens of an items file (whitespace-separated; # starts a comment)."""
+    try:
+        text = path.read_text(encoding="utf-8")
+    except OSError as e:
+        raise ValueError(f"Cannot read {path}: {e}")
+    return [token for line in text.splitlines() for token in line.split("#", 1)[0].split()]
+
 
 def install_cmd(
-    kind: str = typer.Argument(..., help="agent, rule, skill, bundle, workflow, or prompt"),
-    item_id: str = typer.Argument(..., help="Item id"),
+    items: list[str] | None = typer.Argument(
+        None,
+        help=(
+            "kind id [id ...] [kind id ...]; "
+            "kind is agent, rule, skill, bundle, workflow, or prompt"
+        ),
+    ),
+    items_file: Path | None = typer.Option(
+        None,
+        "--file",
+        "-f",
+        help="Read more 'kind id ...' entries from a file (# starts a comment).",
+    ),
+    link_mode: str | None = typer.Option(
+        None,
+        "--link-mode",
+        help=(
+            "copy, hardlink, symlink, or reflink files from the registry cache "
+            "(default: link_mode in config)."
+        ),
+    ),
+    dry_run: bool = typer.Option(
+        False,
+        "--dry-run",
+        help="Print what would change (files, settings.json hooks, config); change nothing.",
+    ),
 ) -> None:
-    """Install an agent, rule, skill, bundle, workflow, or prompt from the registry."""
-    if kind not in ("agent", "rule", "skill", "bundle", "workflow", "prompt"):
-        typer.echo(f"Kind must be agent, rule, skill, bundle, workflow, or prompt; got {kind}.", err=True)
+    """Install agents, rules, skills, bundles, workflows, or prompts from the registry.
+
+    Several items can be installed at once (e.g. forge install rule a b skill c bundle d):
+    they are resolved against one registry fetch and the config is written once.
+    """
+    try:
+        tokens = list(items or [])
+        if items_file is not None:
+            tokens += _read_items_file(items_file)
+        requested = _parse_item_args(tokens)
+    except ValueError as e:
+        typer.echo(str(e), err=True)
+        raise typer.Exit(1)
+    if link_mode is not None and link_mode not in LINK_MODES:
+        typer.echo(
+            f"Link mode must be copy, hardlink, symlink, or reflink; got {link_mode}.", err=True
+        )
         raise typer.Exit(1)
     project_root = find_project_root()
     if project_root is None:
@@ -28,34 +108,47 @@ def install_cmd(
     except RuntimeError as e:
         typer.echo(f"Registry error: {e}", err=True)
         raise typer.Exit(1)
-    all_items = get_registry_items(registry_root)
-    by_kind_id = {(i.kind, i.id): i for i in all_items}
-    if kind == "bundle":
-        key = ("bundle", item_id)
-        if key not in by_kind_id:
-            typer.echo(f"Bundle not found: {item_id}", err=True)
-            raise typer.Exit(1)
-        bundle_item = by_kind_id[key]
-        if not is_compatible_with_project_types(bundle_item, config.project_types):
-            typer.echo(f"Bundle {item_id} is not compatible with project types {config.project_types}.", err=True)
-            raise typer.Exit(1)
-        install_bundle(
+
+    found = get_registry_items_by_key(registry_root, requested)
+    errors: list[str] = []
+    for kind, item_id in requested:
+        item = found.get((kind, item_id))
+        if item is None:
+            errors.append(
+                f"Bundle not found: {item_id}"
+                if kind == "bundle"
+                else f"Item not found: {kind}/{item_id}"
+            )
+        elif not is_compatible_with_project_types(item, config.project_types):
+            label = f"Bundle {item_id}" if kind == "bundle" else f"{kind}/{item_id}"
+            errors.append(f"{label} is not compatible with project types {config.project_types}.")
+    if errors:
+        # Nothing is installed unless every requested item resolves.
+        for message in errors:
+            typer.echo(message, err=True)
+        raise typer.Exit(1)
+
+    bundles = [found[key] for key in requested if key[0] == "bundle"]
+    members = get_registry_items_by_key(
+        registry_root, ((ref.kind, ref.id) for bundle in bundles for ref in bundle.items or [])
+    )
+    try:
+        install_items(
             registry_root,
-            bundle_item,
-            by_kind_id,
+            [found[key] for key in requested],
+            members,
             project_root,
             config,
             config.registry.ref,
+            link_mode,
+            dry_run,
+        )
+    except (ValueError, RuntimeError) as e:
+        typer.echo(str(e), err=True)
+        raise typer.Exit(1)
+    if dry_run:
+        return
+    for kind, item_id in requested:
+        typer.echo(
+            f"Installed bundle {item_id}." if kind == "bundle" else f"Installed {kind} {item_id}."
         )
-        typer.echo(f"Installed bundle {item_id}.")
-    else:
-        key = (kind, item_id)
-        if key not in by_kind_id:
-            typer.echo(f"Item not found: {kind}/{item_id}", err=True)
-            raise typer.Exit(1)
-        item = by_kind_id[key]
-        if not is_compatible_with_project_types(item, config.project_types):
-            typer.echo(f"{kind}/{item_id} is not compatible with project types {config.project_types}.", err=True)
-            raise typer.Exit(1)
-        install_item(registry_root, item, project_root, config, config.registry.ref)
-        typer.echo(f"Installed {kind} {item_id}.")
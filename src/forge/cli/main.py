@@ -1,27 +1,126 @@
 """Typer app entrypoint for Forge CLI."""
 
+import os
+
 import typer
 
+from forge.cli.cache_cmd import cache_app
 from forge.cli.init_cmd import init_cmd
 from forge.cli.install_cmd import install_cmd
 from forge.cli.list_cmd import list_cmd
+from forge.cli.registry_cmd import registry_app
 from forge.cli.remove_cmd import remove_cmd
+from forge.cli.search_cmd import search_cmd
 from forge.cli.update_cmd import update_cmd
 from forge.cli.describe_cmd import describe_cmd
 from forge.cli.setup_cmd import setup_app
+from forge.core.install import clear_materialize_reports, get_materialize_reports
+from forge.core.registry_cache import OFFLINE_ENV, clear_fetch_reports, get_fetch_reports
+from forge.core.transaction import clear_change_plans, get_change_plans
 
 app = typer.Typer(
     name="forge",
     help="Manage AI agents, rules, and skills from a centralized registry.",
 )
 
+_STATUS_LABELS = {
+    "hit": "cache hit",
+    "refreshed": "refreshed",
+    "cloned": "cloned",
+    "offline": "offline (cached)",
+    "local": "local directory",
+    "extracted": "archive extracted",
+}
+
+
+def _print_fetch_reports() -> None:
+    """Print one stderr line per registry fetch made during this run."""
+    for r in get_fetch_reports():
+        commit = f" @ {r.commit[:12]}" if r.commit else ""
+        typer.echo(f"Registry {r.url} ({r.ref}){commit}: {_STATUS_LABELS[r.status]}", err=True)
+
+
+def _print_materialize_reports() -> None:
+    """Print one stderr line per item copied into the project: files written vs. up to date."""
+    for r in get_materialize_reports():
+        linked = f" ({r.linked} linked)" if r.linked else ""
+        typer.echo(
+            f"  {r.kind}/{r.id}: {r.written} written{linked}, {r.skipped} unchanged", err=True
+        )
+
+
+def _print_change_plans() -> None:
+    """Print the plan of each --dry-run: item changes, then file and settings.json changes."""
+    for plan in get_change_plans():
+        if plan.is_empty():
+            typer.echo(f"Dry run: nothing to change ({len(plan.unchanged)} file(s) up to date).")
+            continue
+        typer.echo("Dry run: nothing was changed. Plan:")
+        for c in plan.items:
+            if c.old_version is None:
+                typer.echo(f"  + {c.kind} {c.id} {c.new_version}")
+            elif c.new_version is None:
+                typer.echo(f"  - {c.kind} {c.id} {c.old_version}")
+            else:
+                typer.echo(f"  ~ {c.kind} {c.id} {c.old_version} -> {c.new_version}")
+        for label, paths in (
+            ("create", plan.create),
+            ("overwrite", plan.overwrite),
+            ("delete", plan.delete),
+        ):
+            for path in paths:
+                typer.echo(f"  {label:<9} {path}")
+        for entry in plan.hooks_added:
+            typer.echo(f"  settings.json + {entry}")
+        for entry in plan.hooks_removed:
+            typer.echo(f"  settings.json - {entry}")
+        typer.echo(f"  {len(plan.unchanged)} file(s) unchanged")
+
+
+def _restore_env(name: str, value: str | None) -> None:
+    """Put environment variable name back to value (unset it if value is None)."""
+    if value is None:
+        os.environ.pop(name, None)
+    else:
+        os.environ[name] = value
+
+
+@app.callback()
+def main_callback(
+    ctx: typer.Context,
+    offline: bool = typer.Option(
+        False,
+        "--offline",
+        envvar=OFFLINE_ENV,
+        help="Use the cached registry as-is; never fetch from the remote (also FORGE_OFFLINE=1).",
+    ),
+) -> None:
+    """Manage AI agents, rules, and skills from a centralized registry."""
+    if offline:
+        # The core reads FORGE_OFFLINE; set it for this command only.
+        previous = os.environ.get(OFFLINE_ENV)
+        ctx.call_on_close(lambda: _restore_env(OFFLINE_ENV, previous))
+        os.environ[OFFLINE_ENV] = "1"
+    clear_fetch_reports()
+    clear_materialize_reports()
+    clear_change_plans()
+    # Close callbacks run last-in first-out: fetch lines, then per-item file counts,
+    # then dry-run plans.
+    ctx.call_on_close(_print_change_plans)
+    ctx.call_on_close(_print_materialize_reports)
+    ctx.call_on_close(_print_fetch_reports)
+
+
 app.command("init")(init_cmd)
 app.command("list")(list_cmd)
 app.command("install")(install_cmd)
 app.command("remove")(remove_cmd)
 app.command("update")(update_cmd)
 app.command("describe")(describe_cmd)
+app.command("search")(search_cmd)
 app.add_typer(setup_app, name="setup")
+app.add_typer(cache_app, name="cache")
+app.add_typer(registry_app, name="registry")
 
 def main() -> None:
     """Entry point for the forge console script."""
@@ -0,0 +1,43 @@
+"""forge registry: commands for registry maintainers."""
+
+from pathlib import Path
+
+import typer
+
+from forge.core.registry_index import (
+    INDEX_FILENAME,
+    is_registry_index_current,
+    write_registry_index,
+)
+from forge.core.registry_init import is_registry_root
+
+registry_app = typer.Typer(help="Commands for maintaining a registry repo.")
+
+
+@registry_app.command("build-index")
+def build_index_cmd(
+    path: Path = typer.Option(
+        Path("."), "--path", help="Registry root (default: current directory)"
+    ),
+    check: bool = typer.Option(
+        False,
+        "--check",
+        help="Do not write; exit 1 if index.json is missing or out of date (for CI).",
+    ),
+) -> None:
+    """Write index.json at the registry root so consumers load the catalog in one read."""
+    root = path.resolve()
+    if not is_registry_root(root):
+        typer.echo(f"Not a registry root (no category directories): {root}", err=True)
+        raise typer.Exit(1)
+    if check:
+        if not is_registry_index_current(root):
+            typer.echo(
+                f"{INDEX_FILENAME} is missing or out of date; run forge registry build-index.",
+                err=True,
+            )
+            raise typer.Exit(1)
+        typer.echo(f"{INDEX_FILENAME} is up to date.")
+        return
+    index_path, index = write_registry_index(root)
+    typer.echo(f"Wrote {index_path} ({len(index.items)} item(s)).")
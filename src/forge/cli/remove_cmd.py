@@ -8,6 +8,11 @@ import typer
 def remove_cmd(
     kind: str = typer.Argument(..., help="agent, rule, skill, workflow, prompt, or bundle"),
     item_id: str = typer.Argument(..., help="Item id"),
+    dry_run: bool = typer.Option(
+        False,
+        "--dry-run",
+        help="Print what would change (files, settings.json hooks, config); change nothing.",
+    ),
 ) -> None:
     """Remove an installed agent, rule, skill, workflow, or prompt."""
     if kind not in ("agent", "rule", "skill", "workflow", "prompt", "bundle"):
@@ -22,10 +27,11 @@ def remove_cmd(
         typer.echo("No .forge/config.yaml found.", err=True)
         raise typer.Exit(1)
     if kind == "bundle":
-        ok = remove_bundle(project_root, config, item_id)
+        ok = remove_bundle(project_root, config, item_id, dry_run)
     else:
-        ok = remove_item(project_root, config, kind, item_id)
+        ok = remove_item(project_root, config, kind, item_id, dry_run)
     if not ok:
         typer.echo(f"{kind} {item_id} is not installed.", err=True)
         raise typer.Exit(1)
-    typer.echo(f"Removed {kind} {item_id}.")
+    if not dry_run:
+        typer.echo(f"Removed {kind} {item_id}.")
@@ -0,0 +1,64 @@
+"""forge search: full-text search over registry items."""
+
+import typer
+from rich.console import Console
+from rich.table import Table
+
+from forge.core.models import ItemKind
+from forge.core.project import find_project_root, load_config
+from forge.core.registry import fetch_registry
+from forge.core.search import search_registry
+
+
+def search_cmd(
+    query: list[str] = typer.Argument(..., help="Search terms"),
+    category: ItemKind | None = typer.Option(
+        None,
+        "--category",
+        "-c",
+        help="Filter by kind: agent, rule, skill, bundle, workflow, prompt",
+    ),
+    body: bool = typer.Option(
+        False, "--body", "-b", help="Also search item content (RULE.md, SKILL.md, agent .md, ...)"
+    ),
+    all_items: bool = typer.Option(
+        False, "--all", "-a", help="Search all items, not only those for current project types"
+    ),
+    limit: int = typer.Option(20, "--limit", "-n", help="Maximum number of results"),
+) -> None:
+    """Search registry items by id, description, and optionally content."""
+    project_root = find_project_root()
+    if project_root is None:
+        typer.echo("Not in a Forge project. Run 'forge init' first.", err=True)
+        raise typer.Exit(1)
+    config = load_config(project_root)
+    if config is None:
+        typer.echo("No .forge/config.yaml found. Run 'forge init' first.", err=True)
+        raise typer.Exit(1)
+    try:
+        registry_root = fetch_registry(config.registry.url, config.registry.ref)
+    except RuntimeError as e:
+        typer.echo(f"Registry error: {e}", err=True)
+        raise typer.Exit(1)
+    hits = search_registry(
+        registry_root,
+        " ".join(query),
+        include_body=body,
+        kind=category,
+        project_types=None if all_items else list(config.project_types),
+        limit=limit,
+    )
+    if not hits:
+        typer.echo("No items found.")
+        return
+    table = Table(show_header=True, header_style="bold")
+    table.add_column("Kind", style="dim")
+    table.add_column("ID")
+    table.add_column("Version", style="dim")
+    table.add_column("Description", no_wrap=False)
+    table.add_column("Score", style="dim", justify="right")
+    for h in hits:
+        table.add_row(
+            h.item.kind, h.item.id, h.item.version, h.item.description or "", f"{h.score:.2f}"
+        )
+    Console().print(table)
@@ -1,5 +1,6 @@
 """forge update: update installed items."""
 
+from forge.core.models import LINK_MODES
 from forge.core.project import find_project_root, load_config
 from forge.core.update import update_all, update_bundle, update_item
 import typer
@@ -8,8 +9,26 @@ import typer
 def update_cmd(
     kind: str | None = typer.Argument(None, help="agent, rule, skill, workflow, prompt, or bundle (omit to update all)"),
     item_id: str | None = typer.Argument(None, help="Item id (required if kind is set)"),
+    link_mode: str | None = typer.Option(
+        None,
+        "--link-mode",
+        help=(
+            "copy, hardlink, symlink, or reflink files from the registry cache "
+            "(default: link_mode in config)."
+        ),
+    ),
+    dry_run: bool = typer.Option(
+        False,
+        "--dry-run",
+        help="Print what would change (files, settings.json hooks, config); change nothing.",
+    ),
 ) -> None:
     """Update all installed items, or a single item if kind and id are given."""
+    if link_mode is not None and link_mode not in LINK_MODES:
+        typer.echo(
+            f"Link mode must be copy, hardlink, symlink, or reflink; got {link_mode}.", err=True
+        )
+        raise typer.Exit(1)
     if (kind is None) != (item_id is None):
         typer.echo("Provide both kind and id to update one item, or neither to update all.", err=True)
         raise typer.Exit(1)
@@ -19,13 +38,15 @@ def update_cmd(
             typer.echo("Not in a Forge project. Run 'forge init' first.", err=True)
             raise typer.Exit(1)
         try:
-            updated = update_all(project_root)
+            updated = update_all(project_root, link_mode, dry_run)
         except RuntimeError as e:
             typer.echo(f"Error: {e}", err=True)
             raise typer.Exit(1)
         if not updated:
             typer.echo("Nothing to update (or no items installed).")
             return
+        if dry_run:
+            return
         for k, i in updated:
             typer.echo(f"Updated {k} {i}.")
         return
@@ -42,13 +63,14 @@ def update_cmd(
         raise typer.Exit(1)
     try:
         if kind == "bundle":
-            ok = update_bundle(project_root, config, item_id)
+            ok = update_bundle(project_root, config, item_id, link_mode, dry_run)
         else:
-            ok = update_item(project_root, config, kind, item_id)
-    except ValueError as e:
+            ok = update_item(project_root, config, kind, item_id, link_mode, dry_run)
+    except (ValueError, RuntimeError) as e:
         typer.echo(str(e), err=True)
         raise typer.Exit(1)
     if not ok:
         typer.echo(f"{kind} {item_id} is not installed or could not be updated.", err=True)
         raise typer.Exit(1)
-    typer.echo(f"Updated {kind} {item_id}.")
+    if not dry_run:
+        typer.echo(f"Updated {kind} {item_id}.")
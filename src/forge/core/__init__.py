@@ -1,9 +1,16 @@
 """Core business logic: registry resolution, install, update, remove, validation."""
 
-from forge.core.install import install_bundle, install_item
+from forge.core.install import install_bundle, install_item, install_items
 from forge.core.list_items import list_items
 from forge.core.project import find_project_root, load_config, save_config
-from forge.core.registry import fetch_registry, get_registry_items
+from forge.core.registry import (
+    fetch_registry,
+    get_catalog,
+    get_catalog_store,
+    get_registry_item,
+    get_registry_items,
+    get_registry_items_by_key,
+)
 from forge.core.remove import remove_bundle, remove_item
 from forge.core.setup import (
     configure_mcp,
@@ -21,12 +28,17 @@ from forge.core.validation import is_compatible_with_project_type, is_compatible
 __all__ = [
     "install_item",
     "install_bundle",
+    "install_items",
     "list_items",
     "load_config",
     "save_config",
     "find_project_root",
     "fetch_registry",
     "get_registry_items",
+    "get_registry_item",
+    "get_registry_items_by_key",
+    "get_catalog",
+    "get_catalog_store",
     "remove_item",
     "remove_bundle",
     "update_all",
@@ -0,0 +1,161 @@
+"""Content-addressed store of registry files shared by every project on the host.
+
+Layout next to the registry cache (~/.forge/store)::
+
+    <sha256>          one registry file, named by the SHA-256 of its content
+    <sha256>.x        same, for executable files (the mode is part of the identity)
+    tmp/              files being added (renamed into place once hashed)
+    projects/<key>    path of a project that links into the store (for gc)
+
+Linked installs (hardlink, symlink, reflink) point project files at store entries
+rather than into a cache snapshot, so an asset used by many projects and refs is
+stored once, and links keep working after ``forge cache gc`` evicts the snapshot
+they came from. Each snapshot keeps a ``<commit>.store`` sidecar mapping file
+paths to entry names, so files are hashed once per snapshot. Entries are copies
+of the registry file, read-only and never modified once written, so nothing a
+project does to a hard-linked file can reach the snapshot it came from.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import uuid
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from forge.core.registry_cache import store_index_path, write_json_atomic
+
+if TYPE_CHECKING:
+    from forge.core.registry_files import RegistryFiles
+
+STORE_DIRNAME = "store"
+_HASH_CHUNK = 1 << 20
+
+
+def store_root(cache_dir: Path) -> Path:
+    """Return the asset store directory for a cache root (~/.forge/cache -> ~/.forge/store)."""
+    return Path(cache_dir).parent / STORE_DIRNAME
+
+
+def _file_digest(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(_HASH_CHUNK):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class AssetStore:
+    """One content-addressed store directory. Thread-safe; safe to share between processes."""
+
+    def __init__(self, root: Path) -> None:
+        self.root = Path(root)
+        self._lock = threading.Lock()
+        self._indexes: dict[Path, dict[str, str]] = {}
+
+    def entry_path(self, name: str) -> Path:
+        """Return the path of entry name (``<sha256>`` or ``<sha256>.x``)."""
+        return self.root / name
+
+    def _index(self, snapshot: Path) -> dict[str, str]:
+        index = self._indexes.get(snapshot)
+        if index is None:
+            try:
+                data = json.loads(store_index_path(snapshot).read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                data = {}
+            index = self._indexes[snapshot] = data if isinstance(data, dict) else {}
+        return index
+
+    def _add(self, files: "RegistryFiles", rel: str) -> str:
+        """Put file rel into the store (unless its content is there) and return its entry name."""
+        tmp_dir = self.root / "tmp"
+        tmp_dir.mkdir(parents=True, exist_ok=True)
+        tmp = tmp_dir / uuid.uuid4().hex
+        try:
+            # Always a copy: a link to the snapshot file would let an edit through a
+            # hardlink install change the snapshot and every project sharing the entry.
+            files.copy_file(rel, tmp)
+            mode = tmp.stat().st_mode
+            tmp.chmod(mode & ~0o222)
+            name = _file_digest(tmp) + (".x" if mode & 0o111 else "")
+            final = self.entry_path(name)
+            if final.exists():
+                tmp.unlink()
+            else:
+                os.replace(tmp, final)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+        return name
+
+    def ingest(self, files: "RegistryFiles", rel: str, snapshot: Path) -> Path:
+        """Return the store entry holding file rel of a cache snapshot, adding it on first use.
+
+        Raises:
+            FileNotFoundError: If rel is not a file.
+        """
+        entry = self.lookup(rel, snapshot)
+        if entry is not None:
+            return entry
+        name = self._add(files, rel)
+        with self._lock:
+            index = self._index(snapshot)
+            index[rel] = name
+            write_json_atomic(store_index_path(snapshot), index)
+        return self.entry_path(name)
+
+    def lookup(self, rel: str, snapshot: Path) -> Path | None:
+        """Return the store entry already holding file rel of a cache snapshot, or None."""
+        with self._lock:
+            name = self._index(snapshot).get(rel)
+        if name is not None and self.entry_path(name).is_file():
+            return self.entry_path(name)
+        return None
+
+    def register_project(self, project_root: Path) -> None:
+        """Remember that project_root may link into the store, so gc keeps what it uses."""
+        path = str(Path(project_root).resolve())
+        marker = self.root / "projects" / hashlib.sha256(path.encode()).hexdigest()[:16]
+        if not marker.exists():
+            marker.parent.mkdir(parents=True, exist_ok=True)
+            marker.write_text(path, encoding="utf-8")
+
+    def projects(self) -> list[Path]:
+        """Return registered project roots that still exist; forget the others."""
+        roots: list[Path] = []
+        projects_dir = self.root / "projects"
+        if not projects_dir.is_dir():
+            return roots
+        for marker in projects_dir.iterdir():
+            try:
+                root = Path(marker.read_text(encoding="utf-8").strip())
+            except OSError:
+                continue
+            if (root / ".forge" / "config.yaml").is_file():
+                roots.append(root)
+            else:
+                marker.unlink(missing_ok=True)
+        return roots
+
+    def entries(self) -> list[Path]:
+        """Return every entry in the store."""
+        if not self.root.is_dir():
+            return []
+        return [p for p in self.root.iterdir() if p.is_file() and not p.name.startswith(".")]
+
+
+_stores: dict[Path, AssetStore] = {}
+_stores_lock = threading.Lock()
+
+
+def asset_store(cache_dir: Path) -> AssetStore:
+    """Return the (per-process shared) asset store for a cache root, creating its directory."""
+    root = store_root(cache_dir)
+    with _stores_lock:
+        store = _stores.get(root)
+        if store is None:
+            root.mkdir(parents=True, exist_ok=True)
+            store = _stores[root] = AssetStore(root)
+    return store
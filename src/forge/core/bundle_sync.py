@@ -1,10 +1,12 @@
 """Sync installed bundles with registry: install, reconcile members, refcount-aware removal."""
 
+from collections.abc import Mapping
 from pathlib import Path
 
-from forge.core.install import copy_registry_item_to_project
-from forge.core.models import BundleItemRef, InstalledBundle, ProjectConfig, RegistryItem
+from forge.core.install import copy_registry_items_to_project
+from forge.core.models import BundleItemRef, InstalledBundle, LinkMode, ProjectConfig, RegistryItem
 from forge.core.remove import remove_member_files
+from forge.core.transaction import Transaction
 from forge.core.validation import is_compatible_with_project_types
 
 
@@ -29,7 +31,7 @@ def member_refcount(
 
 def _validate_bundle_members(
     bundle_item: RegistryItem,
-    items_by_kind_id: dict[tuple[str, str], RegistryItem],
+    items_by_kind_id: Mapping[tuple[str, str], RegistryItem],
     project_types: list[str],
 ) -> None:
     if not bundle_item.items:
@@ -45,15 +47,45 @@ def _validate_bundle_members(
             )
 
 
+def _copy_members(
+    registry_root: Path,
+    project_root: Path,
+    config: ProjectConfig,
+    refs: list[BundleItemRef],
+    items_by_kind_id: Mapping[tuple[str, str], RegistryItem],
+    link_mode: LinkMode,
+    txn: Transaction | None,
+) -> None:
+    """Materialize bundle members in one batch (parallel copies, serial hooks)."""
+    members = [items_by_kind_id[(r.kind, r.id)] for r in refs]
+    copy_registry_items_to_project(
+        registry_root, members, project_root, config.tool, link_mode, txn
+    )
+
+
 def sync_bundle_with_registry(
     registry_root: Path,
     project_root: Path,
     config: ProjectConfig,
     bundle_item: RegistryItem,
-    items_by_kind_id: dict[tuple[str, str], RegistryItem],
+    items_by_kind_id: Mapping[tuple[str, str], RegistryItem],
     source_ref: str,
+    link_mode: LinkMode | None = None,
+    *,
+    copy_members: bool = True,
+    txn: Transaction | None = None,
 ) -> None:
-    """Install or reconcile one bundle: update files and exactly one InstalledBundle row. Does not save config."""
+    """Install or reconcile a bundle's files and its one InstalledBundle row. Does not save config.
+
+    Member files are materialized in one batch with link_mode (default: config.link_mode).
+    With copy_members False only the row is updated and dropped members' files are
+    removed; the caller copies the members (e.g. together with other items).
+    With txn, file changes are staged in the transaction.
+
+    Raises:
+        ValueError: If a member is unknown or incompatible with the project types.
+        MaterializeError: If some members could not be copied (config is left unchanged).
+    """
     if bundle_item.kind != "bundle" or not bundle_item.items:
         raise ValueError("Not a bundle or bundle has no items")
     _validate_bundle_members(bundle_item, items_by_kind_id, config.project_types)
@@ -61,6 +93,7 @@ def sync_bundle_with_registry(
     new_refs = list(bundle_item.items)
     new_keys = {(r.kind, r.id) for r in new_refs}
     bundle_id = bundle_item.id
+    link_mode = link_mode or config.link_mode
 
     idx: int | None = None
     for i, b in enumerate(config.installed_bundles):
@@ -73,10 +106,11 @@ def sync_bundle_with_registry(
         old_keys = {(r.kind, r.id) for r in old_bundle.members}
         for kind, mid in old_keys - new_keys:
             if member_refcount(config, kind, mid, exclude_bundle_id=bundle_id) == 0:
-                remove_member_files(project_root, kind, mid, config.tool)
-        for kind, mid in new_keys:
-            member = items_by_kind_id[(kind, mid)]
-            copy_registry_item_to_project(registry_root, member, project_root, config.tool)
+                remove_member_files(project_root, kind, mid, config.tool, txn)
+        if copy_members:
+            _copy_members(
+                registry_root, project_root, config, new_refs, items_by_kind_id, link_mode, txn
+            )
         config.installed_bundles[idx] = InstalledBundle(
             id=bundle_id,
             version=bundle_item.version,
@@ -84,9 +118,10 @@ def sync_bundle_with_registry(
             members=list(new_refs),
         )
     else:
-        for ref in new_refs:
-            member = items_by_kind_id[(ref.kind, ref.id)]
-            copy_registry_item_to_project(registry_root, member, project_root, config.tool)
+        if copy_members:
+            _copy_members(
+                registry_root, project_root, config, new_refs, items_by_kind_id, link_mode, txn
+            )
         config.installed_bundles.append(
             InstalledBundle(
                 id=bundle_id,
@@ -0,0 +1,344 @@
+"""Inspect and prune the registry cache and asset store: listing, LRU collection, and clearing."""
+
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+
+from forge.core.asset_store import asset_store
+from forge.core.git import run_git
+from forge.core.models import CacheSnapshotInfo, RegistryCacheEntry
+from forge.core.registry_cache import (
+    cache_lock,
+    cache_root,
+    catalog_db_path,
+    catalog_path,
+    entry_meta_path,
+    load_cache_entry,
+    load_snapshot,
+    mirror_path,
+    registry_cache_key,
+    search_index_path,
+    snapshot_last_used,
+    snapshot_path,
+    store_index_path,
+)
+
+CACHE_MAX_MB_ENV = "FORGE_CACHE_MAX_MB"
+CACHE_MAX_AGE_DAYS_ENV = "FORGE_CACHE_MAX_AGE_DAYS"
+# Snapshots used more recently than this are never evicted: a concurrent run may be reading them.
+GC_GRACE_SECONDS = 600.0
+
+
+def _dir_size(path: Path) -> int:
+    """Return the total size in bytes of regular files under path (symlinks not followed)."""
+    total = 0
+    for dirpath, _dirnames, filenames in os.walk(path):
+        for name in filenames:
+            try:
+                total += os.lstat(os.path.join(dirpath, name)).st_size
+            except OSError:
+                continue
+    return total
+
+
+def _cache_entries(root: Path) -> list[tuple[Path, RegistryCacheEntry]]:
+    """Return (entry path, entry) for every url+ref entry in the cache root."""
+    result: list[tuple[Path, RegistryCacheEntry]] = []
+    for meta in root.glob("*.json"):
+        entry_path = meta.with_suffix("")
+        entry = load_cache_entry(entry_path)
+        if entry is not None:
+            result.append((entry_path, entry))
+    return result
+
+
+def list_cache_entries(cache_dir: Path | None = None) -> list[CacheSnapshotInfo]:
+    """List cached registry snapshots with size, last use, and the refs pointing at them.
+
+    Args:
+        cache_dir: Override cache root (for tests). Defaults to ~/.forge/cache.
+
+    Returns:
+        Snapshots ordered from most to least recently used.
+    """
+    root = cache_dir or cache_root()
+    refs_by_snapshot: dict[Path, list[str]] = {}
+    for _entry_path, entry in _cache_entries(root):
+        snap = snapshot_path(root, entry.url, entry.commit)
+        refs_by_snapshot.setdefault(snap, []).append(entry.ref)
+
+    infos: list[CacheSnapshotInfo] = []
+    snapshots_dir = root / "snapshots"
+    if snapshots_dir.is_dir():
+        for url_dir in snapshots_dir.iterdir():
+            if not url_dir.is_dir():
+                continue
+            for sidecar in url_dir.glob("*.json"):
+                snap = sidecar.with_suffix("")
+                meta = load_snapshot(snap)
+                if meta is None:
+                    continue
+                infos.append(
+                    CacheSnapshotInfo(
+                        url=meta.url,
+                        commit=meta.commit,
+                        refs=sorted(refs_by_snapshot.get(snap, [])),
+                        mode=meta.mode,
+                        size_bytes=_dir_size(snap),
+                        last_used=snapshot_last_used(snap),
+                        path=str(snap),
+                    )
+                )
+    infos.sort(key=lambda i: i.last_used, reverse=True)
+    return infos
+
+
+def mirror_sizes(cache_dir: Path | None = None) -> dict[str, int]:
+    """Return the on-disk size of each URL's shared mirror, keyed by URL."""
+    root = cache_dir or cache_root()
+    urls = {i.url for i in list_cache_entries(root)} | {e.url for _p, e in _cache_entries(root)}
+    return {
+        url: _dir_size(mirror_path(root, url)) for url in urls if mirror_path(root, url).is_dir()
+    }
+
+
+def _evict_snapshot(root: Path, info: CacheSnapshotInfo) -> bool:
+    """Delete one snapshot and the entries pointing at it; drop the mirror if nothing is left.
+
+    Returns True if the URL's mirror was removed too. Caller holds cache_lock for info.url.
+    """
+    snap = Path(info.path)
+    mirror = mirror_path(root, info.url)
+    for entry_path, entry in _cache_entries(root):
+        if entry.url == info.url and entry.commit == info.commit:
+            entry_meta_path(entry_path).unlink(missing_ok=True)
+            if mirror.is_dir():
+                try:
+                    ref = f"refs/forge/{registry_cache_key(entry.url, entry.ref)}"
+                    run_git(["update-ref", "-d", ref], cwd=mirror)
+                except RuntimeError:
+                    pass
+    if mirror.is_dir():
+        try:
+            # Pin held by bare-mode snapshots (no worktree keeps their commit reachable).
+            run_git(["update-ref", "-d", f"refs/forge/snapshots/{info.commit}"], cwd=mirror)
+        except RuntimeError:
+            pass
+    entry_meta_path(snap).unlink(missing_ok=True)
+    catalog_path(snap).unlink(missing_ok=True)
+    catalog_db_path(snap).unlink(missing_ok=True)
+    search_index_path(snap).unlink(missing_ok=True)
+    store_index_path(snap).unlink(missing_ok=True)
+    shutil.rmtree(snap, ignore_errors=True)
+
+    remaining = [p for p in snap.parent.glob("*.json")] if snap.parent.is_dir() else []
+    if not remaining:
+        shutil.rmtree(snap.parent, ignore_errors=True)
+        shutil.rmtree(mirror, ignore_errors=True)
+        return True
+    if mirror.is_dir():
+        try:
+            run_git(["worktree", "prune"], cwd=mirror)
+        except RuntimeError:
+            pass
+    return False
+
+
+def gc_cache(
+    cache_dir: Path | None = None,
+    max_bytes: int | None = None,
+    max_age_seconds: float | None = None,
+    grace_seconds: float = GC_GRACE_SECONDS,
+    now: float | None = None,
+) -> list[CacheSnapshotInfo]:
+    """Evict registry snapshots least-recently-used first.
+
+    Snapshots no ref points at any more are always evicted; snapshots unused for
+    longer than max_age_seconds are evicted; then, while the cache (snapshots plus
+    mirrors) is larger than max_bytes, the least recently used snapshot is evicted.
+    A URL's mirror is removed together with its last snapshot. Snapshots used within
+    grace_seconds are kept, since a concurrent run may still be reading them.
+
+    Args:
+        cache_dir: Override cache root (for tests). Defaults to ~/.forge/cache.
+        max_bytes: Size cap for the whole cache, or None for no cap.
+        max_age_seconds: Evict snapshots unused for longer than this, or None.
+        grace_seconds: Never evict snapshots used more recently than this.
+        now: Current Unix time (for tests).
+
+    Returns:
+        The evicted snapshots.
+    """
+    root = cache_dir or cache_root()
+    current = time.time() if now is None else now
+    infos = sorted(list_cache_entries(root), key=lambda i: i.last_used)
+    sizes = mirror_sizes(root)
+    total = sum(i.size_bytes for i in infos) + sum(sizes.values())
+    evicted: list[CacheSnapshotInfo] = []
+
+    def _evictable(last_used: float, refs: list[str]) -> bool:
+        if current - last_used < grace_seconds:
+            return False
+        unreferenced = not refs
+        too_old = max_age_seconds is not None and current - last_used > max_age_seconds
+        too_big = max_bytes is not None and total > max_bytes
+        return unreferenced or too_old or too_big
+
+    for info in infos:
+        if not _evictable(info.last_used, info.refs):
+            continue
+        with cache_lock(root, info.url):
+            # The listing was read without the lock: a concurrent fetch may since have
+            # re-pointed a ref at this snapshot, used it, or evicted it.
+            snap = Path(info.path)
+            if load_snapshot(snap) is None:
+                continue
+            info = info.model_copy(
+                update={
+                    "last_used": snapshot_last_used(snap),
+                    "refs": sorted(
+                        e.ref
+                        for _p, e in _cache_entries(root)
+                        if e.url == info.url and e.commit == info.commit
+                    ),
+                }
+            )
+            if not _evictable(info.last_used, info.refs):
+                continue
+            if _evict_snapshot(root, info):
+                total -= sizes.pop(info.url, 0)
+        total -= info.size_bytes
+        evicted.append(info)
+    return evicted
+
+
+def _linked_store_entries(
+    store_dir: Path, project_root: Path, inodes: dict[tuple[int, int], str]
+) -> set[str]:
+    """Return the names of store entries that files under project_root's tool directories link to.
+
+    Symlinks are matched by target; hard links by inode (inodes maps (st_dev, st_ino)
+    to entry name).
+    """
+    names: set[str] = set()
+    for tool_dir in (project_root / ".cursor", project_root / ".claude"):
+        for dirpath, _dirnames, filenames in os.walk(tool_dir):
+            for name in filenames:
+                path = Path(dirpath) / name
+                if path.is_symlink():
+                    target = Path(os.readlink(path))
+                    if target.parent == store_dir:
+                        names.add(target.name)
+                    continue
+                try:
+                    st = path.stat()
+                except OSError:
+                    continue
+                entry = inodes.get((st.st_dev, st.st_ino)) if st.st_nlink > 1 else None
+                if entry is not None:
+                    names.add(entry)
+    return names
+
+
+def store_usage(cache_dir: Path | None = None) -> tuple[int, int]:
+    """Return (entry count, total bytes) of the asset store next to the cache."""
+    entries = asset_store(cache_dir or cache_root()).entries()
+    return len(entries), sum(p.stat().st_size for p in entries)
+
+
+def gc_store(
+    cache_dir: Path | None = None,
+    grace_seconds: float = GC_GRACE_SECONDS,
+    now: float | None = None,
+) -> tuple[int, int]:
+    """Delete asset store entries nothing references any more.
+
+    An entry is kept while a cached snapshot lists it (its ``.store`` index), or
+    while a registered project hard-links or symlinks to it. Copies and reflinks do
+    not depend on the store. Entries added within grace_seconds are kept, since a
+    concurrent install may be about to link them.
+
+    Args:
+        cache_dir: Override cache root (for tests). Defaults to ~/.forge/cache.
+        grace_seconds: Never delete entries created more recently than this.
+        now: Current Unix time (for tests).
+
+    Returns:
+        (entries deleted, bytes freed).
+    """
+    root = cache_dir or cache_root()
+    store = asset_store(root)
+    current = time.time() if now is None else now
+    live: set[str] = set()
+    for index in (root / "snapshots").glob("*/*.store"):
+        try:
+            live.update(json.loads(index.read_text(encoding="utf-8")).values())
+        except (OSError, ValueError, AttributeError):
+            continue
+    stats: dict[Path, os.stat_result] = {}
+    for entry in store.entries():
+        try:
+            stats[entry] = entry.stat()
+        except OSError:
+            continue
+    inodes = {(st.st_dev, st.st_ino): entry.name for entry, st in stats.items()}
+    for project_root in store.projects():
+        live |= _linked_store_entries(store.root, project_root, inodes)
+
+    removed = freed = 0
+    for entry, st in stats.items():
+        # ctime, not mtime: copy_file keeps the registry file's mtime.
+        if entry.name in live or current - st.st_ctime < grace_seconds:
+            continue
+        entry.unlink(missing_ok=True)
+        removed += 1
+        freed += st.st_size
+    return removed, freed
+
+
+def clear_cache(cache_dir: Path | None = None) -> int:
+    """Remove every snapshot, mirror, and entry from the cache; return the snapshot count."""
+    root = cache_dir or cache_root()
+    infos = list_cache_entries(root)
+    for info in infos:
+        with cache_lock(root, info.url):
+            _evict_snapshot(root, info)
+    for child in root.iterdir():
+        if child.name == "locks":
+            continue
+        if child.is_dir():
+            shutil.rmtree(child, ignore_errors=True)
+        else:
+            child.unlink(missing_ok=True)
+    return len(infos)
+
+
+def cache_limits_from_env() -> tuple[int | None, float | None]:
+    """Return (max_bytes, max_age_seconds) from FORGE_CACHE_MAX_MB and FORGE_CACHE_MAX_AGE_DAYS."""
+
+    def _number(name: str) -> float | None:
+        raw = os.environ.get(name, "").strip()
+        if not raw:
+            return None
+        try:
+            value = float(raw)
+        except ValueError:
+            return None
+        return value if value >= 0 else None
+
+    max_mb = _number(CACHE_MAX_MB_ENV)
+    max_days = _number(CACHE_MAX_AGE_DAYS_ENV)
+    return (
+        int(max_mb * 1024 * 1024) if max_mb is not None else None,
+        max_days * 86400 if max_days is not None else None,
+    )
+
+
+def enforce_cache_limits(cache_dir: Path | None = None) -> list[CacheSnapshotInfo]:
+    """Run gc_cache with the limits from the environment; no-op if none are set."""
+    max_bytes, max_age = cache_limits_from_env()
+    if max_bytes is None and max_age is None:
+        return []
+    return gc_cache(cache_dir, max_bytes=max_bytes, max_age_seconds=max_age)
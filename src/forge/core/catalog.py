@@ -0,0 +1,289 @@
+"""Compact in-memory registry catalog records.
+
+A validated pydantic RegistryItem per item, each with its own lists, dominates start-up
+time and memory for catalogs of tens of thousands of items. CatalogItem is a slotted
+record with interned strings, a project-type bitmask, and shared bundle-reference
+tuples. RegistryItem models are only built at API boundaries via to_registry_item.
+Catalog indexes a snapshot's records for lookups and filtered queries.
+"""
+
+import heapq
+import sys
+from collections.abc import Iterable, Iterator, Mapping
+from typing import Any
+
+from forge.core.models import ITEM_KINDS, PROJECT_TYPES, RegistryItem
+
+PROJECT_TYPE_BITS: dict[str, int] = {pt: 1 << n for n, pt in enumerate(PROJECT_TYPES)}
+
+BundleRef = tuple[str, str]
+_MEMBER_KINDS: tuple[str, ...] = tuple(k for k in ITEM_KINDS if k != "bundle")
+
+_intern = sys.intern
+_shared_refs: dict[BundleRef, BundleRef] = {}
+_shared_project_types: dict[tuple[str, ...], tuple[str, ...]] = {}
+
+
+def project_type_mask(project_types: Iterable[str]) -> int:
+    """Return the bitmask of the known project types in project_types (unknown ones add no bit)."""
+    mask = 0
+    for pt in project_types:
+        mask |= PROJECT_TYPE_BITS.get(pt, 0)
+    return mask
+
+
+def _shared_ref(kind: str, item_id: str) -> BundleRef:
+    """Return one shared (kind, id) tuple per distinct bundle reference."""
+    ref = (_intern(kind), _intern(item_id))
+    return _shared_refs.setdefault(ref, ref)
+
+
+def _shared_types(project_types: Iterable[str]) -> tuple[str, ...]:
+    """Return one shared tuple per distinct project-types list (most items use a handful)."""
+    key = tuple(_intern(pt) for pt in project_types)
+    return _shared_project_types.setdefault(key, key)
+
+
+class CatalogItem:
+    """Validation-free record for one registry item (see RegistryItem for field meanings)."""
+
+    __slots__ = ("kind", "id", "version", "project_types", "description", "path", "items", "mask")
+
+    def __init__(
+        self,
+        kind: str,
+        id: str,
+        version: str,
+        project_types: Iterable[str],
+        description: str | None,
+        path: str,
+        items: Iterable[BundleRef] | None = None,
+    ) -> None:
+        self.kind = _intern(kind)
+        self.id = id
+        self.version = _intern(version)
+        self.project_types = _shared_types(project_types)
+        self.description = description
+        self.path = path
+        self.items = tuple(_shared_ref(k, i) for k, i in items) if items is not None else None
+        self.mask = project_type_mask(self.project_types)
+
+    def _key(self) -> tuple[Any, ...]:
+        return (
+            self.kind,
+            self.id,
+            self.version,
+            self.project_types,
+            self.description,
+            self.path,
+            self.items,
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, CatalogItem):
+            return NotImplemented
+        return self._key() == other._key()
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        # Rebuild through __init__ so records unpickled from a parse worker are interned too.
+        return (CatalogItem.from_row, (self.to_row(),))
+
+    def __repr__(self) -> str:
+        return f"CatalogItem({self.kind}/{self.id} {self.version})"
+
+    def to_registry_item(self) -> RegistryItem:
+        """Build the public RegistryItem model.
+
+        model_validate on a plain dict runs in pydantic-core and is faster than
+        model_construct's Python-level field handling, so it is used despite validating.
+        """
+        items = [{"kind": k, "id": i} for k, i in self.items] if self.items is not None else None
+        return RegistryItem.model_validate(
+            {
+                "kind": self.kind,
+                "id": self.id,
+                "version": self.version,
+                "project_types": list(self.project_types),
+                "description": self.description,
+                "path": self.path,
+                "items": items,
+            }
+        )
+
+    @classmethod
+    def from_registry_item(cls, item: RegistryItem) -> "CatalogItem":
+        """Build a record from a RegistryItem model."""
+        return cls(
+            item.kind,
+            item.id,
+            item.version,
+            item.project_types,
+            item.description,
+            item.path,
+            [(r.kind, r.id) for r in item.items] if item.items is not None else None,
+        )
+
+    def to_row(self) -> list[Any]:
+        """Return a compact JSON-serializable row (see from_row)."""
+        return [
+            self.kind,
+            self.id,
+            self.version,
+            list(self.project_types),
+            self.description,
+            self.path,
+            [list(r) for r in self.items] if self.items is not None else None,
+        ]
+
+    @classmethod
+    def from_row(cls, row: list[Any]) -> "CatalogItem":
+        """Build a record from a to_row() row written by this Forge version (trusted, unchecked)."""
+        kind, item_id, version, project_types, description, path, items = row
+        return cls(kind, item_id, version, project_types, description, path, items)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "CatalogItem":
+        """Build a record from a RegistryItem-shaped dict (e.g. index.json) with cheap checks.
+
+        Raises:
+            ValueError: If a required field is missing or has the wrong type.
+        """
+        kind = data.get("kind")
+        item_id = data.get("id")
+        version = data.get("version")
+        path = data.get("path")
+        project_types = data.get("project_types")
+        description = data.get("description")
+        items = data.get("items")
+        if kind not in ITEM_KINDS:
+            raise ValueError(f"Invalid item kind: {kind!r}")
+        for name, value in (("id", item_id), ("version", version), ("path", path)):
+            if not isinstance(value, str) or not value:
+                raise ValueError(f"Invalid {name} for {kind}/{item_id}")
+        if not isinstance(project_types, list) or not project_types or not all(
+            isinstance(pt, str) for pt in project_types
+        ):
+            raise ValueError(f"Invalid project_types for {kind}/{item_id}")
+        if description is not None and not isinstance(description, str):
+            raise ValueError(f"Invalid description for {kind}/{item_id}")
+        refs: list[BundleRef] | None = None
+        if items is not None:
+            refs = []
+            for ref in items:
+                if (
+                    not isinstance(ref, dict)
+                    or ref.get("kind") not in _MEMBER_KINDS
+                    or not ref.get("id")
+                ):
+                    raise ValueError(f"Invalid bundle member in {kind}/{item_id}")
+                refs.append((ref["kind"], str(ref["id"])))
+        return cls(kind, item_id, version, project_types, description, path, refs)  # type: ignore[arg-type]
+
+
+def is_compatible_mask(item: CatalogItem, mask: int, project_types: Iterable[str]) -> bool:
+    """Return True if item targets any of project_types (mask is project_type_mask(project_types)).
+
+    Known project types are compared via the bitmask; unknown ones fall back to the strings.
+    """
+    if item.mask & mask:
+        return True
+    return any(pt in item.project_types for pt in project_types if pt not in PROJECT_TYPE_BITS)
+
+
+CatalogKey = tuple[str, str]
+
+
+class Catalog(Mapping[CatalogKey, RegistryItem]):
+    """Indexed, read-only view of one registry snapshot's items.
+
+    Built once per snapshot (see forge.core.registry.get_catalog). Lookups by
+    (kind, id) and queries by kind and/or project types use precomputed indexes, so
+    their cost is proportional to the result, not to the registry size. As a Mapping
+    it yields RegistryItem models (built on first access), so it can be passed
+    wherever an items_by_kind_id dict is expected.
+    """
+
+    def __init__(self, records: Iterable[CatalogItem]) -> None:
+        self._records: list[CatalogItem] = []
+        self._by_key: dict[CatalogKey, int] = {}
+        self._by_kind: dict[str, list[int]] = {}
+        self._by_kind_type: dict[tuple[str | None, str], list[int]] = {}
+        self._bundles_by_member: dict[CatalogKey, list[int]] = {}
+        self._models: dict[int, RegistryItem] = {}
+        for record in records:
+            key = (record.kind, record.id)
+            if key in self._by_key:
+                continue
+            pos = len(self._records)
+            self._records.append(record)
+            self._by_key[key] = pos
+            self._by_kind.setdefault(record.kind, []).append(pos)
+            for pt in dict.fromkeys(record.project_types):
+                self._by_kind_type.setdefault((record.kind, pt), []).append(pos)
+                self._by_kind_type.setdefault((None, pt), []).append(pos)
+            for ref in record.items or ():
+                self._bundles_by_member.setdefault(ref, []).append(pos)
+
+    def __getitem__(self, key: CatalogKey) -> RegistryItem:
+        pos = self._by_key[key]
+        model = self._models.get(pos)
+        if model is None:
+            model = self._models[pos] = self._records[pos].to_registry_item()
+        return model
+
+    def __iter__(self) -> Iterator[CatalogKey]:
+        return iter(self._by_key)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._by_key
+
+    def record(self, kind: str, item_id: str) -> CatalogItem | None:
+        """Return the compact record for (kind, id), or None."""
+        pos = self._by_key.get((kind, item_id))
+        return self._records[pos] if pos is not None else None
+
+    def records(self) -> list[CatalogItem]:
+        """Return every record in registry walk order."""
+        return list(self._records)
+
+    def _positions(self, kind: str | None, project_types: Iterable[str] | None) -> Iterable[int]:
+        if project_types is None:
+            return self._by_kind.get(kind, []) if kind is not None else range(len(self._records))
+        lists = [self._by_kind_type.get((kind, pt), []) for pt in dict.fromkeys(project_types)]
+        lists = [positions for positions in lists if positions]
+        if len(lists) == 1:
+            return lists[0]
+        # Each list is sorted; merge them and drop items listed under several project types.
+        merged: list[int] = []
+        for pos in heapq.merge(*lists):
+            if not merged or merged[-1] != pos:
+                merged.append(pos)
+        return merged
+
+    def query(
+        self,
+        kind: str | None = None,
+        project_types: Iterable[str] | None = None,
+    ) -> list[CatalogItem]:
+        """Return records of kind (any if None) targeting any of project_types (any if None).
+
+        Results keep registry walk order.
+        """
+        return [self._records[pos] for pos in self._positions(kind, project_types)]
+
+    def query_items(
+        self,
+        kind: str | None = None,
+        project_types: Iterable[str] | None = None,
+    ) -> list[RegistryItem]:
+        """Like query, but return RegistryItem models."""
+        return [self[(r.kind, r.id)] for r in self.query(kind, project_types)]
+
+    def bundles_containing(self, kind: str, item_id: str) -> list[CatalogItem]:
+        """Return the bundles whose members include (kind, id)."""
+        return [self._records[pos] for pos in self._bundles_by_member.get((kind, item_id), [])]
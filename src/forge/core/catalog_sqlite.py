@@ -0,0 +1,290 @@
+"""Optional SQLite catalog store (FORGE_CATALOG_STORE=sqlite) for very large registries.
+
+One database per snapshot (``<commit>.sqlite`` next to it) holds items, their project
+types, bundle members, and an FTS5 table over ids and descriptions. Lookups, filtered
+listings, and bundle resolution query it directly instead of loading the whole
+catalog into memory. The database is written once to a temporary file and renamed
+into place, so readers never see a partial store.
+"""
+
+import os
+import re
+import sqlite3
+from collections.abc import Iterable
+from pathlib import Path
+
+from forge.core.catalog import CatalogItem
+
+# Bump when the schema changes; stores with another version are rebuilt.
+SQLITE_SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE items (
+    pk INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    id TEXT NOT NULL,
+    version TEXT NOT NULL,
+    description TEXT,
+    path TEXT NOT NULL,
+    is_bundle INTEGER NOT NULL,
+    UNIQUE (kind, id)
+);
+CREATE TABLE item_project_types (
+    item_pk INTEGER NOT NULL REFERENCES items (pk),
+    position INTEGER NOT NULL,
+    project_type TEXT NOT NULL,
+    PRIMARY KEY (item_pk, position)
+);
+CREATE INDEX item_project_types_by_type ON item_project_types (project_type, item_pk);
+CREATE TABLE bundle_members (
+    bundle_pk INTEGER NOT NULL REFERENCES items (pk),
+    position INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    id TEXT NOT NULL,
+    PRIMARY KEY (bundle_pk, position)
+);
+CREATE INDEX bundle_members_by_member ON bundle_members (kind, id);
+CREATE INDEX items_by_kind ON items (kind, pk);
+"""
+
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE items_fts USING fts5(id, description, content='items', content_rowid='pk');
+INSERT INTO items_fts (rowid, id, description) SELECT pk, id, coalesce(description, '') FROM items;
+"""
+
+_ITEM_COLUMNS = (
+    "items.pk, items.kind, items.id, items.version, items.description, items.path, items.is_bundle"
+)
+_TERM_RE = re.compile(r"[a-z0-9]+")
+
+
+def build_sqlite_store(path: Path, commit: str, items: Iterable[CatalogItem]) -> None:
+    """Write a new SQLite catalog for commit to path (tmp file + rename).
+
+    FTS5 is used when the interpreter's SQLite provides it; without it the store
+    still answers lookups and listings (see SqliteCatalog.has_fts).
+    """
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp_path.unlink(missing_ok=True)
+    conn = sqlite3.connect(tmp_path)
+    try:
+        conn.execute("PRAGMA journal_mode = OFF")
+        conn.executescript(_SCHEMA)
+        seen: set[tuple[str, str]] = set()
+        for item in items:
+            # Like Catalog, keep the first of duplicate (kind, id) entries.
+            if (item.kind, item.id) in seen:
+                continue
+            seen.add((item.kind, item.id))
+            pk = len(seen)
+            is_bundle = int(item.items is not None)
+            conn.execute(
+                "INSERT INTO items VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (pk, item.kind, item.id, item.version, item.description, item.path, is_bundle),
+            )
+            conn.executemany(
+                "INSERT INTO item_project_types VALUES (?, ?, ?)",
+                [(pk, n, pt) for n, pt in enumerate(item.project_types)],
+            )
+            conn.executemany(
+                "INSERT INTO bundle_members VALUES (?, ?, ?, ?)",
+                [(pk, n, kind, ref_id) for n, (kind, ref_id) in enumerate(item.items or ())],
+            )
+        has_fts = True
+        try:
+            conn.executescript(_FTS_SCHEMA)
+        except sqlite3.OperationalError:
+            has_fts = False
+        conn.executemany(
+            "INSERT INTO meta VALUES (?, ?)",
+            [
+                ("schema_version", str(SQLITE_SCHEMA_VERSION)),
+                ("commit", commit),
+                ("fts", str(int(has_fts))),
+            ],
+        )
+        conn.commit()
+    except BaseException:
+        conn.close()
+        tmp_path.unlink(missing_ok=True)
+        raise
+    conn.close()
+    tmp_path.replace(path)
+
+
+class SqliteCatalog:
+    """Read-only queries against one snapshot's SQLite catalog."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._conn = sqlite3.connect(f"{path.as_uri()}?mode=ro", uri=True, check_same_thread=False)
+        self._meta = dict(self._conn.execute("SELECT key, value FROM meta").fetchall())
+
+    @classmethod
+    def open(cls, path: Path, commit: str) -> "SqliteCatalog | None":
+        """Open the store at path; None if missing, unreadable, or for another commit or schema."""
+        if not path.is_file():
+            return None
+        try:
+            store = cls(path)
+        except sqlite3.Error:
+            return None
+        if (
+            store._meta.get("schema_version") != str(SQLITE_SCHEMA_VERSION)
+            or store._meta.get("commit") != commit
+        ):
+            store.close()
+            return None
+        return store
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def _records(self, rows: list[tuple]) -> list[CatalogItem]:
+        """Build records for rows of _ITEM_COLUMNS, keeping their order."""
+        if not rows:
+            return []
+        pks = [row[0] for row in rows]
+        types: dict[int, list[str]] = {pk: [] for pk in pks}
+        members: dict[int, list[tuple[str, str]]] = {row[0]: [] for row in rows if row[6]}
+        # Stay well below SQLite's bound-parameter limit.
+        for start in range(0, len(pks), 500):
+            chunk = pks[start : start + 500]
+            marks = ",".join("?" * len(chunk))
+            for pk, pt in self._conn.execute(
+                f"SELECT item_pk, project_type FROM item_project_types WHERE item_pk IN ({marks}) "
+                "ORDER BY item_pk, position",
+                chunk,
+            ):
+                types[pk].append(pt)
+            for pk, kind, ref_id in self._conn.execute(
+                f"SELECT bundle_pk, kind, id FROM bundle_members WHERE bundle_pk IN ({marks}) "
+                "ORDER BY bundle_pk, position",
+                chunk,
+            ):
+                members[pk].append((kind, ref_id))
+        return [
+            CatalogItem(
+                kind,
+                item_id,
+                version,
+                types[pk],
+                description,
+                path,
+                members[pk] if is_bundle else None,
+            )
+            for pk, kind, item_id, version, description, path, is_bundle in rows
+        ]
+
+    def get(self, kind: str, item_id: str) -> CatalogItem | None:
+        """Return the record for (kind, id), or None."""
+        rows = self._conn.execute(
+            f"SELECT {_ITEM_COLUMNS} FROM items WHERE kind = ? AND id = ?", (kind, item_id)
+        ).fetchall()
+        records = self._records(rows)
+        return records[0] if records else None
+
+    def get_many(self, keys: Iterable[tuple[str, str]]) -> dict[tuple[str, str], CatalogItem]:
+        """Return (kind, id) -> record for the given keys that exist, in the order given."""
+        wanted = list(dict.fromkeys(keys))
+        found: dict[tuple[str, str], CatalogItem] = {}
+        for start in range(0, len(wanted), 250):
+            chunk = wanted[start : start + 250]
+            values = ",".join("(?, ?)" for _ in chunk)
+            rows = self._conn.execute(
+                f"SELECT {_ITEM_COLUMNS} FROM items WHERE (kind, id) IN (VALUES {values})",
+                [part for key in chunk for part in key],
+            ).fetchall()
+            found.update(((r.kind, r.id), r) for r in self._records(rows))
+        return {key: found[key] for key in wanted if key in found}
+
+    def _filters(
+        self, kind: str | None, project_types: Iterable[str] | None
+    ) -> tuple[list[str], list[str]] | None:
+        """Return (WHERE clauses, params) for a kind / project-type filter.
+
+        Returns None if nothing can match.
+        """
+        where: list[str] = []
+        params: list[str] = []
+        if kind is not None:
+            where.append("items.kind = ?")
+            params.append(kind)
+        if project_types is not None:
+            types = list(dict.fromkeys(project_types))
+            if not types:
+                return None
+            where.append(
+                "items.pk IN (SELECT item_pk FROM item_project_types WHERE project_type IN "
+                f"({','.join('?' * len(types))}))"
+            )
+            params.extend(types)
+        return where, params
+
+    def query(
+        self, kind: str | None = None, project_types: Iterable[str] | None = None
+    ) -> list[CatalogItem]:
+        """Return records of kind targeting any of project_types, in walk order.
+
+        None for kind or project_types matches any.
+        """
+        filters = self._filters(kind, project_types)
+        if filters is None:
+            return []
+        where, params = filters
+        sql = f"SELECT {_ITEM_COLUMNS} FROM items"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        return self._records(self._conn.execute(sql + " ORDER BY items.pk", params).fetchall())
+
+    def bundles_containing(self, kind: str, item_id: str) -> list[CatalogItem]:
+        """Return the bundles whose members include (kind, id)."""
+        rows = self._conn.execute(
+            f"SELECT {_ITEM_COLUMNS} FROM items WHERE pk IN "
+            "(SELECT bundle_pk FROM bundle_members WHERE kind = ? AND id = ?) ORDER BY pk",
+            (kind, item_id),
+        ).fetchall()
+        return self._records(rows)
+
+    @property
+    def has_fts(self) -> bool:
+        """True if the store was built with an FTS5 table (see search_descriptions)."""
+        return self._meta.get("fts") == "1"
+
+    def search_descriptions(
+        self,
+        query: str,
+        kind: str | None = None,
+        project_types: Iterable[str] | None = None,
+        limit: int | None = 20,
+    ) -> list[tuple[CatalogItem, float]]:
+        """Rank items matching any query term in their id or description, best first.
+
+        Uses FTS5 bm25() with ids weighted above descriptions; scores are negated so
+        that, as in forge search, higher means more relevant.
+
+        Raises:
+            RuntimeError: If the store has no FTS table (SQLite built without FTS5).
+        """
+        if not self.has_fts:
+            raise RuntimeError(f"Catalog store {self.path} has no full-text index")
+        terms = list(dict.fromkeys(_TERM_RE.findall(query.lower())))
+        filters = self._filters(kind, project_types)
+        if not terms or filters is None:
+            return []
+        where, params = filters
+        sql = (
+            f"SELECT {_ITEM_COLUMNS}, bm25(items_fts, 3.0, 2.0) AS rank "
+            "FROM items_fts JOIN items ON items.pk = items_fts.rowid WHERE items_fts MATCH ?"
+        )
+        for clause in where:
+            sql += f" AND {clause}"
+        sql += " ORDER BY rank, items.pk"
+        args: list[object] = [" OR ".join(f'"{t}"' for t in terms), *params]
+        if limit is not None:
+            sql += " LIMIT ?"
+            args.append(limit)
+        rows = self._conn.execute(sql, args).fetchall()
+        records = self._records([row[:7] for row in rows])
+        return [(record, -row[7]) for record, row in zip(records, rows)]
@@ -3,13 +3,8 @@
 from pathlib import Path
 from typing import Any
 
-from forge.core.models import ItemKind, ProjectType, RegistryItem
-from forge.core.registry import get_registry_items
-
-
-def _items_by_kind_id(items: list[RegistryItem]) -> dict[tuple[ItemKind, str], RegistryItem]:
-    """Build (kind, id) -> RegistryItem map for all items."""
-    return {(i.kind, i.id): i for i in items}
+from forge.core.models import ItemKind, ProjectType
+from forge.core.registry import get_registry_item, resolve_bundle_members
 
 
 def describe_item(
@@ -23,12 +18,9 @@ def describe_item(
     The description is backend-agnostic and suitable for CLI or other frontends.
     For bundles, includes a ``members`` list with resolved items where possible.
     """
-    all_items = get_registry_items(registry_root)
-    items_map = _items_by_kind_id(all_items)
-    key = (kind, item_id)
-    if key not in items_map:
+    item = get_registry_item(registry_root, kind, item_id)
+    if item is None:
         raise KeyError(f"Item not found: {kind}/{item_id}")
-    item = items_map[key]
 
     base: dict[str, Any] = {
         "kind": item.kind,
@@ -42,6 +34,7 @@ def describe_item(
     if item.kind != "bundle" or not item.items:
         return base
 
+    items_map = resolve_bundle_members(registry_root, item)
     members: list[dict[str, Any]] = []
     for ref in item.items:
         ref_key = (ref.kind, ref.id)
@@ -0,0 +1,228 @@
+"""Thin wrappers around the git CLI used by the registry cache."""
+
+import subprocess
+import threading
+from collections.abc import Iterable
+from pathlib import Path
+from typing import BinaryIO
+
+
+def _run(
+    args: list[str],
+    cwd: Path | None = None,
+    timeout: float | None = None,
+    error_prefix: str = "git command failed",
+    input: bytes | None = None,
+) -> bytes:
+    """Run ``git <args>`` and return its raw stdout (see run_git for errors)."""
+    try:
+        proc = subprocess.run(
+            ["git", *args],
+            cwd=cwd,
+            check=True,
+            capture_output=True,
+            timeout=timeout,
+            input=input,
+        )
+    except subprocess.CalledProcessError as e:
+        raise RuntimeError(f"{error_prefix}: {e.stderr.decode() if e.stderr else e}")
+    except subprocess.TimeoutExpired:
+        raise RuntimeError(f"{error_prefix}: timed out after {timeout}s")
+    except FileNotFoundError:
+        raise RuntimeError("Git is not installed or not on PATH")
+    return proc.stdout
+
+
+def run_git(
+    args: list[str],
+    cwd: Path | None = None,
+    timeout: float | None = None,
+    error_prefix: str = "git command failed",
+) -> str:
+    """Run a git command and return its stdout as text.
+
+    Args:
+        args: Arguments after ``git`` (e.g. ``["rev-parse", "HEAD"]``).
+        cwd: Working directory for the command.
+        timeout: Seconds before the command is aborted.
+        error_prefix: Prefix for the RuntimeError message on failure.
+
+    Returns:
+        Stripped stdout of the command.
+
+    Raises:
+        RuntimeError: If git is missing, the command fails, or it times out.
+    """
+    return _run(args, cwd=cwd, timeout=timeout, error_prefix=error_prefix).decode().strip()
+
+
+def ls_tree(repo: Path, treeish: str, paths: Iterable[str] = ()) -> list[tuple[str, str, str]]:
+    """Return (mode, object id, path) for every blob under treeish, with one ``git ls-tree -r``.
+
+    Paths are relative to the repository root and limited to paths (all if empty).
+
+    Raises:
+        RuntimeError: If git fails (e.g. treeish is not in repo).
+    """
+    out = _run(
+        ["ls-tree", "-r", "-z", "--full-tree", treeish, "--", *paths],
+        cwd=repo,
+        error_prefix="Failed to list registry tree",
+    )
+    entries: list[tuple[str, str, str]] = []
+    for record in out.split(b"\0"):
+        if not record:
+            continue
+        meta, path = record.split(b"\t", 1)
+        mode, object_type, oid = meta.decode().split()
+        if object_type == "blob":
+            entries.append((mode, oid, path.decode("utf-8", errors="surrogateescape")))
+    return entries
+
+
+def cat_file_batch(repo: Path, object_ids: Iterable[str]) -> dict[str, bytes]:
+    """Return the contents of many objects, read through a single ``git cat-file --batch``.
+
+    Objects git cannot find are left out of the result.
+
+    Raises:
+        RuntimeError: If git fails.
+    """
+    oids = list(dict.fromkeys(object_ids))
+    if not oids:
+        return {}
+    out = _run(
+        ["cat-file", "--batch"],
+        cwd=repo,
+        input="".join(f"{oid}\n" for oid in oids).encode(),
+        error_prefix="Failed to read registry objects",
+    )
+    contents: dict[str, bytes] = {}
+    pos = 0
+    # One "<oid> <type> <size>" header (or "<name> missing") per requested object, in order.
+    for oid in oids:
+        eol = out.index(b"\n", pos)
+        header = out[pos:eol].split()
+        pos = eol + 1
+        if len(header) != 3:
+            continue
+        size = int(header[2])
+        contents[oid] = out[pos : pos + size]
+        pos += size + 1
+    return contents
+
+
+class CatFileReader:
+    """Long-lived ``git cat-file --batch`` process for reading many objects one at a time.
+
+    Each read writes one object name to the process and reads back its header and
+    content, so a run that installs many files starts git once. Reads are serialized
+    with a lock; the process is started on first use and stopped by close().
+    """
+
+    CHUNK_SIZE = 1 << 16
+
+    def __init__(self, repo: Path) -> None:
+        self.repo = repo
+        self._proc: subprocess.Popen[bytes] | None = None
+        self._lock = threading.Lock()
+
+    def _process(self) -> "subprocess.Popen[bytes]":
+        if self._proc is None or self._proc.poll() is not None:
+            try:
+                self._proc = subprocess.Popen(
+                    ["git", "cat-file", "--batch"],
+                    cwd=self.repo,
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.DEVNULL,
+                )
+            except FileNotFoundError:
+                raise RuntimeError("Git is not installed or not on PATH")
+        return self._proc
+
+    def _request(self, name: str) -> tuple["subprocess.Popen[bytes]", int | None]:
+        """Ask for name; return the process and the object size (None if git cannot find it)."""
+        proc = self._process()
+        assert proc.stdin is not None and proc.stdout is not None
+        try:
+            proc.stdin.write(f"{name}\n".encode())
+            proc.stdin.flush()
+            header = proc.stdout.readline().split()
+        except OSError as e:
+            self.close()
+            raise RuntimeError(f"Failed to read registry object {name}: {e}")
+        if not header:
+            self.close()
+            raise RuntimeError(f"Failed to read registry object {name}: git cat-file exited")
+        if len(header) != 3:
+            return proc, None
+        return proc, int(header[2])
+
+    def read(self, name: str) -> bytes | None:
+        """Return the content of object name (an id or ``<commit>:<path>``); None if missing."""
+        with self._lock:
+            proc, size = self._request(name)
+            if size is None:
+                return None
+            assert proc.stdout is not None
+            data = proc.stdout.read(size)
+            proc.stdout.read(1)  # trailing newline
+            return data
+
+    def stream(self, name: str, out: BinaryIO) -> bool:
+        """Copy the content of object name into out in chunks; False if it does not exist."""
+        with self._lock:
+            proc, size = self._request(name)
+            if size is None:
+                return False
+            assert proc.stdout is not None
+            remaining = size
+            while remaining:
+                chunk = proc.stdout.read(min(remaining, self.CHUNK_SIZE))
+                if not chunk:
+                    self.close()
+                    raise RuntimeError(f"Failed to read registry object {name}: truncated output")
+                out.write(chunk)
+                remaining -= len(chunk)
+            proc.stdout.read(1)  # trailing newline
+            return True
+
+    def close(self) -> None:
+        """Stop the git process, if running."""
+        proc, self._proc = self._proc, None
+        if proc is None:
+            return
+        for pipe in (proc.stdin, proc.stdout):
+            if pipe is not None:
+                try:
+                    pipe.close()
+                except OSError:
+                    pass
+        try:
+            proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+
+
+def ls_remote_commit(url: str, ref: str, timeout: float | None = 30) -> str | None:
+    """Return the commit SHA that ``ref`` points to on the remote, or None if unresolved.
+
+    Annotated tags are peeled to the commit they reference so the result can be
+    compared with ``git rev-parse HEAD`` of a checkout.
+    """
+    out = run_git(
+        ["ls-remote", url, ref, f"{ref}^{{}}"],
+        timeout=timeout,
+        error_prefix="Failed to query registry remote",
+    )
+    refs: dict[str, str] = {}
+    for line in out.splitlines():
+        parts = line.split("\t", 1)
+        if len(parts) == 2:
+            refs[parts[1]] = parts[0]
+    for name in (f"refs/tags/{ref}^{{}}", f"refs/heads/{ref}", f"refs/tags/{ref}", ref):
+        if name in refs:
+            return refs[name]
+    return next(iter(refs.values()), None)
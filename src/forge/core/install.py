@@ -1,11 +1,22 @@
 """Install a single item or bundle: copy files and update project config."""
 
+import copy
 import json
-import shutil
+import os
+from collections.abc import Iterable, Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-from forge.core.models import InstalledItem, ProjectConfig, RegistryItem
-from forge.core.project import load_config, save_config
+from forge.core.models import (
+    InstalledItem,
+    LinkMode,
+    MaterializeReport,
+    ProjectConfig,
+    RegistryItem,
+)
+from forge.core.registry import materialize_registry_paths
+from forge.core.registry_files import RegistryFiles, registry_files, write_file
+from forge.core.transaction import Transaction
 
 
 def dest_path(project_root: Path, kind: str, item_id: str, tool: str) -> Path:
@@ -39,113 +50,318 @@ def dest_path(project_root: Path, kind: str, item_id: str, tool: str) -> Path:
     raise ValueError(f"Invalid kind: {kind}")
 
 
-def _copy_agent(registry_root: Path, item: RegistryItem, project_root: Path, tool: str) -> None:
-    """Copy agent content (first .md file) to the target agents directory."""
-    src_dir = registry_root / item.path
-    dest_file = dest_path(project_root, "agent", item.id, tool)
-    dest_file.parent.mkdir(parents=True, exist_ok=True)
-    md_files = list(src_dir.glob("*.md"))
-    if not md_files:
-        raise FileNotFoundError(f"No .md file found in {src_dir}")
-    shutil.copy2(md_files[0], dest_file)
-
-
-def _copy_rule(registry_root: Path, item: RegistryItem, project_root: Path, tool: str) -> None:
-    """Copy RULE.md to the target rules directory."""
-    src_file = registry_root / item.path / "RULE.md"
-    if not src_file.exists():
-        raise FileNotFoundError(f"RULE.md not found in {registry_root / item.path}")
-    dest_file = dest_path(project_root, "rule", item.id, tool)
-    dest_file.parent.mkdir(parents=True, exist_ok=True)
-    shutil.copy2(src_file, dest_file)
-
-
-def _copy_skill(registry_root: Path, item: RegistryItem, project_root: Path, tool: str) -> None:
-    """Copy SKILL.md to the target skills directory."""
-    src_file = registry_root / item.path / "SKILL.md"
-    if not src_file.exists():
-        raise FileNotFoundError(f"SKILL.md not found in {registry_root / item.path}")
-    dest_file = dest_path(project_root, "skill", item.id, tool)
-    dest_file.parent.mkdir(parents=True, exist_ok=True)
-    shutil.copy2(src_file, dest_file)
-
-
-def _copy_workflow(registry_root: Path, item: RegistryItem, project_root: Path, tool: str) -> None:
-    """Copy WORKFLOW.md and manifest.yaml to workflows/ (Cursor) or commands/<id>/ (Claude Code)."""
-    src_dir = registry_root / item.path
-    dest_dir = dest_path(project_root, "workflow", item.id, tool)
-    dest_dir.mkdir(parents=True, exist_ok=True)
-    workflow_md = src_dir / "WORKFLOW.md"
-    manifest_yaml = src_dir / "manifest.yaml"
-    if not workflow_md.exists():
-        raise FileNotFoundError(f"WORKFLOW.md not found in {src_dir}")
-    shutil.copy2(workflow_md, dest_dir / "WORKFLOW.md")
-    if manifest_yaml.exists():
-        shutil.copy2(manifest_yaml, dest_dir / "manifest.yaml")
-
-
-def _install_hook(registry_root: Path, item: RegistryItem, project_root: Path, tool: str) -> None:
-    """Copy hook script and merge hooks.json into project .claude/settings.json."""
-    if tool != "claude-code":
-        raise ValueError("Hooks are only supported for claude-code projects")
-    script_src = registry_root / item.path / "scripts" / f"{item.id}.sh"
-    if not script_src.exists():
-        raise FileNotFoundError(f"Hook script not found: {script_src}")
-    script_dest = dest_path(project_root, "hook", item.id, tool)
-    script_dest.parent.mkdir(parents=True, exist_ok=True)
-    shutil.copy2(script_src, script_dest)
-    script_dest.chmod(script_dest.stat().st_mode | 0o111)
-
-    hooks_json_path = registry_root / item.path / "hooks.json"
-    if hooks_json_path.exists():
+INSTALL_WORKERS_ENV = "FORGE_INSTALL_WORKERS"
+# Below this many items a batch is materialized serially (thread start-up dominates).
+PARALLEL_INSTALL_THRESHOLD = 8
+MAX_INSTALL_WORKERS = 8
+
+_materialize_reports: list[MaterializeReport] = []
+
+
+class MaterializeError(RuntimeError):
+    """Some items of a batch could not be copied into the project; the others were.
+
+    Attributes:
+        failures: (kind, id) -> the exception raised for that item, in batch order.
+    """
+
+    def __init__(self, failures: dict[tuple[str, str], Exception]) -> None:
+        self.failures = failures
+        lines = "\n".join(f"  {kind}/{item_id}: {e}" for (kind, item_id), e in failures.items())
+        super().__init__(f"Failed to install {len(failures)} item(s):\n{lines}")
+
+
+def install_workers(task_count: int) -> int:
+    """Return how many threads to materialize task_count items with.
+
+    FORGE_INSTALL_WORKERS overrides the choice (1 disables parallel copies). Copies
+    are I/O bound, so threads help most on network-mounted project directories.
+    """
+    raw = os.environ.get(INSTALL_WORKERS_ENV, "").strip()
+    if raw:
+        try:
+            return max(1, int(raw))
+        except ValueError:
+            pass
+    if task_count < PARALLEL_INSTALL_THRESHOLD:
+        return 1
+    return min(task_count, MAX_INSTALL_WORKERS)
+
+
+def _sync_file(
+    files: RegistryFiles,
+    rel: str,
+    dest: Path,
+    report: MaterializeReport,
+    link_mode: LinkMode,
+    txn: Transaction | None = None,
+    executable: bool = False,
+) -> None:
+    """Copy or link rel to dest unless dest is already up to date, and count the outcome."""
+    outcome = files.sync_file(rel, dest, link_mode, txn, executable)
+    if outcome == "unchanged":
+        report.skipped += 1
+        if txn is not None:
+            txn.keep(dest)
+    else:
+        report.written += 1
+        if outcome == "linked":
+            report.linked += 1
+
+
+def _item_files(
+    files: RegistryFiles, registry_root: Path, item: RegistryItem, project_root: Path, tool: str
+) -> list[tuple[str, Path]]:
+    """Return (registry path, destination) for each file item installs into the project.
+
+    Raises:
+        FileNotFoundError: If a required file is missing from the registry.
+        ValueError: If the kind is unknown or not supported by tool.
+    """
+    if item.kind not in ("agent", "rule", "skill", "workflow", "prompt", "hook"):
+        raise ValueError(f"Expected agent, rule, skill, workflow, prompt, or hook; got {item.kind}")
+    dest = dest_path(project_root, item.kind, item.id, tool)
+    if item.kind == "agent":
+        # Agent content is the first .md file of the item directory.
+        md_files = [name for name in files.list_dir(item.path) if name.endswith(".md")]
+        if not md_files:
+            raise FileNotFoundError(f"No .md file found in {registry_root / item.path}")
+        return [(f"{item.path}/{md_files[0]}", dest)]
+    if item.kind in ("rule", "skill"):
+        name = "RULE.md" if item.kind == "rule" else "SKILL.md"
+        src_file = f"{item.path}/{name}"
+        if not files.is_file(src_file):
+            raise FileNotFoundError(f"{name} not found in {registry_root / item.path}")
+        return [(src_file, dest)]
+    if item.kind == "workflow":
+        # WORKFLOW.md and manifest.yaml go to workflows/<id>/ (Cursor)
+        # or commands/<id>/ (Claude Code).
+        workflow_md = f"{item.path}/WORKFLOW.md"
+        manifest_yaml = f"{item.path}/manifest.yaml"
+        if not files.is_file(workflow_md):
+            raise FileNotFoundError(f"WORKFLOW.md not found in {registry_root / item.path}")
+        pairs = [(workflow_md, dest / "WORKFLOW.md")]
+        if files.is_file(manifest_yaml):
+            pairs.append((manifest_yaml, dest / "manifest.yaml"))
+        return pairs
+    if item.kind == "prompt":
+        if not files.is_file(item.path):
+            raise FileNotFoundError(f"Prompt file not found: {registry_root / item.path}")
+        return [(item.path, dest)]
+    script_src = f"{item.path}/scripts/{item.id}.sh"
+    if not files.is_file(script_src):
+        raise FileNotFoundError(f"Hook script not found: {registry_root / script_src}")
+    return [(script_src, dest)]
+
+
+def _hook_entry_key(entry: dict) -> tuple:
+    return entry.get("matcher"), frozenset(h.get("command") for h in entry.get("hooks", []))
+
+
+def _merge_hook_settings(project_hooks: dict, hook_defs: dict, script_suffix: str) -> None:
+    """Make project_hooks hold exactly hook_defs' entries for one script, keeping other entries.
+
+    Entries for the script that hook_defs no longer defines (e.g. after an update) are dropped.
+    """
+    for event in list(project_hooks):
+        wanted = {_hook_entry_key(e) for e in hook_defs.get(event, [])}
+        project_hooks[event] = [
+            entry
+            for entry in project_hooks[event]
+            if _hook_entry_key(entry) in wanted
+            or not any(h.get("command", "").endswith(script_suffix) for h in entry.get("hooks", []))
+        ]
+        if not project_hooks[event]:
+            del project_hooks[event]
+    for event, matchers in hook_defs.items():
+        event_list = project_hooks.setdefault(event, [])
+        present = {_hook_entry_key(e) for e in event_list}
+        for new_entry in matchers:
+            if _hook_entry_key(new_entry) not in present:
+                event_list.append(new_entry)
+                present.add(_hook_entry_key(new_entry))
+
+
+def _install_hook_settings(
+    files: RegistryFiles,
+    item: RegistryItem,
+    project_root: Path,
+    report: MaterializeReport,
+    txn: Transaction | None = None,
+) -> None:
+    """Merge hooks.json into project .claude/settings.json (the script is synced executable).
+
+    Not thread-safe (read-modify-write of settings.json): hooks are always applied one at a time.
+    """
+    hooks_json_path = f"{item.path}/hooks.json"
+    if files.is_file(hooks_json_path):
         from forge.core.setup import load_claude_settings, save_claude_settings
 
-        hook_defs = json.loads(hooks_json_path.read_text(encoding="utf-8"))
+        hook_defs = json.loads(files.read_bytes(hooks_json_path).decode("utf-8"))
         settings_path = project_root / ".claude" / "settings.json"
-        settings = load_claude_settings(settings_path)
-        project_hooks = settings.setdefault("hooks", {})
-        for event, matchers in hook_defs.items():
-            event_list = project_hooks.setdefault(event, [])
-            for new_entry in matchers:
-                new_cmds = {h["command"] for h in new_entry.get("hooks", [])}
-                already = any(
-                    new_cmds == {h["command"] for h in ex.get("hooks", [])}
-                    and ex.get("matcher") == new_entry.get("matcher")
-                    for ex in event_list
-                )
-                if not already:
-                    event_list.append(new_entry)
-        save_claude_settings(settings, settings_path)
+        current = txn.current(settings_path) if txn is not None else settings_path
+        settings = load_claude_settings(current)
+        before = copy.deepcopy(settings)
+        _merge_hook_settings(
+            settings.setdefault("hooks", {}), hook_defs, f"/.claude/hooks/{item.id}.sh"
+        )
+        if settings != before or not current.exists():
+            write_file(settings_path, lambda tmp: save_claude_settings(settings, tmp), txn)
+            report.written += 1
+        else:
+            report.skipped += 1
 
 
-def _copy_prompt(registry_root: Path, item: RegistryItem, project_root: Path, tool: str) -> None:
-    """Copy prompt .md file to the target prompts/commands directory."""
-    src_file = registry_root / item.path
-    if not src_file.exists():
-        raise FileNotFoundError(f"Prompt file not found: {src_file}")
-    dest_file = dest_path(project_root, "prompt", item.id, tool)
-    dest_file.parent.mkdir(parents=True, exist_ok=True)
-    shutil.copy2(src_file, dest_file)
+def _make_dirs(pairs: Iterable[tuple[str, Path]]) -> None:
+    """Create each distinct destination directory once."""
+    for directory in sorted({dest.parent for _, dest in pairs}):
+        directory.mkdir(parents=True, exist_ok=True)
 
 
-def copy_registry_item_to_project(
-    registry_root: Path, item: RegistryItem, project_root: Path, tool: str
+def _register_links(
+    files: RegistryFiles, project_root: Path, link_mode: LinkMode, txn: Transaction | None
 ) -> None:
-    """Copy one agent/rule/skill/workflow/prompt from registry into the target tool directory. Does not update config."""
-    if item.kind == "agent":
-        _copy_agent(registry_root, item, project_root, tool)
-    elif item.kind == "rule":
-        _copy_rule(registry_root, item, project_root, tool)
-    elif item.kind == "skill":
-        _copy_skill(registry_root, item, project_root, tool)
-    elif item.kind == "workflow":
-        _copy_workflow(registry_root, item, project_root, tool)
-    elif item.kind == "prompt":
-        _copy_prompt(registry_root, item, project_root, tool)
-    elif item.kind == "hook":
-        _install_hook(registry_root, item, project_root, tool)
+    """Record project_root with the asset store if it is about to link into it (see gc_store)."""
+    if (
+        link_mode in ("hardlink", "symlink")
+        and files.store is not None
+        and (txn is None or not txn.dry_run)
+    ):
+        files.store.register_project(project_root)
+
+
+def _apply_item_files(
+    files: RegistryFiles,
+    item: RegistryItem,
+    pairs: list[tuple[str, Path]],
+    project_root: Path,
+    link_mode: LinkMode,
+    txn: Transaction | None = None,
+) -> MaterializeReport:
+    """Sync item's files (directories must exist unless txn is given) and apply kind extras."""
+    report = MaterializeReport(kind=item.kind, id=item.id)
+    for rel, dest in pairs:
+        # Hook scripts are installed executable whatever their mode in the registry.
+        _sync_file(files, rel, dest, report, link_mode, txn, executable=item.kind == "hook")
+    if item.kind == "workflow" and len(pairs) == 1:
+        # Files are synced in place on update, so drop a manifest the new version no longer has.
+        stale = pairs[0][1].parent / "manifest.yaml"
+        if txn is None:
+            stale.unlink(missing_ok=True)
+        elif txn.current(stale).exists():
+            txn.delete(stale)
+    if item.kind == "hook":
+        _install_hook_settings(files, item, project_root, report, txn)
+    return report
+
+
+def copy_registry_item_to_project(
+    registry_root: Path,
+    item: RegistryItem,
+    project_root: Path,
+    tool: str,
+    link_mode: LinkMode = "copy",
+    txn: Transaction | None = None,
+) -> MaterializeReport:
+    """Copy one agent/rule/skill/workflow/prompt/hook from registry into the target tool directory.
+
+    Does not update config. Files are read through forge.core.registry_files, so
+    bare-mode cache snapshots stream them straight from git objects. link_mode
+    hardlink, symlink, or reflink links files from the cache snapshot instead of
+    copying them (falling back to a copy where that is not possible). Files that are
+    already up to date are left untouched (mtime included); the returned report
+    counts written vs. skipped files and is also recorded for get_materialize_reports.
+    With txn, changes are staged in the transaction instead of written in place.
+    """
+    materialize_registry_paths(registry_root, [item.path])
+    files = registry_files(registry_root)
+    pairs = _item_files(files, registry_root, item, project_root, tool)
+    if txn is None:
+        _make_dirs(pairs)
+    _register_links(files, project_root, link_mode, txn)
+    report = _apply_item_files(files, item, pairs, project_root, link_mode, txn)
+    if txn is None or not txn.dry_run:
+        _materialize_reports.append(report)
+    return report
+
+
+def copy_registry_items_to_project(
+    registry_root: Path,
+    items: Sequence[RegistryItem],
+    project_root: Path,
+    tool: str,
+    link_mode: LinkMode = "copy",
+    txn: Transaction | None = None,
+) -> list[MaterializeReport]:
+    """Copy many items into the project, like copy_registry_item_to_project for each, in one pass.
+
+    Registry paths are materialized together and every destination directory is
+    created once up front (or, with txn, when the transaction commits). Items are
+    then copied on a thread pool (see install_workers); hooks, which edit
+    .claude/settings.json, are applied afterwards one at a time. An item that
+    fails does not stop the others.
+
+    Returns:
+        One report per item, in items order.
+
+    Raises:
+        MaterializeError: If any item failed (after all other items were copied).
+    """
+    materialize_registry_paths(registry_root, [item.path for item in items])
+    files = registry_files(registry_root)
+    failures: dict[tuple[str, str], Exception] = {}
+    plans: list[tuple[RegistryItem, list[tuple[str, Path]]]] = []
+    for item in items:
+        try:
+            plans.append((item, _item_files(files, registry_root, item, project_root, tool)))
+        except (OSError, ValueError, RuntimeError) as e:
+            failures[(item.kind, item.id)] = e
+    if txn is None:
+        _make_dirs(pair for _, pairs in plans for pair in pairs)
+    _register_links(files, project_root, link_mode, txn)
+
+    reports: dict[tuple[str, str], MaterializeReport] = {}
+
+    def _apply(item: RegistryItem, pairs: list[tuple[str, Path]]) -> None:
+        try:
+            reports[(item.kind, item.id)] = _apply_item_files(
+                files, item, pairs, project_root, link_mode, txn
+            )
+        except (OSError, ValueError, RuntimeError) as e:
+            failures[(item.kind, item.id)] = e
+
+    copies = [(item, pairs) for item, pairs in plans if item.kind != "hook"]
+    workers = min(install_workers(len(copies)), len(copies))
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(lambda plan: _apply(*plan), copies))
     else:
-        raise ValueError(f"Expected agent, rule, skill, workflow, prompt, or hook; got {item.kind}")
+        for item, pairs in copies:
+            _apply(item, pairs)
+    # settings.json is read, merged, and rewritten per hook: apply hooks one at a time,
+    # after the copies.
+    for item, pairs in plans:
+        if item.kind == "hook":
+            _apply(item, pairs)
+
+    ordered = [reports[(i.kind, i.id)] for i in items if (i.kind, i.id) in reports]
+    if txn is None or not txn.dry_run:
+        _materialize_reports.extend(ordered)
+    if failures:
+        raise MaterializeError(
+            {(i.kind, i.id): failures[(i.kind, i.id)] for i in items if (i.kind, i.id) in failures}
+        )
+    return ordered
+
+
+def get_materialize_reports() -> list[MaterializeReport]:
+    """Return the per-item file counts recorded in this process, oldest first."""
+    return list(_materialize_reports)
+
+
+def clear_materialize_reports() -> None:
+    """Forget recorded materialize reports (e.g. between CLI invocations in tests)."""
+    _materialize_reports.clear()
 
 
 def _install_single_item(
@@ -154,17 +370,26 @@ def _install_single_item(
     project_root: Path,
     config: ProjectConfig,
     source_ref: str,
+    link_mode: LinkMode | None = None,
+    txn: Transaction | None = None,
 ) -> None:
-    """Copy one item into the project and append to config.installed. Caller must save config."""
-    copy_registry_item_to_project(registry_root, item, project_root, config.tool)
-    config.installed.append(
-        InstalledItem(
-            kind=item.kind,
-            id=item.id,
-            version=item.version,
-            source_registry_ref=source_ref,
-        )
+    """Copy one item into the project and record it in config.installed. Caller must save config."""
+    copy_registry_item_to_project(
+        registry_root, item, project_root, config.tool, link_mode or config.link_mode, txn
     )
+    _record_installed(config, item, source_ref)
+
+
+def _record_installed(config: ProjectConfig, item: RegistryItem, source_ref: str) -> None:
+    """Add item's row to config.installed, replacing an existing row for the same kind and id."""
+    row = InstalledItem(
+        kind=item.kind, id=item.id, version=item.version, source_registry_ref=source_ref
+    )
+    for n, inst in enumerate(config.installed):
+        if inst.kind == item.kind and inst.id == item.id:
+            config.installed[n] = row
+            return
+    config.installed.append(row)
 
 
 def install_item(
@@ -173,15 +398,21 @@ def install_item(
     project_root: Path,
     config: ProjectConfig,
     source_ref: str,
+    link_mode: LinkMode | None = None,
+    dry_run: bool = False,
 ) -> None:
     """Install a single agent, rule, skill, workflow, or prompt. Updates config and saves.
 
+    Files and config are committed together in one Transaction.
+
     Args:
         registry_root: Path to cloned registry repo.
         item: Registry item (must be agent, rule, skill, workflow, or prompt).
         project_root: Project root (contains .forge/).
         config: Current project config (will be updated and saved).
         source_ref: Git ref used for this install (e.g. main).
+        link_mode: How to materialize files (default: config.link_mode).
+        dry_run: Only plan the changes (see Transaction); project and config file stay unchanged.
 
     Raises:
         ValueError: If item is a bundle or project type incompatible.
@@ -189,20 +420,25 @@ def install_item(
     """
     if item.kind == "bundle":
         raise ValueError("Use install_bundle for bundles")
-    _install_single_item(registry_root, item, project_root, config, source_ref)
-    save_config(project_root, config)
+    with Transaction(project_root, dry_run, config) as txn:
+        _install_single_item(registry_root, item, project_root, config, source_ref, link_mode, txn)
+        txn.commit(config)
 
 
 def install_bundle(
     registry_root: Path,
     bundle_item: RegistryItem,
-    items_by_kind_id: dict[tuple[str, str], RegistryItem],
+    items_by_kind_id: Mapping[tuple[str, str], RegistryItem],
     project_root: Path,
     config: ProjectConfig,
     source_ref: str,
+    link_mode: LinkMode | None = None,
+    dry_run: bool = False,
 ) -> None:
     """Install or sync a bundle: one InstalledBundle row and member files. Idempotent if bundle id exists.
 
+    Files and config are committed together in one Transaction.
+
     Args:
         registry_root: Path to cloned registry repo.
         bundle_item: Bundle registry item (must have .items).
@@ -210,6 +446,8 @@ def install_bundle(
         project_root: Project root.
         config: Current project config (will be updated and saved).
         source_ref: Git ref used for this install.
+        link_mode: How to materialize member files (default: config.link_mode).
+        dry_run: Only plan the changes (see Transaction); project and config file stay unchanged.
 
     Raises:
         ValueError: If a bundle member is not found or not compatible.
@@ -217,12 +455,80 @@ def install_bundle(
     """
     from forge.core.bundle_sync import sync_bundle_with_registry
 
-    sync_bundle_with_registry(
-        registry_root,
-        project_root,
-        config,
-        bundle_item,
-        items_by_kind_id,
-        source_ref,
-    )
-    save_config(project_root, config)
+    with Transaction(project_root, dry_run, config) as txn:
+        sync_bundle_with_registry(
+            registry_root,
+            project_root,
+            config,
+            bundle_item,
+            items_by_kind_id,
+            source_ref,
+            link_mode,
+            txn=txn,
+        )
+        txn.commit(config)
+
+
+def install_items(
+    registry_root: Path,
+    items: Sequence[RegistryItem],
+    members: Mapping[tuple[str, str], RegistryItem],
+    project_root: Path,
+    config: ProjectConfig,
+    source_ref: str,
+    link_mode: LinkMode | None = None,
+    dry_run: bool = False,
+) -> list[MaterializeReport]:
+    """Install several items and bundles in one pass: one copy batch and one config save.
+
+    Standalone items are recorded first, then each bundle is reconciled (see
+    sync_bundle_with_registry), and finally the standalone items and every bundle
+    member are copied together with copy_registry_items_to_project. Everything is
+    committed in one Transaction, so a failure leaves the project untouched.
+
+    Args:
+        registry_root: Path to cloned registry repo.
+        items: Items to install; bundles are installed or synced like install_bundle.
+        members: Map (kind, id) -> RegistryItem resolving the bundles' members.
+        project_root: Project root.
+        config: Current project config (will be updated and saved).
+        source_ref: Git ref used for this install.
+        link_mode: How to materialize files (default: config.link_mode).
+        dry_run: Only plan the changes (see Transaction); project and config file stay unchanged.
+
+    Returns:
+        One report per copied item (standalone items and bundle members, deduplicated).
+
+    Raises:
+        ValueError: If a bundle member is not found or not compatible.
+        MaterializeError: If some items could not be copied; nothing is then changed.
+    """
+    from forge.core.bundle_sync import sync_bundle_with_registry
+
+    link_mode = link_mode or config.link_mode
+    batch: dict[tuple[str, str], RegistryItem] = {}
+    with Transaction(project_root, dry_run, config) as txn:
+        for item in items:
+            if item.kind != "bundle":
+                _record_installed(config, item, source_ref)
+                batch[(item.kind, item.id)] = item
+        for item in items:
+            if item.kind == "bundle":
+                sync_bundle_with_registry(
+                    registry_root,
+                    project_root,
+                    config,
+                    item,
+                    members,
+                    source_ref,
+                    link_mode,
+                    copy_members=False,
+                    txn=txn,
+                )
+                for ref in item.items or []:
+                    batch.setdefault((ref.kind, ref.id), members[(ref.kind, ref.id)])
+        reports = copy_registry_items_to_project(
+            registry_root, list(batch.values()), project_root, config.tool, link_mode, txn
+        )
+        txn.commit(config)
+    return reports
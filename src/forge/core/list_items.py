@@ -3,8 +3,7 @@
 from pathlib import Path
 
 from forge.core.models import ItemKind, ProjectType, RegistryItem
-from forge.core.registry import fetch_registry, get_registry_items
-from forge.core.validation import is_compatible_with_project_types
+from forge.core.registry import fetch_registry, get_catalog, get_catalog_store
 
 
 def list_items(
@@ -38,9 +37,9 @@ def list_items(
         root = Path(registry_root)
     else:
         root = fetch_registry(registry_url, registry_ref)
-    items = get_registry_items(root)
-    if not all_items:
-        items = [i for i in items if is_compatible_with_project_types(i, project_types)]
-    if category is not None:
-        items = [i for i in items if i.kind == category]
-    return items
+    store = get_catalog_store(root)
+    types = None if all_items else project_types
+    if store is not None:
+        records = store.query(kind=category, project_types=types)
+        return [record.to_registry_item() for record in records]
+    return get_catalog(root).query_items(kind=category, project_types=types)
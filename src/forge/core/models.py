@@ -7,10 +7,12 @@ from pydantic import BaseModel, Field
 ItemKind = Literal["agent", "rule", "skill", "bundle", "workflow", "prompt", "hook"]
 ProjectType = Literal["data", "backend", "frontend", "infra", "product"]
 TargetTool = Literal["cursor", "claude-code"]
+LinkMode = Literal["copy", "hardlink", "symlink", "reflink"]
 
 PROJECT_TYPES: tuple[ProjectType, ...] = ("data", "backend", "frontend", "infra", "product")
 ITEM_KINDS: tuple[ItemKind, ...] = ("agent", "rule", "skill", "bundle", "workflow", "prompt", "hook")
 TARGET_TOOLS: tuple[TargetTool, ...] = ("cursor", "claude-code")
+LINK_MODES: tuple[LinkMode, ...] = ("copy", "hardlink", "symlink", "reflink")
 
 
 class ItemManifest(BaseModel):
@@ -61,6 +63,62 @@ class InstalledItem(BaseModel):
     source_registry_ref: str = Field(..., description="Git ref used at install time, e.g. main or v1.0.0")
 
 
+class MaterializeReport(BaseModel):
+    """Files copied into the project for one item: written vs. left untouched (identical)."""
+
+    kind: str
+    id: str
+    written: int = 0
+    skipped: int = 0
+    linked: int = Field(
+        default=0, description="Of the written files, how many are links into the registry cache"
+    )
+
+
+class PlannedItemChange(BaseModel):
+    """An item or bundle a run adds, updates, or removes.
+
+    old_version is None for an added item; new_version is None for a removed one.
+    """
+
+    kind: str
+    id: str
+    old_version: str | None = None
+    new_version: str | None = None
+
+
+class ChangePlan(BaseModel):
+    """What an install, update, or remove run would change in a project (see Transaction dry_run).
+
+    File paths are relative to the project root.
+    """
+
+    items: list[PlannedItemChange] = Field(default_factory=list)
+    create: list[str] = Field(default_factory=list, description="New files")
+    overwrite: list[str] = Field(
+        default_factory=list, description="Existing files whose content changes"
+    )
+    unchanged: list[str] = Field(default_factory=list, description="Files already up to date")
+    delete: list[str] = Field(default_factory=list, description="Files and directories removed")
+    hooks_added: list[str] = Field(
+        default_factory=list, description="'Event: command' entries added to settings.json"
+    )
+    hooks_removed: list[str] = Field(
+        default_factory=list, description="'Event: command' entries removed from settings.json"
+    )
+
+    def is_empty(self) -> bool:
+        """True if the run would change nothing."""
+        return not (
+            self.items
+            or self.create
+            or self.overwrite
+            or self.delete
+            or self.hooks_added
+            or self.hooks_removed
+        )
+
+
 class InstalledBundle(BaseModel):
     """Record of an installed bundle (members are a snapshot for sync/remove)."""
 
@@ -83,10 +141,101 @@ class ProjectConfig(BaseModel):
     project_types: list[ProjectType] = Field(..., min_length=1)
     registry: RegistryConfig
     tool: TargetTool = Field(default="cursor")
+    link_mode: LinkMode = Field(
+        default="copy", description="How item files are materialized from the registry cache"
+    )
     installed: list[InstalledItem] = Field(default_factory=list)
     installed_bundles: list[InstalledBundle] = Field(default_factory=list)
 
 
+# ---------------------------------------------------------------------------
+# Registry cache models
+# ---------------------------------------------------------------------------
+
+FetchStatus = Literal["hit", "refreshed", "cloned", "offline", "local", "extracted"]
+CacheMode = Literal["full", "partial", "bare"]
+CatalogStore = Literal["json", "sqlite"]
+
+
+class RegistryCacheEntry(BaseModel):
+    """Sidecar metadata for one cached registry checkout (url + ref)."""
+
+    url: str = Field(..., min_length=1)
+    ref: str = Field(..., min_length=1)
+    commit: str = Field(..., min_length=1, description="Commit SHA currently checked out")
+    checked_at: float = Field(
+        ..., description="Unix time of the last freshness check against the remote"
+    )
+    mode: CacheMode = Field(
+        default="full", description="full checkout, blobless partial clone, or bare (no checkout)"
+    )
+    source_size: int | None = Field(
+        default=None, description="Archive transports: size of the archive file"
+    )
+    source_mtime_ns: int | None = Field(
+        default=None, description="Archive transports: mtime of the archive file"
+    )
+
+
+class RegistrySnapshot(BaseModel):
+    """Sidecar metadata for an immutable per-commit registry checkout."""
+
+    url: str = Field(..., min_length=1)
+    commit: str = Field(..., min_length=1)
+    mode: CacheMode = Field(default="full")
+    created_at: float = Field(..., description="Unix time the snapshot was completed")
+
+
+class RegistryIndex(BaseModel):
+    """Precompiled catalog at the registry root as index.json (forge registry build-index)."""
+
+    schema_version: int = Field(
+        ..., description="Index format version; unknown versions are ignored"
+    )
+    items: list[RegistryItem] = Field(default_factory=list)
+    content_hashes: dict[str, str] = Field(
+        default_factory=dict,
+        description="SHA-256 of each item's files, keyed by item path",
+    )
+    manifest_oids: dict[str, str] = Field(
+        default_factory=dict,
+        description="Git blob id of each item's manifest.yaml, keyed by item path",
+    )
+
+
+class CacheSnapshotInfo(BaseModel):
+    """One registry snapshot in the cache, as shown by forge cache ls."""
+
+    url: str
+    commit: str
+    refs: list[str] = Field(
+        default_factory=list, description="Refs whose entry currently points here"
+    )
+    mode: CacheMode = "full"
+    size_bytes: int = 0
+    last_used: float = Field(
+        ..., description="Unix time of the last fetch_registry that returned it"
+    )
+    path: str
+
+
+class RegistryFetchReport(BaseModel):
+    """Outcome of one fetch_registry call, for per-run reporting."""
+
+    url: str
+    ref: str
+    status: FetchStatus
+    commit: str | None = None
+    path: str
+
+
+class RegistrySearchHit(BaseModel):
+    """One ranked result of forge search."""
+
+    item: RegistryItem
+    score: float = Field(..., description="BM25 relevance; only comparable within one query")
+
+
 # ---------------------------------------------------------------------------
 # Setup wizard models
 # ---------------------------------------------------------------------------
@@ -5,7 +5,14 @@ from pathlib import Path
 
 import yaml
 
-from forge.core.models import BundleItemRef, InstalledBundle, InstalledItem, ProjectConfig, RegistryConfig
+from forge.core.models import (
+    LINK_MODES,
+    BundleItemRef,
+    InstalledBundle,
+    InstalledItem,
+    ProjectConfig,
+    RegistryConfig,
+)
 
 
 def find_project_root(start: Path | None = None) -> Path | None:
@@ -84,10 +91,13 @@ def _coerce_project_config(data: dict) -> ProjectConfig:
         project_types = ["backend"]
     raw_tool = data.get("tool", "cursor")
     tool = raw_tool if raw_tool in ("cursor", "claude-code") else "cursor"
+    raw_link_mode = data.get("link_mode", "copy")
+    link_mode = raw_link_mode if raw_link_mode in LINK_MODES else "copy"
     return ProjectConfig(
         project_types=project_types,
         registry=registry,
         tool=tool,
+        link_mode=link_mode,
         installed=installed,
         installed_bundles=installed_bundles,
     )
@@ -115,17 +125,13 @@ def load_config(project_root: Path) -> ProjectConfig | None:
         return None
 
 
-def save_config(project_root: Path, config: ProjectConfig) -> None:
-    """Write project config to project_root/.forge/config.yaml.
+def config_path(project_root: Path) -> Path:
+    """Return the path of the project config file (project_root/.forge/config.yaml)."""
+    return Path(project_root) / ".forge" / "config.yaml"
 
-    Args:
-        project_root: Path to project root.
-        config: Config to write.
-    """
-    root = Path(project_root)
-    config_dir = root / ".forge"
-    config_dir.mkdir(parents=True, exist_ok=True)
-    config_path = config_dir / "config.yaml"
+
+def write_config_file(path: Path, config: ProjectConfig) -> None:
+    """Write config as YAML to path (in place; see save_config for the atomic write)."""
     data = {
         "project_types": config.project_types,
         "registry": {
@@ -133,6 +139,10 @@ def save_config(project_root: Path, config: ProjectConfig) -> None:
             "ref": config.registry.ref,
         },
         "tool": config.tool,
+    }
+    if config.link_mode != "copy":
+        data["link_mode"] = config.link_mode
+    data |= {
         "installed": [
             {
                 "kind": item.kind,
@@ -152,5 +162,23 @@ def save_config(project_root: Path, config: ProjectConfig) -> None:
             for b in config.installed_bundles
         ],
     }
-    with open(config_path, "w", encoding="utf-8") as f:
+    with open(path, "w", encoding="utf-8") as f:
         yaml.safe_dump(data, f, default_flow_style=False, sort_keys=False)
+
+
+def save_config(project_root: Path, config: ProjectConfig) -> None:
+    """Write project config to project_root/.forge/config.yaml atomically (tmp + rename).
+
+    Args:
+        project_root: Path to project root.
+        config: Config to write.
+    """
+    path = config_path(project_root)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    try:
+        write_config_file(tmp_path, config)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
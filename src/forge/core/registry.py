@@ -1,19 +1,63 @@
 """Fetch registry repo and parse manifests into in-memory registry items."""
 
-import hashlib
 import os
-import subprocess
-from pathlib import Path
+import shutil
+import sqlite3
+import time
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path, PurePosixPath
 
 import yaml
 
+from forge.core.cache_gc import enforce_cache_limits
+from forge.core.catalog import Catalog, CatalogItem
+from forge.core.catalog_sqlite import SqliteCatalog, build_sqlite_store
+from forge.core.git import cat_file_batch, ls_remote_commit, ls_tree, run_git
 from forge.core.models import (
+    PROJECT_TYPES,
     BundleItemRef,
     BundleManifest,
+    CacheMode,
+    FetchStatus,
     ItemKind,
     ItemManifest,
-    PROJECT_TYPES,
+    RegistryCacheEntry,
     RegistryItem,
+    RegistrySnapshot,
+)
+from forge.core.registry_cache import (
+    cache_lock,
+    cache_mode,
+    cache_root,
+    catalog_db_path,
+    catalog_store,
+    is_offline,
+    is_within_ttl,
+    load_cache_entry,
+    load_catalog,
+    load_snapshot,
+    mirror_path,
+    record_fetch,
+    registry_cache_key,
+    save_cache_entry,
+    save_catalog,
+    save_snapshot,
+    snapshot_cache_root,
+    snapshot_path,
+    touch_snapshot,
+)
+from forge.core.registry_files import RegistryFiles, registry_files
+from forge.core.registry_index import (
+    INDEX_FILENAME,
+    load_verified_git_index,
+    load_verified_registry_index,
+)
+from forge.core.transports import (
+    fetch_archive_registry,
+    fetch_directory_registry,
+    parse_registry_url,
 )
 
 REGISTRY_CATEGORIES: tuple[str, ...] = ("agents", "rules", "skills", "bundles", "workflows", "prompts", "hooks")
@@ -26,84 +70,336 @@ KIND_FROM_DIR: dict[str, ItemKind] = {
     "prompts": "prompt",
     "hooks": "hook",
 }
+DIR_FROM_KIND: dict[str, str] = {kind: category for category, kind in KIND_FROM_DIR.items()}
+
+PARSE_WORKERS_ENV = "FORGE_PARSE_WORKERS"
+# Below this many item directories manifests are parsed serially (pool start-up dominates).
+PARALLEL_PARSE_THRESHOLD = 2000
+MAX_PARSE_WORKERS = 8
+# Up to this many keys get_registry_items_by_key parses each item's own manifest instead of
+# loading (and on a cold cache, scanning) the whole catalog.
+PER_ITEM_LOOKUP_MAX = 32
+# libyaml's safe loader parses manifests ~10x faster; PyYAML without libyaml falls back to Python.
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 
 
 def _cache_dir() -> Path:
     """Return the Forge cache directory (e.g. ~/.forge/cache)."""
-    base = Path.home() / ".forge" / "cache"
-    base.mkdir(parents=True, exist_ok=True)
-    return base
+    return cache_root()
 
 
 def _registry_cache_key(url: str, ref: str) -> str:
     """Return a stable directory name for this registry URL + ref."""
-    content = f"{url}\n{ref}"
-    return hashlib.sha256(content.encode()).hexdigest()[:16]
+    return registry_cache_key(url, ref)
+
+
+# Paths checked out eagerly in partial mode: everything needed to build the catalog.
+# Content files (RULE.md, SKILL.md, agent .md, hook scripts) are materialized on demand.
+PARTIAL_CHECKOUT_PATTERNS: tuple[str, ...] = (
+    "/*/*/manifest.yaml",
+    "/prompts/",
+    "/workflows/*/WORKFLOW.md",
+    "/index.json",
+)
+
+
+def _ensure_mirror(root: Path, url: str, remote: str) -> Path:
+    """Return the shared bare object store for url (fetched from remote), creating it if needed."""
+    mirror = mirror_path(root, url)
+    if not (mirror / "HEAD").exists():
+        mirror.parent.mkdir(parents=True, exist_ok=True)
+        run_git(
+            ["init", "--bare", "-q", str(mirror)], error_prefix="Failed to create registry mirror"
+        )
+    if '[remote "origin"]' not in (mirror / "config").read_text(encoding="utf-8"):
+        run_git(
+            ["remote", "add", "origin", remote],
+            cwd=mirror,
+            error_prefix="Failed to create registry mirror",
+        )
+    return mirror
+
+
+def _fetch_into_mirror(mirror: Path, url: str, ref: str, mode: CacheMode = "full") -> str:
+    """Fetch ref from url into the shared mirror; return the commit SHA it resolves to.
+
+    The fetched ref is pinned under ``refs/forge/<key>`` so objects stay reachable
+    and a later fetch of any other ref of the same URL only transfers missing objects.
+    In partial mode the fetch is blobless; origin becomes a promisor remote so git
+    can fetch individual blobs later.
+    """
+    pinned = f"refs/forge/{registry_cache_key(url, ref)}"
+    args = ["fetch", "--depth", "1", "--no-tags"]
+    if mode == "partial":
+        run_git(["config", "remote.origin.promisor", "true"], cwd=mirror)
+        run_git(["config", "remote.origin.partialclonefilter", "blob:none"], cwd=mirror)
+        args.append("--filter=blob:none")
+    run_git(
+        [*args, "origin", f"+{ref}:{pinned}"],
+        cwd=mirror,
+        timeout=120,
+        error_prefix="Failed to fetch registry",
+    )
+    return run_git(
+        ["rev-parse", f"{pinned}^{{commit}}"],
+        cwd=mirror,
+        error_prefix="Failed to read registry commit",
+    )
+
+
+def _add_worktree(mirror: Path, path: Path, commit: str, mode: CacheMode) -> None:
+    """Check commit out of the mirror as a detached worktree at path.
+
+    In partial mode the worktree is sparse: only PARTIAL_CHECKOUT_PATTERNS are
+    checked out until materialize_registry_paths adds item directories. In bare mode
+    nothing is checked out: path stays empty, files are read from the mirror's
+    objects (see forge.core.registry_files), and the commit is pinned under
+    ``refs/forge/snapshots/`` so the mirror never prunes it while the snapshot exists.
+    """
+    if mode == "bare":
+        run_git(
+            ["update-ref", f"refs/forge/snapshots/{commit}", commit],
+            cwd=mirror,
+            error_prefix="Failed to create registry checkout",
+        )
+        path.mkdir()
+        return
+    if mode == "partial":
+        run_git(
+            ["worktree", "add", "-q", "--no-checkout", "--detach", str(path), commit],
+            cwd=mirror,
+            error_prefix="Failed to create registry checkout",
+        )
+        run_git(
+            ["sparse-checkout", "set", "--no-cone", *PARTIAL_CHECKOUT_PATTERNS],
+            cwd=path,
+            error_prefix="Failed to create registry checkout",
+        )
+        run_git(
+            ["read-tree", "-mu", "HEAD"],
+            cwd=path,
+            error_prefix="Failed to create registry checkout",
+        )
+        return
+    run_git(
+        ["worktree", "add", "-q", "--detach", str(path), commit],
+        cwd=mirror,
+        error_prefix="Failed to create registry checkout",
+    )
+
+
+def _ensure_snapshot(root: Path, mirror: Path, url: str, commit: str, mode: CacheMode) -> Path:
+    """Return the completed snapshot for commit, creating it if needed. Caller holds cache_lock."""
+    path = snapshot_path(root, url, commit)
+    if load_snapshot(path) is not None and path.is_dir():
+        return path
+    if path.exists():
+        # Left behind by an interrupted writer: never marked complete, so nobody reads it.
+        shutil.rmtree(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    run_git(["worktree", "prune"], cwd=mirror, error_prefix="Failed to create registry checkout")
+    _add_worktree(mirror, path, commit, mode)
+    save_snapshot(path, RegistrySnapshot(url=url, commit=commit, mode=mode, created_at=time.time()))
+    return path
+
+
+def _remove_legacy_checkout(mirror: Path, legacy: Path) -> None:
+    """Drop a per-ref checkout at ``<key>/`` left by older Forge versions."""
+    if legacy.is_dir():
+        shutil.rmtree(legacy, ignore_errors=True)
+        run_git(
+            ["worktree", "prune"], cwd=mirror, error_prefix="Failed to prune registry checkouts"
+        )
+
+
+def _sparse_checkout_file(repo_path: Path) -> Path | None:
+    """Return the worktree's sparse-checkout pattern file (None if repo_path is no worktree)."""
+    dot_git = repo_path / ".git"
+    if not dot_git.is_file():
+        return None
+    gitdir = dot_git.read_text(encoding="utf-8").strip().removeprefix("gitdir:").strip()
+    return (repo_path / gitdir).resolve() / "info" / "sparse-checkout"
+
+
+def _missing_sparse_patterns(registry_root: Path, paths: list[str]) -> list[str]:
+    patterns_file = _sparse_checkout_file(registry_root)
+    if patterns_file is None:
+        return []
+    existing = (
+        set(patterns_file.read_text(encoding="utf-8").splitlines())
+        if patterns_file.exists()
+        else set()
+    )
+    missing: list[str] = []
+    for rel in paths:
+        pattern = f"/{rel}" if rel.endswith(".md") else f"/{rel}/"
+        if pattern not in existing and pattern not in missing:
+            missing.append(pattern)
+    return missing
+
+
+def materialize_registry_paths(registry_root: Path, paths: list[str]) -> None:
+    """Make sure item files under paths are checked out in a partial-mode snapshot.
+
+    No-op for full snapshots and plain directories. Missing blobs are fetched from
+    the promisor remote by ``git sparse-checkout add``, which runs once per call for
+    all paths that are not yet materialized, under the URL's writer lock.
+
+    Args:
+        registry_root: Registry root returned by fetch_registry.
+        paths: Item paths relative to the registry root (e.g. rules/my-rule).
+
+    Raises:
+        RuntimeError: If files must be fetched in offline mode, or git fails.
+    """
+    registry_root = Path(registry_root)
+    snapshot = load_snapshot(registry_root)
+    if snapshot is None or snapshot.mode != "partial":
+        return
+    if not _missing_sparse_patterns(registry_root, paths):
+        return
+    if is_offline():
+        missing = _missing_sparse_patterns(registry_root, paths)
+        raise RuntimeError(
+            f"Offline mode: item files for {', '.join(p.strip('/') for p in missing)} "
+            "are not in the partial registry cache"
+        )
+    with cache_lock(snapshot_cache_root(registry_root), snapshot.url):
+        missing = _missing_sparse_patterns(registry_root, paths)
+        if missing:
+            run_git(
+                ["sparse-checkout", "add", *missing],
+                cwd=registry_root,
+                timeout=120,
+                error_prefix="Failed to fetch registry item files",
+            )
+
+
+def _is_up_to_date(url: str, ref: str, entry: RegistryCacheEntry) -> bool:
+    """Return True if the cached commit still matches the remote ref (TTL first, then ls-remote)."""
+    if is_within_ttl(entry):
+        return True
+    try:
+        remote = ls_remote_commit(url, ref)
+    except RuntimeError:
+        return False
+    return remote is not None and remote == entry.commit
+
+
+def _ready_snapshot(
+    root: Path, entry: RegistryCacheEntry | None, url: str, ref: str
+) -> Path | None:
+    """Return the completed snapshot an entry points at, or None."""
+    if entry is None or entry.url != url or entry.ref != ref:
+        return None
+    path = snapshot_path(root, url, entry.commit)
+    return path if load_snapshot(path) is not None and path.is_dir() else None
+
+
+def fetch_registry(
+    url: str,
+    ref: str,
+    cache_dir: Path | None = None,
+    offline: bool | None = None,
+) -> Path:
+    """Fetch the registry at url/ref into the cache; return path to an immutable checkout.
 
+    Objects live in one shared bare mirror per URL and each fetched commit is checked
+    out once as a snapshot worktree that is never modified afterwards, so adding a
+    pin or switching ref only fetches objects the mirror does not have yet. The
+    url+ref entry (``<key>.json``) records which commit the ref resolved to; when the
+    remote ref still points at it (or it was checked within FORGE_CACHE_TTL seconds)
+    nothing is fetched. With FORGE_CACHE_MODE=partial new snapshots are blobless:
+    only manifests are checked out and item files are fetched by
+    materialize_registry_paths when installed. With FORGE_CACHE_MODE=bare no working
+    tree is checked out at all and item files are read from git objects.
 
-def fetch_registry(url: str, ref: str, cache_dir: Path | None = None) -> Path:
-    """Clone or update the registry repo at url/ref; return path to repo root.
+    Each use touches the snapshot for LRU eviction; after a fetch that wrote to the
+    cache, FORGE_CACHE_MAX_MB / FORGE_CACHE_MAX_AGE_DAYS are enforced (see cache_gc).
 
-    Uses a cache keyed by url+ref. If the directory already exists, runs git fetch
-    and checkout so the ref is up to date.
+    ``file://`` directories are returned in place and archives are extracted into
+    the cache once per content hash (see forge.core.transports); ref is ignored for both.
+
+    Readers take no lock. Writers hold the URL's exclusive cache_lock while fetching
+    and re-check the entry after acquiring it, so parallel runs fetch only once.
+    The outcome (hit, refreshed, cloned, offline) is recorded for the per-run report.
+
+    In offline mode the cached snapshot is returned as-is without starting any git
+    subprocess; it is an error only if nothing is cached for url+ref yet.
 
     Args:
         url: Git clone URL (e.g. https://github.com/org/forge-registry.git).
         ref: Branch or tag (e.g. main, v1.0.0).
         cache_dir: Override cache root (for tests). Defaults to ~/.forge/cache.
+        offline: Use the cache only. Defaults to the FORGE_OFFLINE environment variable.
 
     Returns:
-        Path to the registry repo root.
+        Path to the registry snapshot root.
 
     Raises:
-        RuntimeError: If git clone or fetch fails.
+        RuntimeError: If git fetch fails, the lock times out, or offline with no cached snapshot.
     """
+    transport, location = parse_registry_url(url)
+    if transport == "directory":
+        return fetch_directory_registry(url, ref, location)
     root = cache_dir or _cache_dir()
-    key = _registry_cache_key(url, ref)
-    repo_path = root / key
+    if transport == "archive":
+        snapshot = fetch_archive_registry(url, ref, location, root)
+        enforce_cache_limits(root)
+        return snapshot
+    entry_path = root / _registry_cache_key(url, ref)
 
-    if repo_path.exists():
-        try:
-            subprocess.run(
-                ["git", "fetch", "origin", ref, "--depth", "1"],
-                cwd=repo_path,
-                check=True,
-                capture_output=True,
-                timeout=60,
+    if offline is None:
+        offline = is_offline()
+    started = time.time()
+    entry = load_cache_entry(entry_path)
+    snapshot = _ready_snapshot(root, entry, url, ref)
+    if offline:
+        if snapshot is None or entry is None:
+            raise RuntimeError(
+                f"Offline mode: registry {url} ({ref}) is not cached yet; "
+                "run once with network access to populate ~/.forge/cache"
             )
-            subprocess.run(
-                ["git", "checkout", "FETCH_HEAD"],
-                cwd=repo_path,
-                check=True,
-                capture_output=True,
-            )
-        except subprocess.CalledProcessError as e:
-            raise RuntimeError(f"Failed to update registry: {e.stderr.decode() if e.stderr else e}")
-        except FileNotFoundError:
-            raise RuntimeError("Git is not installed or not on PATH")
-    else:
-        try:
-            subprocess.run(
-                [
-                    "git",
-                    "clone",
-                    "--depth",
-                    "1",
-                    "--branch",
-                    ref,
-                    url,
-                    str(repo_path),
-                ],
-                check=True,
-                capture_output=True,
-                timeout=120,
+        touch_snapshot(snapshot)
+        record_fetch(url, ref, "offline", entry.commit, snapshot)
+        return snapshot
+
+    if snapshot is not None and entry is not None and _is_up_to_date(location, ref, entry):
+        if not is_within_ttl(entry):
+            save_cache_entry(entry_path, entry.model_copy(update={"checked_at": started}))
+        touch_snapshot(snapshot)
+        record_fetch(url, ref, "hit", entry.commit, snapshot)
+        return snapshot
+
+    with cache_lock(root, url):
+        current = load_cache_entry(entry_path)
+        current_snapshot = _ready_snapshot(root, current, url, ref)
+        if current is not None and current_snapshot is not None and current.checked_at >= started:
+            # Another process refreshed this entry while we waited for the lock.
+            touch_snapshot(current_snapshot)
+            record_fetch(url, ref, "hit", current.commit, current_snapshot)
+            return current_snapshot
+
+        status: FetchStatus = "refreshed" if entry is not None else "cloned"
+        mode = entry.mode if entry is not None else cache_mode()
+        mirror = _ensure_mirror(root, url, location)
+        commit = _fetch_into_mirror(mirror, url, ref, mode)
+        snapshot = _ensure_snapshot(root, mirror, url, commit, mode)
+        if current is not None:
+            _refresh_catalog(
+                mirror, snapshot_path(root, url, current.commit), current.commit, snapshot, commit
             )
-        except subprocess.CalledProcessError as e:
-            raise RuntimeError(f"Failed to clone registry: {e.stderr.decode() if e.stderr else e}")
-        except FileNotFoundError:
-            raise RuntimeError("Git is not installed or not on PATH")
+        save_cache_entry(
+            entry_path,
+            RegistryCacheEntry(url=url, ref=ref, commit=commit, checked_at=time.time(), mode=mode),
+        )
+        _remove_legacy_checkout(mirror, entry_path)
 
-    return repo_path
+    touch_snapshot(snapshot)
+    record_fetch(url, ref, status, commit, snapshot)
+    # The cache only grows on writes, so size/age caps are enforced here, not on hits.
+    enforce_cache_limits(root)
+    return snapshot
 
 
 def _load_manifest_yaml(path: Path) -> dict:
@@ -111,16 +407,22 @@ def _load_manifest_yaml(path: Path) -> dict:
     if not path.exists():
         return {}
     try:
-        with open(path, encoding="utf-8") as f:
-            data = yaml.safe_load(f)
+        return _parse_manifest_text(path.read_bytes())
+    except OSError:
+        return {}
+
+
+def _parse_manifest_text(text: bytes | str) -> dict:
+    """Parse manifest YAML content; return empty dict if invalid or not a mapping."""
+    try:
+        data = yaml.load(text, Loader=_YAML_LOADER)
         return data if isinstance(data, dict) else {}
     except Exception:
         return {}
 
 
-def _parse_item_manifest(manifest_path: Path) -> ItemManifest | None:
-    """Parse manifest.yaml for an agent/rule/skill. Returns None if invalid."""
-    data = _load_manifest_yaml(manifest_path)
+def _parse_item_manifest(data: dict) -> ItemManifest | None:
+    """Parse loaded manifest.yaml data for an agent/rule/skill. Returns None if invalid."""
     if not data or "version" not in data or "project_types" not in data:
         return None
     try:
@@ -133,9 +435,8 @@ def _parse_item_manifest(manifest_path: Path) -> ItemManifest | None:
         return None
 
 
-def _parse_bundle_manifest(manifest_path: Path) -> BundleManifest | None:
-    """Parse manifest.yaml for a bundle. Returns None if invalid."""
-    data = _load_manifest_yaml(manifest_path)
+def _parse_bundle_manifest(data: dict) -> BundleManifest | None:
+    """Parse loaded manifest.yaml data for a bundle. Returns None if invalid."""
     if not data or "version" not in data or "project_types" not in data or "items" not in data:
         return None
     try:
@@ -161,7 +462,14 @@ def _parse_bundle_manifest(manifest_path: Path) -> BundleManifest | None:
 
 
 def get_registry_items(registry_root: Path) -> list[RegistryItem]:
-    """Walk registry_root and build list of RegistryItem from manifest.yaml files.
+    """Return the registry items under registry_root, parsing manifests at most once per commit.
+
+    A valid index.json shipped at the registry root (forge registry build-index) is used
+    instead of walking manifests. For a cache snapshot, manifests are read from git
+    objects rather than the checkout (see _scan_git_registry_items), and the items are
+    persisted next to it (keyed by commit and CATALOG_SCHEMA_VERSION) so later calls load
+    them in a single read. Other roots, such as local directory registries, are read on
+    every call.
 
     Args:
         registry_root: Path to the cloned registry repo root.
@@ -169,77 +477,460 @@ def get_registry_items(registry_root: Path) -> list[RegistryItem]:
     Returns:
         List of all registry items (agents, rules, skills, bundles, workflows, prompts).
     """
+    return [item.to_registry_item() for item in load_catalog_items(registry_root)]
+
+
+_catalogs: dict[tuple[Path, str], Catalog] = {}
+
+
+def get_catalog(registry_root: Path) -> Catalog:
+    """Return the indexed Catalog for registry_root.
+
+    Cache snapshots are immutable, so their Catalog is built once per process and
+    reused; other roots are re-read on every call.
+    """
     registry_root = Path(registry_root)
-    result: list[RegistryItem] = []
+    snapshot = load_snapshot(registry_root)
+    if snapshot is None:
+        return Catalog(load_catalog_items(registry_root))
+    key = (registry_root, snapshot.commit)
+    catalog = _catalogs.get(key)
+    if catalog is None:
+        catalog = _catalogs[key] = Catalog(load_catalog_items(registry_root))
+    return catalog
+
+
+_stores: dict[tuple[Path, str], SqliteCatalog] = {}
+
+
+def get_catalog_store(registry_root: Path) -> SqliteCatalog | None:
+    """Return the SQLite catalog store for registry_root, if FORGE_CATALOG_STORE=sqlite.
+
+    The store is built once per snapshot commit (from the cached catalog) and then
+    queried directly, so lookups and filtered listings never load the whole catalog.
+    Returns None when the store is disabled, for roots that are not cache snapshots,
+    or if the store cannot be written; callers then use the in-memory catalog.
+    """
+    if catalog_store() != "sqlite":
+        return None
+    registry_root = Path(registry_root)
+    snapshot = load_snapshot(registry_root)
+    if snapshot is None:
+        return None
+    key = (registry_root, snapshot.commit)
+    store = _stores.get(key)
+    if store is not None:
+        return store
+    path = catalog_db_path(registry_root)
+    store = SqliteCatalog.open(path, snapshot.commit)
+    if store is None:
+        try:
+            build_sqlite_store(path, snapshot.commit, load_catalog_items(registry_root))
+        except (OSError, sqlite3.Error):
+            return None
+        store = SqliteCatalog.open(path, snapshot.commit)
+        if store is None:
+            return None
+    _stores[key] = store
+    return store
+
+
+def load_catalog_items(registry_root: Path) -> list[CatalogItem]:
+    """Return the compact catalog records behind get_registry_items (no pydantic models built)."""
+    registry_root = Path(registry_root)
+    snapshot = load_snapshot(registry_root)
+    if snapshot is None:
+        # A plain directory can be edited at any time and has no catalog cache: checking
+        # index.json against it would read every file on every run, so its manifests are parsed.
+        return _scan_registry_items(registry_root)
+    cached = load_catalog(registry_root, snapshot.commit)
+    if cached is not None:
+        return cached
+    mirror = mirror_path(snapshot_cache_root(registry_root), snapshot.url)
+    items = _scan_git_registry_items(mirror, snapshot.commit) if mirror.is_dir() else None
+    if items is None:
+        if snapshot.mode == "bare":
+            raise RuntimeError(f"Failed to read registry commit {snapshot.commit} from {mirror}")
+        index = load_verified_registry_index(registry_root)
+        items = _catalog_order(index) if index is not None else _scan_registry_items(registry_root)
+    save_catalog(registry_root, snapshot.commit, items)
+    return items
+
+
+def _parse_prompt_item(category_dir: Path, md_path: Path) -> CatalogItem:
+    """Build the catalog record for one prompt file under prompts/."""
+    rel = md_path.relative_to(category_dir)
+    return CatalogItem(
+        kind="prompt",
+        id=str(rel.with_suffix("")),
+        version="1.0.0",
+        project_types=PROJECT_TYPES,
+        description=None,
+        path=f"{category_dir.name}/{rel}",
+    )
+
+
+def _parse_registry_item(category: str, item_dir: Path) -> CatalogItem | None:
+    """Build the catalog record for one item directory; None if it has no valid manifest."""
+    data = _load_manifest_yaml(item_dir / "manifest.yaml")
+    has_workflow_md = KIND_FROM_DIR[category] == "workflow" and (item_dir / "WORKFLOW.md").exists()
+    return _build_registry_item(category, item_dir.name, data, has_workflow_md)
+
+
+def _build_registry_item(
+    category: str, item_id: str, data: dict, has_workflow_md: bool
+) -> CatalogItem | None:
+    """Build the catalog record for an item from its loaded manifest data; None if invalid."""
+    kind = KIND_FROM_DIR[category]
+    if kind == "bundle":
+        bundle_manifest = _parse_bundle_manifest(data)
+        if bundle_manifest is None:
+            return None
+        return CatalogItem(
+            kind="bundle",
+            id=item_id,
+            version=bundle_manifest.version,
+            project_types=bundle_manifest.project_types,
+            description=bundle_manifest.description,
+            path=f"{category}/{item_id}",
+            items=[(ref.kind, ref.id) for ref in bundle_manifest.items],
+        )
+    item_manifest = _parse_item_manifest(data)
+    # Workflows: also discover by WORKFLOW.md so update works when manifest is missing/invalid
+    if item_manifest is None and kind == "workflow" and has_workflow_md:
+        item_manifest = ItemManifest(
+            version="1.0.0",
+            project_types=list(PROJECT_TYPES),
+            description=None,
+        )
+    if item_manifest is None:
+        return None
+    return CatalogItem(
+        kind=kind,
+        id=item_id,
+        version=item_manifest.version,
+        project_types=item_manifest.project_types,
+        description=item_manifest.description,
+        path=f"{category}/{item_id}",
+    )
+
+
+def _available_cpus() -> int:
+    """Return the number of CPUs this process may run on (its affinity mask, where known)."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def parse_workers(task_count: int) -> int:
+    """Return how many processes to parse task_count manifests with.
+
+    FORGE_PARSE_WORKERS overrides the choice (1 disables parallel parsing). By default
+    registries below PARALLEL_PARSE_THRESHOLD items, and hosts (or CPU-pinned
+    containers) with a single usable CPU, are parsed serially: there a pool only adds
+    start-up and result-pickling costs (see benchmarks/bench_registry_parse.py).
+    """
+    raw = os.environ.get(PARSE_WORKERS_ENV, "").strip()
+    if raw:
+        try:
+            return max(1, int(raw))
+        except ValueError:
+            pass
+    cpus = _available_cpus()
+    if task_count < PARALLEL_PARSE_THRESHOLD or cpus < 2:
+        return 1
+    return min(cpus, MAX_PARSE_WORKERS)
+
+
+def _parse_registry_items_parallel(
+    tasks: list[tuple[str, Path]], workers: int
+) -> list[CatalogItem | None] | None:
+    """Parse item directories on a process pool, in task order; None if no pool is available."""
+    chunksize = max(1, len(tasks) // (workers * 4))
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return list(
+                pool.map(
+                    _parse_registry_item,
+                    [category for category, _ in tasks],
+                    [item_dir for _, item_dir in tasks],
+                    chunksize=chunksize,
+                )
+            )
+    except (OSError, BrokenProcessPool):
+        return None
+
+
+def _catalog_order(items: list[CatalogItem]) -> list[CatalogItem]:
+    """Sort catalog records by category (REGISTRY_CATEGORIES order), then id.
+
+    Every way of building a catalog (walk, git tree, incremental patch) ends with
+    this, so listings and search ties do not depend on how the catalog was built.
+    """
+    return sorted(
+        items, key=lambda item: (REGISTRY_CATEGORIES.index(DIR_FROM_KIND[item.kind]), item.id)
+    )
+
+
+def _scan_registry_items(registry_root: Path, workers: int | None = None) -> list[CatalogItem]:
+    """Walk registry_root and build catalog records from manifest.yaml files.
+
+    Manifests are parsed on a process pool when workers (default: parse_workers) is
+    above 1; the result is in catalog order (see _catalog_order) either way.
+    """
+    tasks: list[tuple[str, Path]] = []
+    prompts: list[CatalogItem] = []
+    prompts_at = 0
 
     for category in REGISTRY_CATEGORIES:
-        kind = KIND_FROM_DIR[category]
         dir_path = registry_root / category
         if not dir_path.is_dir():
             continue
 
-        if kind == "prompt":
+        if KIND_FROM_DIR[category] == "prompt":
+            prompts_at = len(tasks)
             for md_path in dir_path.rglob("*.md"):
                 if md_path.name == "README.md":
                     continue
-                rel = md_path.relative_to(dir_path)
-                item_id = str(rel.with_suffix(""))
-                path_str = f"{category}/{rel}"
-                result.append(
-                    RegistryItem(
-                        kind="prompt",
-                        id=item_id,
-                        version="1.0.0",
-                        project_types=list(PROJECT_TYPES),
-                        description=None,
-                        path=path_str,
-                        items=None,
-                    )
-                )
+                prompts.append(_parse_prompt_item(dir_path, md_path))
             continue
 
         for item_dir in dir_path.iterdir():
-            if not item_dir.is_dir():
-                continue
-            item_id = item_dir.name
-            manifest_path = item_dir / "manifest.yaml"
-            if kind == "bundle":
-                bundle_manifest = _parse_bundle_manifest(manifest_path)
-                if bundle_manifest is None:
-                    continue
-                result.append(
-                    RegistryItem(
-                        kind="bundle",
-                        id=item_id,
-                        version=bundle_manifest.version,
-                        project_types=bundle_manifest.project_types,
-                        description=bundle_manifest.description,
-                        path=f"{category}/{item_id}",
-                        items=bundle_manifest.items,
-                    )
-                )
-            else:
-                item_manifest = _parse_item_manifest(manifest_path)
-                # Workflows: also discover by WORKFLOW.md so update works when manifest is missing/invalid
-                if item_manifest is None and kind == "workflow":
-                    workflow_md = item_dir / "WORKFLOW.md"
-                    if workflow_md.exists():
-                        item_manifest = ItemManifest(
-                            version="1.0.0",
-                            project_types=list(PROJECT_TYPES),
-                            description=None,
-                        )
-                if item_manifest is None:
-                    continue
-                result.append(
-                    RegistryItem(
-                        kind=kind,
-                        id=item_id,
-                        version=item_manifest.version,
-                        project_types=item_manifest.project_types,
-                        description=item_manifest.description,
-                        path=f"{category}/{item_id}",
-                        items=None,
-                    )
-                )
-    return result
+            if item_dir.is_dir():
+                tasks.append((category, item_dir))
+
+    if workers is None:
+        workers = parse_workers(len(tasks))
+    parsed = None
+    if workers > 1 and len(tasks) > 1:
+        parsed = _parse_registry_items_parallel(tasks, workers)
+    if parsed is None:
+        parsed = [_parse_registry_item(category, item_dir) for category, item_dir in tasks]
+
+    # Prompts are cheap and parsed inline; splice them back where the walk found them.
+    result = [item for item in parsed[:prompts_at] if item is not None]
+    result.extend(prompts)
+    result.extend(item for item in parsed[prompts_at:] if item is not None)
+    return _catalog_order(result)
+
+
+def _scan_git_registry_items(repo: Path, commit: str) -> list[CatalogItem] | None:
+    """Build catalog records for commit from git objects in repo instead of a checkout.
+
+    One ``git ls-tree -r`` lists the registry tree and one ``git cat-file --batch``
+    reads every manifest (or a committed index.json whose manifest blob ids still
+    match the tree), so no file in the checkout is
+    stat'ed or opened. Records come out in the same category order as a walk, with
+    item ids sorted. Returns None if git cannot read the commit, or if a manifest is
+    a symlink (only the checkout resolves those); callers then walk the checkout.
+    """
+    try:
+        entries = ls_tree(repo, commit, [INDEX_FILENAME, *REGISTRY_CATEGORIES])
+    except RuntimeError:
+        return None
+    item_ids: dict[str, dict[str, None]] = {}
+    manifests: dict[tuple[str, str], str] = {}
+    workflow_mds: set[str] = set()
+    prompt_paths: list[str] = []
+    index_oid: str | None = None
+    for mode, oid, path in entries:
+        if path == INDEX_FILENAME:
+            index_oid = oid
+            continue
+        parts = path.split("/")
+        category = parts[0]
+        if category == "prompts":
+            if path.endswith(".md") and parts[-1] != "README.md":
+                prompt_paths.append(path)
+            continue
+        if len(parts) < 3:
+            continue
+        item_ids.setdefault(category, {})[parts[1]] = None
+        if len(parts) != 3:
+            continue
+        if parts[2] == "manifest.yaml":
+            if mode == "120000":
+                return None
+            manifests[(category, parts[1])] = oid
+        elif parts[2] == "WORKFLOW.md" and category == "workflows":
+            workflow_mds.add(parts[1])
+
+    try:
+        if index_oid is not None:
+            raw = cat_file_batch(repo, [index_oid]).get(index_oid, b"")
+            oids = {f"{c}/{i}": oid for (c, i), oid in manifests.items()}
+            index = load_verified_git_index(raw, oids, prompt_paths)
+            if index is not None:
+                return _catalog_order(index)
+        contents = cat_file_batch(repo, manifests.values())
+    except RuntimeError:
+        return None
+
+    prompts_dir = Path("prompts")
+    result: list[CatalogItem] = []
+    for category in REGISTRY_CATEGORIES:
+        if category == "prompts":
+            result.extend(_parse_prompt_item(prompts_dir, Path(path)) for path in prompt_paths)
+            continue
+        for item_id in item_ids.get(category, {}):
+            oid = manifests.get((category, item_id))
+            data = _parse_manifest_text(contents[oid]) if oid in contents else {}
+            item = _build_registry_item(category, item_id, data, item_id in workflow_mds)
+            if item is not None:
+                result.append(item)
+    return _catalog_order(result)
+
+
+def get_registry_item(registry_root: Path, kind: str, item_id: str) -> RegistryItem | None:
+    """Return one registry item by parsing only its own manifest (or prompt file).
+
+    Unlike get_registry_items this does not walk the registry, so the cost does not
+    depend on how many items it holds. With the SQLite catalog store enabled, the
+    item is read from the store instead.
+
+    Args:
+        registry_root: Path to the cloned registry repo root.
+        kind: Item kind (agent, rule, skill, bundle, workflow, prompt, hook).
+        item_id: Item id; for prompts, the path under prompts/ without .md.
+
+    Returns:
+        The item, or None if it does not exist or its manifest is invalid.
+    """
+    store = get_catalog_store(registry_root)
+    if store is not None:
+        record = store.get(kind, item_id)
+        return record.to_registry_item() if record is not None else None
+    category = DIR_FROM_KIND.get(kind)
+    parts = PurePosixPath(item_id).parts
+    if category is None or not parts or ".." in parts or PurePosixPath(item_id).is_absolute():
+        return None
+    if kind != "prompt" and len(parts) != 1:
+        return None
+    item = _read_registry_item(registry_files(registry_root), category, item_id)
+    return item.to_registry_item() if item is not None else None
+
+
+def _read_registry_item(files: RegistryFiles, category: str, item_id: str) -> CatalogItem | None:
+    """Build the catalog record for one item (or prompt file) read through files; None if absent."""
+    if category == "prompts":
+        rel = f"{category}/{item_id}.md"
+        if PurePosixPath(rel).name == "README.md" or not files.is_file(rel):
+            return None
+        return _parse_prompt_item(Path(category), Path(rel))
+    item_dir = f"{category}/{item_id}"
+    if not files.is_dir(item_dir):
+        return None
+    manifest = f"{item_dir}/manifest.yaml"
+    data = _parse_manifest_text(files.read_bytes(manifest)) if files.is_file(manifest) else {}
+    has_workflow_md = category == "workflows" and files.is_file(f"{item_dir}/WORKFLOW.md")
+    return _build_registry_item(category, item_id, data, has_workflow_md)
+
+
+def get_registry_items_by_key(
+    registry_root: Path, keys: Iterable[tuple[str, str]]
+) -> dict[tuple[str, str], RegistryItem]:
+    """Return (kind, id) -> RegistryItem for the keys that exist, in the order given.
+
+    With the SQLite store enabled, all keys are read in one query. Otherwise a
+    few keys (up to PER_ITEM_LOOKUP_MAX) are looked up like get_registry_item, so
+    the cost does not depend on the registry's size, and larger sets are resolved
+    against one load of the snapshot's Catalog rather than one manifest parse each.
+    """
+    keys = list(dict.fromkeys(keys))
+    store = get_catalog_store(registry_root)
+    if store is not None:
+        return {key: record.to_registry_item() for key, record in store.get_many(keys).items()}
+    if len(keys) <= PER_ITEM_LOOKUP_MAX:
+        found = {key: get_registry_item(registry_root, *key) for key in keys}
+        return {key: item for key, item in found.items() if item is not None}
+    catalog = get_catalog(registry_root)
+    return {key: catalog[key] for key in keys if key in catalog}
+
+
+def resolve_bundle_members(
+    registry_root: Path, bundle_item: RegistryItem
+) -> dict[tuple[str, str], RegistryItem]:
+    """Return (kind, id) -> RegistryItem for a bundle's members; missing members are left out."""
+    store = get_catalog_store(registry_root)
+    if store is not None:
+        records = store.get_many((ref.kind, ref.id) for ref in bundle_item.items or [])
+        return {key: record.to_registry_item() for key, record in records.items()}
+    members: dict[tuple[str, str], RegistryItem] = {}
+    for ref in bundle_item.items or []:
+        item = get_registry_item(registry_root, ref.kind, ref.id)
+        if item is not None:
+            members[(ref.kind, ref.id)] = item
+    return members
+
+
+def _catalog_key_for_path(path: str) -> tuple[str, str] | None:
+    """Map a changed repo path to the (category, id) catalog entry it can affect, if any.
+
+    Only files the parser reads matter: item manifests, WORKFLOW.md (workflow
+    fallback), and prompt .md files. Content files never change the catalog.
+    """
+    parts = path.split("/")
+    if len(parts) < 2 or parts[0] not in KIND_FROM_DIR:
+        return None
+    if parts[0] == "prompts":
+        if not path.endswith(".md") or parts[-1] == "README.md":
+            return None
+        return parts[0], "/".join(parts[1:])[: -len(".md")]
+    if len(parts) == 3 and (
+        parts[2] == "manifest.yaml" or (parts[0] == "workflows" and parts[2] == "WORKFLOW.md")
+    ):
+        return parts[0], parts[1]
+    return None
+
+
+def _patch_catalog(
+    items: list[CatalogItem], registry_root: Path, changed_paths: list[str]
+) -> list[CatalogItem]:
+    """Return items with the entries touched by changed_paths re-parsed from registry_root."""
+    dirty = {key for key in map(_catalog_key_for_path, changed_paths) if key is not None}
+    if not dirty:
+        return list(items)
+    files = registry_files(registry_root)
+    reparsed = {
+        (category, item_id): _read_registry_item(files, category, item_id)
+        for category, item_id in dirty
+    }
+
+    result: list[CatalogItem] = []
+    for item in items:
+        key = (DIR_FROM_KIND[item.kind], item.id)
+        if key in reparsed:
+            new_item = reparsed.pop(key)
+            if new_item is not None:
+                result.append(new_item)
+        else:
+            result.append(item)
+    result.extend(item for item in reparsed.values() if item is not None)
+    return _catalog_order(result)
+
+
+def _refresh_catalog(
+    mirror: Path, old_snapshot: Path, old_commit: str, new_snapshot: Path, new_commit: str
+) -> None:
+    """Derive the catalog for new_commit from old_commit's catalog plus git diff, if possible.
+
+    Only manifests (and prompt files) touched between the two commits are re-parsed, so
+    the cost scales with the size of the change. Registries that ship index.json, or
+    snapshots without a catalog to start from, are left to get_registry_items.
+    """
+    if old_commit == new_commit or load_catalog(new_snapshot, new_commit) is not None:
+        return
+    if registry_files(new_snapshot).is_file(INDEX_FILENAME):
+        return
+    old_items = load_catalog(old_snapshot, old_commit)
+    if old_items is None:
+        return
+    try:
+        out = run_git(
+            ["diff", "--name-only", "--no-renames", "-z", old_commit, new_commit], cwd=mirror
+        )
+    except RuntimeError:
+        return
+    changed = [p for p in out.split("\0") if p]
+    save_catalog(new_snapshot, new_commit, _patch_catalog(old_items, new_snapshot, changed))
@@ -0,0 +1,317 @@
+"""Registry cache layout, sidecar metadata, freshness policy, and cross-process locking.
+
+Layout under the cache root (~/.forge/cache)::
+
+    mirrors/<url-key>.git            shared bare object store per registry URL
+    snapshots/<url-key>/<commit>/    immutable checkout of one commit (empty in bare mode)
+    snapshots/<url-key>/<commit>.json  snapshot sidecar, written once the checkout is complete
+    snapshots/<url-key>/<commit>.catalog  parsed registry items for that commit (JSON)
+    snapshots/<url-key>/<commit>.search   forge search inverted index for that commit (JSON)
+    snapshots/<url-key>/<commit>.sqlite   optional SQLite catalog store (FORGE_CATALOG_STORE=sqlite)
+    snapshots/<url-key>/<commit>.store    file path -> entry in forge.core.asset_store
+    <key>.json                       url+ref entry: which commit the ref resolved to, and when
+    locks/<url-key>.lock             exclusive lock held by writers fetching that URL
+
+Readers never lock: they resolve ``<key>.json`` to a completed snapshot, which is
+never modified in place. Writers serialize on the per-URL lock.
+"""
+
+import hashlib
+import json
+import os
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TypeVar
+
+from pydantic import BaseModel
+
+from forge.core.catalog import CatalogItem
+from forge.core.models import (
+    CacheMode,
+    CatalogStore,
+    FetchStatus,
+    RegistryCacheEntry,
+    RegistryFetchReport,
+    RegistrySnapshot,
+)
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+    import msvcrt
+
+CACHE_TTL_ENV = "FORGE_CACHE_TTL"
+OFFLINE_ENV = "FORGE_OFFLINE"
+CACHE_MODE_ENV = "FORGE_CACHE_MODE"
+CATALOG_STORE_ENV = "FORGE_CATALOG_STORE"
+# Bump when manifest parsing changes so catalogs written by older versions are re-parsed.
+CATALOG_SCHEMA_VERSION = 2
+
+_fetch_reports: list[RegistryFetchReport] = []
+
+
+def cache_root() -> Path:
+    """Return the Forge cache directory (e.g. ~/.forge/cache)."""
+    base = Path.home() / ".forge" / "cache"
+    base.mkdir(parents=True, exist_ok=True)
+    return base
+
+
+def registry_cache_key(url: str, ref: str) -> str:
+    """Return a stable directory name for this registry URL + ref."""
+    content = f"{url}\n{ref}"
+    return hashlib.sha256(content.encode()).hexdigest()[:16]
+
+
+def url_cache_key(url: str) -> str:
+    """Return a stable directory name for a registry URL (shared by all its refs)."""
+    return hashlib.sha256(url.encode()).hexdigest()[:16]
+
+
+def mirror_path(root: Path, url: str) -> Path:
+    """Return the shared bare mirror for a registry URL (one per URL, shared by all refs)."""
+    return root / "mirrors" / f"{url_cache_key(url)}.git"
+
+
+def snapshot_path(root: Path, url: str, commit: str) -> Path:
+    """Return the immutable checkout directory for one commit of a registry URL."""
+    return root / "snapshots" / url_cache_key(url) / commit
+
+
+def snapshot_cache_root(snapshot: Path) -> Path:
+    """Return the cache root that contains a snapshot directory."""
+    return snapshot.parent.parent.parent
+
+
+def entry_meta_path(repo_path: Path) -> Path:
+    """Return the sidecar metadata file for a cache path (``<name>.json`` next to ``<name>``)."""
+    return repo_path.with_name(f"{repo_path.name}.json")
+
+
+_M = TypeVar("_M", bound=BaseModel)
+
+
+def _load_sidecar(repo_path: Path, model: type[_M]) -> _M | None:
+    path = entry_meta_path(repo_path)
+    if not path.exists():
+        return None
+    try:
+        return model.model_validate(json.loads(path.read_text(encoding="utf-8")))
+    except Exception:
+        return None
+
+
+def _save_sidecar(repo_path: Path, data: BaseModel) -> None:
+    path = entry_meta_path(repo_path)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(json.dumps(data.model_dump()), encoding="utf-8")
+    tmp_path.replace(path)
+
+
+def load_cache_entry(repo_path: Path) -> RegistryCacheEntry | None:
+    """Load the url+ref entry stored next to repo_path; None if missing or unreadable."""
+    return _load_sidecar(repo_path, RegistryCacheEntry)
+
+
+def save_cache_entry(repo_path: Path, entry: RegistryCacheEntry) -> None:
+    """Write the url+ref entry atomically (tmp + rename)."""
+    _save_sidecar(repo_path, entry)
+
+
+def load_snapshot(snapshot: Path) -> RegistrySnapshot | None:
+    """Load snapshot metadata; None if snapshot is not a completed cache snapshot."""
+    return _load_sidecar(snapshot, RegistrySnapshot)
+
+
+def save_snapshot(snapshot: Path, meta: RegistrySnapshot) -> None:
+    """Mark a snapshot as complete by writing its sidecar atomically."""
+    _save_sidecar(snapshot, meta)
+
+
+def touch_snapshot(snapshot: Path) -> None:
+    """Record a use of snapshot for LRU eviction (one utime on its sidecar)."""
+    try:
+        os.utime(entry_meta_path(snapshot))
+    except OSError:
+        pass
+
+
+def snapshot_last_used(snapshot: Path) -> float:
+    """Return the Unix time snapshot was last returned by fetch_registry (0 if unknown)."""
+    try:
+        return entry_meta_path(snapshot).stat().st_mtime
+    except OSError:
+        return 0.0
+
+
+def catalog_path(snapshot: Path) -> Path:
+    """Return the parsed-catalog file for a snapshot (``<commit>.catalog`` next to it)."""
+    return snapshot.with_name(f"{snapshot.name}.catalog")
+
+
+def load_catalog(snapshot: Path, commit: str) -> list[CatalogItem] | None:
+    """Load the parsed items for snapshot; None if missing, stale, or written by another schema.
+
+    The file holds compact rows (CatalogItem.to_row) and is trusted, so loading builds
+    no pydantic models.
+    """
+    path = catalog_path(snapshot)
+    try:
+        data = json.loads(path.read_bytes())
+        if data.get("schema_version") != CATALOG_SCHEMA_VERSION or data.get("commit") != commit:
+            return None
+        return [CatalogItem.from_row(row) for row in data["items"]]
+    except Exception:
+        return None
+
+
+def save_catalog(snapshot: Path, commit: str, items: list[CatalogItem]) -> None:
+    """Persist the parsed items for snapshot atomically (tmp + rename); errors are ignored."""
+    data = {
+        "schema_version": CATALOG_SCHEMA_VERSION,
+        "commit": commit,
+        "items": [item.to_row() for item in items],
+    }
+    write_json_atomic(catalog_path(snapshot), data)
+
+
+def search_index_path(snapshot: Path) -> Path:
+    """Return the full-text search index file for a snapshot (``<commit>.search`` next to it)."""
+    return snapshot.with_name(f"{snapshot.name}.search")
+
+
+def catalog_db_path(snapshot: Path) -> Path:
+    """Return the SQLite catalog store for a snapshot (``<commit>.sqlite`` next to it)."""
+    return snapshot.with_name(f"{snapshot.name}.sqlite")
+
+
+def store_index_path(snapshot: Path) -> Path:
+    """Return the asset store index for a snapshot (``<commit>.store`` next to it)."""
+    return snapshot.with_name(f"{snapshot.name}.store")
+
+
+def write_json_atomic(path: Path, data: object) -> None:
+    """Write compact JSON to path via tmp + rename; errors are ignored (caches are best effort)."""
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        tmp_path.write_text(json.dumps(data, separators=(",", ":")), encoding="utf-8")
+        tmp_path.replace(path)
+    except OSError:
+        tmp_path.unlink(missing_ok=True)
+
+
+LOCK_TIMEOUT_SECONDS = 300.0
+
+
+def _try_lock(fd: int) -> bool:
+    if fcntl is not None:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except BlockingIOError:
+            return False
+    try:  # pragma: no cover - Windows
+        msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        return True
+    except OSError:  # pragma: no cover - Windows
+        return False
+
+
+def _unlock(fd: int) -> None:
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    else:  # pragma: no cover - Windows
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+
+@contextmanager
+def file_lock(lock_file: Path, timeout: float = LOCK_TIMEOUT_SECONDS) -> Iterator[None]:
+    """Hold an exclusive lock on lock_file (created if missing) across processes.
+
+    Raises:
+        RuntimeError: If the lock is not acquired within timeout seconds.
+    """
+    lock_file.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(lock_file, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        deadline = time.monotonic() + timeout
+        while not _try_lock(fd):
+            if time.monotonic() >= deadline:
+                raise RuntimeError(f"Timed out waiting for lock {lock_file}")
+            time.sleep(0.05)
+        try:
+            yield
+        finally:
+            _unlock(fd)
+    finally:
+        os.close(fd)
+
+
+@contextmanager
+def cache_lock(root: Path, url: str, timeout: float = LOCK_TIMEOUT_SECONDS) -> Iterator[None]:
+    """Hold the exclusive writer lock for a registry URL's mirror and snapshots.
+
+    Raises:
+        RuntimeError: If the lock is not acquired within timeout seconds.
+    """
+    with file_lock(root / "locks" / f"{url_cache_key(url)}.lock", timeout):
+        yield
+
+
+def is_offline() -> bool:
+    """Return True if FORGE_OFFLINE is set to a truthy value (1, true, yes, on)."""
+    return os.environ.get(OFFLINE_ENV, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def cache_mode() -> CacheMode:
+    """Return the mode from FORGE_CACHE_MODE: full (default), partial, or bare."""
+    raw = os.environ.get(CACHE_MODE_ENV, "").strip().lower()
+    return raw if raw in ("partial", "bare") else "full"  # type: ignore[return-value]
+
+
+def catalog_store() -> CatalogStore:
+    """Return the catalog backend from FORGE_CATALOG_STORE (json or sqlite; default json)."""
+    raw = os.environ.get(CATALOG_STORE_ENV, "").strip().lower()
+    return "sqlite" if raw == "sqlite" else "json"
+
+
+def cache_ttl_seconds() -> float:
+    """Return the freshness TTL from FORGE_CACHE_TTL (seconds); 0 means always check the remote."""
+    raw = os.environ.get(CACHE_TTL_ENV, "").strip()
+    if not raw:
+        return 0.0
+    try:
+        return max(0.0, float(raw))
+    except ValueError:
+        return 0.0
+
+
+def is_within_ttl(entry: RegistryCacheEntry, now: float | None = None) -> bool:
+    """Return True if the entry was checked against the remote within the configured TTL."""
+    ttl = cache_ttl_seconds()
+    if ttl <= 0:
+        return False
+    current = time.time() if now is None else now
+    return current - entry.checked_at < ttl
+
+
+def record_fetch(
+    url: str, ref: str, status: FetchStatus, commit: str | None, path: Path
+) -> RegistryFetchReport:
+    """Append a fetch outcome to the per-run report and return it."""
+    report = RegistryFetchReport(url=url, ref=ref, status=status, commit=commit, path=str(path))
+    _fetch_reports.append(report)
+    return report
+
+
+def get_fetch_reports() -> list[RegistryFetchReport]:
+    """Return fetch outcomes recorded in this process, oldest first."""
+    return list(_fetch_reports)
+
+
+def clear_fetch_reports() -> None:
+    """Forget recorded fetch outcomes (e.g. between CLI invocations in tests)."""
+    _fetch_reports.clear()
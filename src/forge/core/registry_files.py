@@ -0,0 +1,445 @@
+"""Read registry item files from a checkout or, for bare cache snapshots, from git objects.
+
+Everything that reads item content (install, hooks, single-item lookup, search)
+goes through RegistryFiles, addressed by POSIX paths relative to the registry root.
+Checkouts and plain directories are read from disk; snapshots created with
+FORGE_CACHE_MODE=bare have no working tree, so their files are listed once with
+``git ls-tree`` and streamed from the mirror through a long-lived ``git cat-file``.
+"""
+
+import atexit
+import filecmp
+import hashlib
+import os
+import posixpath
+import shutil
+from collections.abc import Callable
+from pathlib import Path
+from typing import TYPE_CHECKING, Literal
+
+from forge.core.asset_store import AssetStore, asset_store
+from forge.core.git import CatFileReader, ls_tree
+from forge.core.models import LinkMode
+from forge.core.registry_cache import load_snapshot, mirror_path, snapshot_cache_root
+
+if TYPE_CHECKING:
+    from forge.core.transaction import Transaction
+
+# Symlinks inside a bare snapshot are followed at most this many times.
+MAX_SYMLINK_HOPS = 8
+
+# ioctl that makes one file share another's data blocks copy-on-write (Linux btrfs, XFS, ...).
+_FICLONE = 0x40049409
+
+SyncOutcome = Literal["unchanged", "copied", "linked"]
+
+
+def _shares_inode(dest: Path) -> bool:
+    """Return True if dest is a symlink or a file with other hard links (e.g. into the cache)."""
+    try:
+        return dest.is_symlink() or dest.stat().st_nlink > 1
+    except OSError:
+        return False
+
+
+def _is_link_to(dest: Path, source: Path, link_mode: LinkMode) -> bool:
+    try:
+        if link_mode == "symlink":
+            return dest.is_symlink() and os.readlink(dest) == str(source)
+        return not dest.is_symlink() and os.path.samefile(source, dest)
+    except OSError:
+        return False
+
+
+def write_file(
+    dest: Path, create: Callable[[Path], None], txn: "Transaction | None" = None
+) -> None:
+    """Build dest's new content with create(path) at a temporary path, then put it in place.
+
+    Without a transaction the file is renamed over dest at once; with one it is
+    staged and renamed on commit. Either way dest (or a link it may be) is replaced,
+    never written through.
+
+    Raises:
+        Whatever create raises; the temporary file is removed first.
+    """
+    target = txn.staging_path() if txn is not None else dest.with_name(f".{dest.name}.forge-tmp")
+    target.unlink(missing_ok=True)
+    try:
+        create(target)
+        if txn is None:
+            os.replace(target, dest)
+    except BaseException:
+        target.unlink(missing_ok=True)
+        raise
+    if txn is not None:
+        txn.add_write(target, dest)
+
+
+def _reflink(source: Path, tmp: Path) -> None:
+    try:
+        import fcntl
+    except ImportError:
+        raise OSError("reflinks are not supported on this platform")
+    with open(source, "rb") as src, open(tmp, "wb") as out:
+        fcntl.ioctl(out.fileno(), _FICLONE, src.fileno())
+    shutil.copystat(source, tmp)
+    # Store entries are read-only; the clone owns its blocks and stays editable.
+    tmp.chmod(tmp.stat().st_mode | 0o200)
+
+
+_LINKERS: dict[str, Callable[[Path, Path], None]] = {
+    "hardlink": os.link,
+    "symlink": os.symlink,
+    "reflink": _reflink,
+}
+
+
+def _link(source: Path, dest: Path, link_mode: LinkMode, txn: "Transaction | None") -> bool:
+    """Hard-link, symlink, or reflink dest to source; False if the filesystem refuses."""
+    try:
+        write_file(dest, lambda tmp: _LINKERS[link_mode](source, tmp), txn)
+    except OSError:
+        return False
+    return True
+
+
+class RegistryFiles:
+    """Read-only access to the files of one registry root.
+
+    Files of a cache snapshot have a snapshot path and an asset store; link targets
+    are taken from the store (see source_path).
+    """
+
+    snapshot: Path | None = None
+    store: AssetStore | None = None
+
+    def is_file(self, rel: str) -> bool:
+        raise NotImplementedError
+
+    def is_dir(self, rel: str) -> bool:
+        raise NotImplementedError
+
+    def list_dir(self, rel: str) -> list[str]:
+        """Return the names of the files directly in directory rel, sorted (empty if none)."""
+        raise NotImplementedError
+
+    def walk(self, rel: str) -> list[str]:
+        """Return the paths of all files under rel (or rel itself if it is a file), sorted."""
+        raise NotImplementedError
+
+    def read_bytes(self, rel: str) -> bytes:
+        """Return the content of file rel.
+
+        Raises:
+            FileNotFoundError: If rel is not a file.
+        """
+        raise NotImplementedError
+
+    def copy_file(self, rel: str, dest: Path) -> None:
+        """Copy file rel to dest, keeping its executable bit.
+
+        Raises:
+            FileNotFoundError: If rel is not a file.
+        """
+        raise NotImplementedError
+
+    def matches(self, rel: str, dest: Path) -> bool:
+        """Return True if dest is a file with exactly the content of file rel."""
+        raise NotImplementedError
+
+    def is_executable(self, rel: str) -> bool:
+        """Return True if file rel is executable (False if it is not a file)."""
+        raise NotImplementedError
+
+    def local_path(self, rel: str) -> Path | None:
+        """Return the file for rel on disk, or None if it is not a plain file on disk."""
+        return None
+
+    def source_path(self, rel: str, add: bool = True) -> Path | None:
+        """Return the asset store entry for rel that project files may link to, or None if none.
+
+        Only cache snapshots use the store; the entry is added on first use unless
+        add is False (dry runs), in which case only an existing entry is returned.
+
+        Raises:
+            FileNotFoundError: If rel is not a file.
+        """
+        if self.store is None or self.snapshot is None:
+            return None
+        if not add:
+            return self.store.lookup(rel, self.snapshot)
+        return self.store.ingest(self, rel, self.snapshot)
+
+    def sync_file(
+        self,
+        rel: str,
+        dest: Path,
+        link_mode: LinkMode = "copy",
+        txn: "Transaction | None" = None,
+        executable: bool = False,
+    ) -> SyncOutcome:
+        """Materialize file rel at dest unless dest is already up to date, and say what was done.
+
+        With link_mode copy, dest gets its own copy. hardlink and symlink point dest
+        at the file's asset store entry and reflink shares its blocks copy-on-write;
+        each falls back to a copy when there is no such entry (plain directories)
+        or the filesystem cannot link. Leaving
+        up-to-date files alone keeps their mtimes, so editors and file watchers in
+        the project do not see a change. With txn, the new file is staged in the
+        transaction and dest's state includes its earlier staged changes. In a dry
+        run the change is only recorded, assuming links succeed, and nothing is
+        added to the store. With executable, dest must be executable even if rel
+        is not (hook scripts): such a file is always copied, never linked, and a
+        dest without its exec bit is replaced by a staged copy, never chmodded.
+
+        Raises:
+            FileNotFoundError: If rel is not a file.
+        """
+        current = txn.current(dest) if txn is not None else dest
+        dry_run = txn is not None and txn.dry_run
+        if executable and not self.is_executable(rel):
+            # Store entries are shared and read-only; the exec bit needs a copy of its own.
+            link_mode = "copy"
+        source = self.source_path(rel, add=not dry_run) if link_mode != "copy" else None
+        if (
+            dry_run
+            and source is None
+            and self.store is not None
+            and link_mode in ("hardlink", "symlink")
+        ):
+            # A real run adds the entry to the store and links dest to it.
+            if not self.is_file(rel):
+                raise FileNotFoundError(f"Not a file in the registry: {rel}")
+            txn.add_write(None, dest)
+            return "linked"
+        if source is not None and link_mode != "reflink":
+            if _is_link_to(current, source, link_mode):
+                return "unchanged"
+            if dry_run:
+                txn.add_write(None, dest)
+                return "linked"
+            if _link(source, dest, link_mode, txn):
+                return "linked"
+        # A link into the cache is replaced by a copy even if the content matches.
+        if not _shares_inode(current) and self.matches(rel, current):
+            if not executable or current.stat().st_mode & 0o111:
+                return "unchanged"
+        if dry_run:
+            if not self.is_file(rel):
+                raise FileNotFoundError(f"Not a file in the registry: {rel}")
+            txn.add_write(None, dest)
+            return "linked" if source is not None else "copied"
+        if source is not None and link_mode == "reflink" and _link(source, dest, link_mode, txn):
+            return "linked"
+        write_file(dest, lambda tmp: self._copy_to(rel, tmp, executable), txn)
+        return "copied"
+
+    def _copy_to(self, rel: str, dest: Path, executable: bool) -> None:
+        self.copy_file(rel, dest)
+        if executable:
+            dest.chmod(dest.stat().st_mode | 0o111)
+
+
+class DirectoryFiles(RegistryFiles):
+    """Files of a checked-out registry (full or partial snapshot, or a plain directory).
+
+    Only cache snapshots (given a store) are offered as link targets; a plain
+    directory can change under the project, so its files are always copied.
+    """
+
+    def __init__(self, root: Path, store: AssetStore | None = None) -> None:
+        self.root = Path(root)
+        self.store = store
+        self.snapshot = self.root if store is not None else None
+
+    def is_file(self, rel: str) -> bool:
+        return (self.root / rel).is_file()
+
+    def is_dir(self, rel: str) -> bool:
+        return (self.root / rel).is_dir()
+
+    def list_dir(self, rel: str) -> list[str]:
+        path = self.root / rel
+        return sorted(p.name for p in path.iterdir() if p.is_file()) if path.is_dir() else []
+
+    def walk(self, rel: str) -> list[str]:
+        path = self.root / rel
+        if path.is_file():
+            return [rel]
+        if not path.is_dir():
+            return []
+        return sorted(p.relative_to(self.root).as_posix() for p in path.rglob("*") if p.is_file())
+
+    def read_bytes(self, rel: str) -> bytes:
+        return (self.root / rel).read_bytes()
+
+    def copy_file(self, rel: str, dest: Path) -> None:
+        shutil.copy2(self.root / rel, dest)
+
+    def local_path(self, rel: str) -> Path | None:
+        path = self.root / rel
+        return path if path.is_file() and not path.is_symlink() else None
+
+    def is_executable(self, rel: str) -> bool:
+        path = self.root / rel
+        try:
+            return path.is_file() and bool(path.stat().st_mode & 0o111)
+        except OSError:
+            return False
+
+    def matches(self, rel: str, dest: Path) -> bool:
+        src = self.root / rel
+        try:
+            if not dest.is_file() or src.stat().st_size != dest.stat().st_size:
+                return False
+            # Like the git reader: an executable that lost its exec bit is out of date.
+            if src.stat().st_mode & 0o111 and not dest.stat().st_mode & 0o111:
+                return False
+            return filecmp.cmp(src, dest, shallow=False)
+        except OSError:
+            return False
+
+
+class GitObjectFiles(RegistryFiles):
+    """Files of one commit, read from a git object store without a working tree."""
+
+    def __init__(
+        self,
+        repo: Path,
+        commit: str,
+        reader: CatFileReader | None = None,
+        snapshot: Path | None = None,
+        store: AssetStore | None = None,
+    ) -> None:
+        self.repo = repo
+        self.commit = commit
+        self.reader = reader or CatFileReader(repo)
+        self.snapshot = snapshot
+        self.store = store
+        self._tree: dict[str, tuple[str, str]] | None = None
+        self._dirs: set[str] | None = None
+
+    @property
+    def tree(self) -> dict[str, tuple[str, str]]:
+        """Return path -> (mode, object id) for every file in the commit (one ls-tree call)."""
+        if self._tree is None:
+            self._tree = {path: (mode, oid) for mode, oid, path in ls_tree(self.repo, self.commit)}
+        return self._tree
+
+    def _directories(self) -> set[str]:
+        if self._dirs is None:
+            dirs: set[str] = set()
+            for path in self.tree:
+                parent = posixpath.dirname(path)
+                while parent and parent not in dirs:
+                    dirs.add(parent)
+                    parent = posixpath.dirname(parent)
+            self._dirs = dirs
+        return self._dirs
+
+    def _resolve(self, rel: str) -> tuple[str, str] | None:
+        """Return (mode, object id) of file rel, following symlinks that stay inside the tree."""
+        rel = posixpath.normpath(rel)
+        for _ in range(MAX_SYMLINK_HOPS):
+            entry = self.tree.get(rel)
+            if entry is None or entry[0] != "120000":
+                return entry
+            target = self.reader.read(entry[1])
+            if target is None:
+                return None
+            rel = posixpath.normpath(posixpath.join(posixpath.dirname(rel), target.decode()))
+        return None
+
+    def is_file(self, rel: str) -> bool:
+        return self._resolve(rel) is not None
+
+    def is_dir(self, rel: str) -> bool:
+        return posixpath.normpath(rel) in self._directories()
+
+    def list_dir(self, rel: str) -> list[str]:
+        prefix = posixpath.normpath(rel) + "/"
+        return sorted(
+            path[len(prefix) :]
+            for path in self.tree
+            if path.startswith(prefix) and "/" not in path[len(prefix) :]
+        )
+
+    def walk(self, rel: str) -> list[str]:
+        rel = posixpath.normpath(rel)
+        if rel in self.tree:
+            return [rel]
+        prefix = rel + "/"
+        return sorted(path for path in self.tree if path.startswith(prefix))
+
+    def read_bytes(self, rel: str) -> bytes:
+        entry = self._resolve(rel)
+        data = self.reader.read(entry[1]) if entry is not None else None
+        if data is None:
+            raise FileNotFoundError(f"{rel} not found in registry commit {self.commit[:12]}")
+        return data
+
+    def copy_file(self, rel: str, dest: Path) -> None:
+        entry = self._resolve(rel)
+        if entry is None:
+            raise FileNotFoundError(f"{rel} not found in registry commit {self.commit[:12]}")
+        with open(dest, "wb") as out:
+            if not self.reader.stream(entry[1], out):
+                raise FileNotFoundError(f"{rel} not found in registry commit {self.commit[:12]}")
+        if entry[0] == "100755":
+            dest.chmod(dest.stat().st_mode | 0o111)
+
+    def is_executable(self, rel: str) -> bool:
+        entry = self._resolve(rel)
+        return entry is not None and entry[0] == "100755"
+
+    def matches(self, rel: str, dest: Path) -> bool:
+        # Hash dest the way git hashes blobs and compare with the object id: no blob is read.
+        entry = self._resolve(rel)
+        if entry is None or not dest.is_file():
+            return False
+        try:
+            data = dest.read_bytes()
+        except OSError:
+            return False
+        digest = hashlib.sha256 if len(entry[1]) == 64 else hashlib.sha1
+        if digest(b"blob %d\0" % len(data) + data).hexdigest() != entry[1]:
+            return False
+        # An executable that lost its exec bit is out of date; copy_file restores the mode.
+        return entry[0] != "100755" or bool(dest.stat().st_mode & 0o111)
+
+
+_git_files: dict[tuple[Path, str], GitObjectFiles] = {}
+_readers: dict[Path, CatFileReader] = {}
+
+
+def registry_files(registry_root: Path) -> RegistryFiles:
+    """Return the file reader for registry_root (git objects for bare snapshots, else the disk)."""
+    registry_root = Path(registry_root)
+    snapshot = load_snapshot(registry_root)
+    if snapshot is None:
+        return DirectoryFiles(registry_root)
+    store = asset_store(snapshot_cache_root(registry_root))
+    if snapshot.mode != "bare":
+        return DirectoryFiles(registry_root, store)
+    key = (registry_root, snapshot.commit)
+    files = _git_files.get(key)
+    if files is None:
+        mirror = mirror_path(snapshot_cache_root(registry_root), snapshot.url)
+        # One cat-file process per mirror, shared by every snapshot of that URL.
+        reader = _readers.get(mirror)
+        if reader is None:
+            reader = _readers[mirror] = CatFileReader(mirror)
+        files = _git_files[key] = GitObjectFiles(
+            mirror, snapshot.commit, reader, registry_root, store
+        )
+    return files
+
+
+@atexit.register
+def close_registry_files() -> None:
+    """Stop the cat-file processes started for bare snapshots."""
+    for reader in _readers.values():
+        reader.close()
+    _readers.clear()
+    _git_files.clear()
@@ -0,0 +1,186 @@
+"""Precompiled registry index (index.json): build it for maintainers, load it for consumers."""
+
+import hashlib
+import json
+from pathlib import Path
+
+from forge.core.catalog import CatalogItem
+from forge.core.models import RegistryIndex, RegistryItem
+
+INDEX_FILENAME = "index.json"
+# Bump when the index format changes; consumers fall back to walking manifests for other versions.
+INDEX_SCHEMA_VERSION = 1
+
+
+def item_content_hash(registry_root: Path, item: RegistryItem) -> str:
+    """Return the SHA-256 of an item's files (relative paths and contents, in sorted order)."""
+    return _path_content_hash(registry_root, item.path)
+
+
+def _path_content_hash(registry_root: Path, item_path: str) -> str:
+    base = registry_root / item_path
+    files = sorted(p for p in base.rglob("*") if p.is_file()) if base.is_dir() else [base]
+    digest = hashlib.sha256()
+    for path in files:
+        digest.update(path.relative_to(registry_root).as_posix().encode())
+        digest.update(b"\0")
+        digest.update(hashlib.sha256(path.read_bytes()).digest())
+    return digest.hexdigest()
+
+
+def _git_blob_oid(data: bytes) -> str:
+    """Return the id git gives a blob with this content (SHA-1 object format)."""
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+
+def build_registry_index(registry_root: Path) -> RegistryIndex:
+    """Parse every manifest under registry_root into a RegistryIndex (items sorted by kind, id)."""
+    from forge.core.registry import _scan_registry_items
+
+    registry_root = Path(registry_root)
+    records = sorted(_scan_registry_items(registry_root), key=lambda i: (i.kind, i.id))
+    items = [r.to_registry_item() for r in records]
+    manifests = {
+        i.path: registry_root / i.path / "manifest.yaml" for i in items if i.kind != "prompt"
+    }
+    return RegistryIndex(
+        schema_version=INDEX_SCHEMA_VERSION,
+        items=items,
+        content_hashes={i.path: item_content_hash(registry_root, i) for i in items},
+        manifest_oids={
+            p: _git_blob_oid(m.read_bytes()) for p, m in manifests.items() if m.is_file()
+        },
+    )
+
+
+def render_registry_index(index: RegistryIndex) -> str:
+    """Serialize an index deterministically, so rebuilding an unchanged registry is a no-op diff."""
+    data = index.model_dump(mode="json", exclude_none=True)
+    return json.dumps(data, indent=2, sort_keys=True) + "\n"
+
+
+def write_registry_index(registry_root: Path) -> tuple[Path, RegistryIndex]:
+    """Build the index for registry_root and write it to <registry_root>/index.json.
+
+    Returns:
+        (path written, index).
+    """
+    registry_root = Path(registry_root)
+    index = build_registry_index(registry_root)
+    path = registry_root / INDEX_FILENAME
+    path.write_text(render_registry_index(index), encoding="utf-8")
+    return path, index
+
+
+def is_registry_index_current(registry_root: Path) -> bool:
+    """Return True if <registry_root>/index.json matches what build-index would write now."""
+    path = Path(registry_root) / INDEX_FILENAME
+    if not path.is_file():
+        return False
+    expected = render_registry_index(build_registry_index(registry_root))
+    return path.read_text(encoding="utf-8") == expected
+
+
+def load_registry_index(registry_root: Path) -> list[CatalogItem] | None:
+    """Return items from <registry_root>/index.json; None if absent, invalid, or another version."""
+    try:
+        raw = (Path(registry_root) / INDEX_FILENAME).read_bytes()
+    except OSError:
+        return None
+    return parse_registry_index(raw)
+
+
+def parse_registry_index(raw: bytes) -> list[CatalogItem] | None:
+    """Return the items from index.json content; None if invalid or another version.
+
+    Items are checked field by field while building compact records rather than through
+    the RegistryIndex model, so a large index loads without building pydantic models.
+    """
+    try:
+        return _index_items(json.loads(raw))
+    except Exception:
+        return None
+
+
+def load_verified_git_index(
+    raw: bytes, manifest_oids: dict[str, str], prompt_paths: list[str]
+) -> list[CatalogItem] | None:
+    """Return the items from a committed index.json only if it still describes the commit's tree.
+
+    The index must list exactly the tree's item directories and prompt files, and record
+    the blob id of every manifest in the tree (manifest_oids: item path -> oid), so a
+    manifest edited without rebuilding the index is caught without reading any manifest.
+
+    Returns:
+        The items, or None if the index is invalid or stale.
+    """
+    try:
+        data = json.loads(raw)
+        items = _index_items(data)
+        oids = data.get("manifest_oids")
+    except Exception:
+        return None
+    if items is None or oids != manifest_oids:
+        return None
+    if {i.path for i in items} != set(manifest_oids) | set(prompt_paths):
+        return None
+    return items
+
+
+def _index_items(data: dict) -> list[CatalogItem] | None:
+    if data.get("schema_version") != INDEX_SCHEMA_VERSION:
+        return None
+    return [CatalogItem.from_dict(item) for item in data["items"]]
+
+
+def _item_paths_on_disk(registry_root: Path) -> set[str]:
+    """Return the path of every item directory with a manifest.yaml, and of every prompt file."""
+    from forge.core.registry import KIND_FROM_DIR, REGISTRY_CATEGORIES
+
+    paths: set[str] = set()
+    for category in REGISTRY_CATEGORIES:
+        dir_path = registry_root / category
+        if not dir_path.is_dir():
+            continue
+        if KIND_FROM_DIR[category] == "prompt":
+            paths |= {
+                p.relative_to(registry_root).as_posix()
+                for p in dir_path.rglob("*.md")
+                if p.name != "README.md"
+            }
+        else:
+            paths |= {
+                f"{category}/{d.name}"
+                for d in dir_path.iterdir()
+                if (d / "manifest.yaml").is_file()
+            }
+    return paths
+
+
+def load_verified_registry_index(registry_root: Path) -> list[CatalogItem] | None:
+    """Return the items from <registry_root>/index.json only if it still describes the tree.
+
+    The index must list exactly the item directories (with a manifest.yaml) and prompt
+    files on disk, and every item's files must hash to its recorded content hash.
+    Hashing is much cheaper than parsing every manifest, but it reads every file, so
+    callers cache the result (cache snapshots keep a parsed catalog per commit).
+
+    Returns:
+        The items, or None if index.json is absent, invalid, or stale.
+    """
+    registry_root = Path(registry_root)
+    try:
+        data = json.loads((registry_root / INDEX_FILENAME).read_bytes())
+        items = _index_items(data)
+        hashes = data.get("content_hashes")
+    except Exception:
+        return None
+    if items is None or not isinstance(hashes, dict):
+        return None
+    paths = _item_paths_on_disk(registry_root)
+    if {i.path for i in items} != paths or set(hashes) != paths:
+        return None
+    for item_path, recorded in hashes.items():
+        if _path_content_hash(registry_root, item_path) != recorded:
+            return None
+    return items
@@ -5,15 +5,20 @@ from pathlib import Path
 
 from forge.core.install import dest_path
 from forge.core.models import InstalledItem, ProjectConfig
-from forge.core.project import save_config
+from forge.core.registry_files import write_file
+from forge.core.transaction import Transaction
 
 
-def _remove_hook_from_settings(project_root: Path, item_id: str) -> None:
+def _remove_hook_from_settings(
+    project_root: Path, item_id: str, txn: Transaction | None = None
+) -> None:
     """Remove hook entries for item_id from project .claude/settings.json."""
     from forge.core.setup import load_claude_settings, save_claude_settings
 
     settings_path = project_root / ".claude" / "settings.json"
-    settings = load_claude_settings(settings_path)
+    settings = load_claude_settings(
+        txn.current(settings_path) if txn is not None else settings_path
+    )
     hooks = settings.get("hooks", {})
     script_suffix = f"/.claude/hooks/{item_id}.sh"
     changed = False
@@ -28,37 +33,51 @@ def _remove_hook_from_settings(project_root: Path, item_id: str) -> None:
         if not hooks[event]:
             del hooks[event]
     if changed:
-        save_claude_settings(settings, settings_path)
+        write_file(settings_path, lambda tmp: save_claude_settings(settings, tmp), txn)
 
 
-def remove_member_files(project_root: Path, kind: str, item_id: str, tool: str) -> None:
-    """Delete installed files for an asset only (does not change config)."""
+def _delete(path: Path, txn: Transaction | None) -> None:
+    """Remove a file, link (even a dangling symlink), or directory tree, now or when txn commits."""
+    if not path.is_symlink() and not path.exists():
+        return
+    if txn is not None:
+        txn.delete(path)
+    elif path.is_symlink() or path.is_file():
+        path.unlink()
+    else:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def remove_member_files(
+    project_root: Path, kind: str, item_id: str, tool: str, txn: Transaction | None = None
+) -> None:
+    """Delete installed files for an asset only (does not change config).
+
+    Linked installs (see ProjectConfig.link_mode): symlinks and hard links are
+    removed themselves, never what they point to in the registry cache. With txn,
+    deletions happen when the transaction commits.
+    """
     root = Path(project_root)
+    dst = dest_path(root, kind, item_id, tool)
 
     if kind == "hook":
-        dst = dest_path(root, kind, item_id, tool)
-        if dst.exists():
-            dst.unlink()
-        _remove_hook_from_settings(root, item_id)
+        _delete(dst, txn)
+        _remove_hook_from_settings(root, item_id, txn)
         return
 
-    dst = dest_path(root, kind, item_id, tool)
-
-    if dst.exists():
-        if dst.is_file():
-            dst.unlink()
-        else:
-            shutil.rmtree(dst, ignore_errors=True)
     if kind in ("rule", "skill"):
-        parent = dst.parent
-        if parent.exists() and parent.is_dir():
-            shutil.rmtree(parent, ignore_errors=True)
-    if kind == "prompt" and dst.parent.exists() and dst.parent.is_dir():
-        try:
-            if not any(dst.parent.iterdir()):
-                dst.parent.rmdir()
-        except OSError:
-            pass
+        _delete(dst.parent, txn)
+        return
+    _delete(dst, txn)
+    if kind == "prompt" and dst.parent.is_dir():
+        if txn is not None:
+            txn.prune(dst.parent)
+        else:
+            try:
+                if not any(dst.parent.iterdir()):
+                    dst.parent.rmdir()
+            except OSError:
+                pass
 
 
 def remove_item(
@@ -66,6 +85,7 @@ def remove_item(
     config: ProjectConfig,
     kind: str,
     item_id: str,
+    dry_run: bool = False,
 ) -> bool:
     """Remove an installed item by kind and id. Delete its files and update config.
 
@@ -74,45 +94,45 @@ def remove_item(
         config: Current project config (will be updated and saved).
         kind: One of agent, rule, skill, workflow, prompt.
         item_id: Id of the installed item.
+        dry_run: Only plan the changes (see Transaction); project and config file stay unchanged.
 
     Returns:
         True if the item was found and removed; False if not in installed list.
     """
     root = Path(project_root)
-
-    found = None
-    for i, inst in enumerate(config.installed):
-        if inst.kind == kind and inst.id == item_id:
-            found = i
-            break
-    if found is None:
-        return False
-
-    remove_member_files(root, kind, item_id, config.tool)
-
-    config.installed.pop(found)
-    save_config(project_root, config)
+    with Transaction(root, dry_run, config) as txn:
+        found = None
+        for i, inst in enumerate(config.installed):
+            if inst.kind == kind and inst.id == item_id:
+                found = i
+                break
+        if found is None:
+            return False
+        remove_member_files(root, kind, item_id, config.tool, txn)
+        config.installed.pop(found)
+        txn.commit(config)
     return True
 
 
-def remove_bundle(project_root: Path, config: ProjectConfig, bundle_id: str) -> bool:
+def remove_bundle(
+    project_root: Path, config: ProjectConfig, bundle_id: str, dry_run: bool = False
+) -> bool:
     """Remove an installed bundle: delete member files when refcount drops to zero; remove bundle row."""
     from forge.core.bundle_sync import member_refcount
 
     root = Path(project_root)
-    idx: int | None = None
-    for i, b in enumerate(config.installed_bundles):
-        if b.id == bundle_id:
-            idx = i
-            break
-    if idx is None:
-        return False
-
-    bundle = config.installed_bundles[idx]
-    for ref in bundle.members:
-        if member_refcount(config, ref.kind, ref.id, exclude_bundle_id=bundle_id) == 0:
-            remove_member_files(root, ref.kind, ref.id, config.tool)
-
-    config.installed_bundles.pop(idx)
-    save_config(project_root, config)
+    with Transaction(root, dry_run, config) as txn:
+        idx: int | None = None
+        for i, b in enumerate(config.installed_bundles):
+            if b.id == bundle_id:
+                idx = i
+                break
+        if idx is None:
+            return False
+        bundle = config.installed_bundles[idx]
+        for ref in bundle.members:
+            if member_refcount(config, ref.kind, ref.id, exclude_bundle_id=bundle_id) == 0:
+                remove_member_files(root, ref.kind, ref.id, config.tool, txn)
+        config.installed_bundles.pop(idx)
+        txn.commit(config)
     return True
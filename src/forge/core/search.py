@@ -0,0 +1,222 @@
+"""Full-text registry search: a BM25 inverted index over item ids, descriptions, and bodies.
+
+The index is built once per registry commit and stored next to the snapshot
+(``<commit>.search``), so later searches only load postings and score them.
+Fields are weighted (id > description > body) and body content is only scored
+when asked for. Roots that are not cache snapshots are indexed in memory per call.
+With the SQLite catalog store enabled, id/description searches use its FTS5 table.
+"""
+
+import json
+import math
+import re
+from collections import Counter
+from collections.abc import Iterable
+from pathlib import Path
+
+from forge.core.catalog import CatalogItem
+from forge.core.models import RegistrySearchHit
+from forge.core.registry import get_catalog, get_catalog_store, get_registry_item
+from forge.core.registry_cache import load_snapshot, search_index_path, write_json_atomic
+from forge.core.registry_files import RegistryFiles, registry_files
+
+# Bump when tokenization or the file layout changes.
+SEARCH_INDEX_SCHEMA_VERSION = 1
+FIELD_WEIGHTS: tuple[float, float, float] = (3.0, 2.0, 1.0)  # id, description, body
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into lowercase alphanumeric tokens (ids split on -, _, / and .)."""
+    return _TOKEN_RE.findall(text.lower())
+
+
+def _item_body(files: RegistryFiles, item: CatalogItem) -> str:
+    """Return the markdown content of an item (empty if not checked out, e.g. partial mode)."""
+    parts: list[str] = []
+    for rel in files.walk(item.path):
+        if not rel.endswith(".md"):
+            continue
+        try:
+            parts.append(files.read_bytes(rel).decode("utf-8", errors="replace"))
+        except OSError:
+            continue
+    return "\n".join(parts)
+
+
+class SearchIndex:
+    """Inverted index: term -> flat postings, per-doc (kind, id, project types), field lengths.
+
+    Postings are stored flat, four ints per doc (doc, tf in id, tf in description,
+    tf in body), which keeps the persisted JSON small and quick to load.
+    """
+
+    def __init__(
+        self,
+        docs: list[tuple[str, str, tuple[str, ...]]],
+        lengths: list[int],
+        postings: dict[str, list[int]],
+    ) -> None:
+        self.docs = docs
+        self.lengths = lengths  # flat: id, description, body token counts per doc
+        self.postings = postings
+        self._doc_len: dict[tuple[float, ...], tuple[list[float], float]] = {}
+
+    @classmethod
+    def build(cls, registry_root: Path, items: Iterable[CatalogItem]) -> "SearchIndex":
+        """Tokenize every item's id, description, and body into a new index."""
+        docs: list[tuple[str, str, tuple[str, ...]]] = []
+        lengths: list[int] = []
+        postings: dict[str, list[int]] = {}
+        files = registry_files(registry_root)
+        for doc, item in enumerate(items):
+            fields = (
+                tokenize(item.id),
+                tokenize(item.description or ""),
+                tokenize(_item_body(files, item)),
+            )
+            docs.append((item.kind, item.id, item.project_types))
+            lengths.extend(len(tokens) for tokens in fields)
+            counts = [Counter(tokens) for tokens in fields]
+            for term in set().union(*counts):
+                postings.setdefault(term, []).extend(
+                    (doc, counts[0][term], counts[1][term], counts[2][term])
+                )
+        return cls(docs, lengths, postings)
+
+    def to_json(self, commit: str) -> dict:
+        return {
+            "schema_version": SEARCH_INDEX_SCHEMA_VERSION,
+            "commit": commit,
+            "docs": [[kind, item_id, list(types)] for kind, item_id, types in self.docs],
+            "lengths": self.lengths,
+            "postings": self.postings,
+        }
+
+    @classmethod
+    def from_json(cls, data: dict, commit: str) -> "SearchIndex | None":
+        if (
+            data.get("schema_version") != SEARCH_INDEX_SCHEMA_VERSION
+            or data.get("commit") != commit
+        ):
+            return None
+        docs = [(kind, item_id, tuple(types)) for kind, item_id, types in data["docs"]]
+        return cls(docs, data["lengths"], data["postings"])
+
+    def _weighted_lengths(self, weights: tuple[float, ...]) -> tuple[list[float], float]:
+        """Return (weighted length per doc, average), computed once per weighting."""
+        cached = self._doc_len.get(weights)
+        if cached is None:
+            lens = self.lengths
+            w0, w1, w2 = weights
+            doc_len = [
+                w0 * lens[i] + w1 * lens[i + 1] + w2 * lens[i + 2] for i in range(0, len(lens), 3)
+            ]
+            cached = self._doc_len[weights] = (
+                doc_len,
+                (sum(doc_len) / len(doc_len)) if doc_len else 1.0,
+            )
+        return cached
+
+    def score(self, query: str, include_body: bool = False) -> list[tuple[int, float]]:
+        """Return (doc, BM25 score) for docs matching any query term, best first."""
+        weights = FIELD_WEIGHTS if include_body else (FIELD_WEIGHTS[0], FIELD_WEIGHTS[1], 0.0)
+        n_docs = len(self.docs)
+        if n_docs == 0:
+            return []
+        doc_len, avg_len = self._weighted_lengths(weights)
+        avg_len = avg_len or 1.0
+        w0, w1, w2 = weights
+        scores: dict[int, float] = {}
+        for term in dict.fromkeys(tokenize(query)):
+            flat = self.postings.get(term, [])
+            weighted = [
+                (flat[i], w0 * flat[i + 1] + w1 * flat[i + 2] + w2 * flat[i + 3])
+                for i in range(0, len(flat), 4)
+            ]
+            weighted = [(doc, tf) for doc, tf in weighted if tf > 0]
+            if not weighted:
+                continue
+            idf = math.log(1 + (n_docs - len(weighted) + 0.5) / (len(weighted) + 0.5))
+            for doc, tf in weighted:
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * doc_len[doc] / avg_len)
+                scores[doc] = scores.get(doc, 0.0) + idf * tf * (BM25_K1 + 1) / (tf + norm)
+        return sorted(scores.items(), key=lambda s: (-s[1], s[0]))
+
+
+_indexes: dict[tuple[Path, str], SearchIndex] = {}
+
+
+def load_search_index(registry_root: Path) -> SearchIndex:
+    """Return the search index for registry_root, building and persisting it once per commit."""
+    registry_root = Path(registry_root)
+    snapshot = load_snapshot(registry_root)
+    if snapshot is None:
+        return SearchIndex.build(registry_root, get_catalog(registry_root).records())
+    key = (registry_root, snapshot.commit)
+    index = _indexes.get(key)
+    if index is not None:
+        return index
+    try:
+        index = SearchIndex.from_json(
+            json.loads(search_index_path(registry_root).read_bytes()), snapshot.commit
+        )
+    except Exception:
+        index = None
+    if index is None:
+        index = SearchIndex.build(registry_root, get_catalog(registry_root).records())
+        write_json_atomic(search_index_path(registry_root), index.to_json(snapshot.commit))
+    _indexes[key] = index
+    return index
+
+
+def search_registry(
+    registry_root: Path,
+    query: str,
+    include_body: bool = False,
+    kind: str | None = None,
+    project_types: list[str] | None = None,
+    limit: int | None = 20,
+) -> list[RegistrySearchHit]:
+    """Rank registry items against a free-text query.
+
+    Args:
+        registry_root: Path to the registry snapshot root.
+        query: Free-text query; matched case-insensitively per token.
+        include_body: Also score item content (RULE.md, SKILL.md, agent .md, ...).
+        kind: Only return items of this kind.
+        project_types: Only return items targeting any of these (None for all).
+        limit: Maximum number of hits (None for all).
+
+    Returns:
+        Hits ordered by descending score.
+    """
+    store = get_catalog_store(registry_root) if not include_body else None
+    if store is not None and store.has_fts:
+        ranked = store.search_descriptions(
+            query, kind=kind, project_types=project_types, limit=limit
+        )
+        return [
+            RegistrySearchHit(item=record.to_registry_item(), score=round(score, 4))
+            for record, score in ranked
+        ]
+    index = load_search_index(registry_root)
+    wanted = set(project_types) if project_types is not None else None
+    hits: list[RegistrySearchHit] = []
+    for doc, score in index.score(query, include_body=include_body):
+        doc_kind, item_id, doc_types = index.docs[doc]
+        if kind is not None and doc_kind != kind:
+            continue
+        if wanted is not None and wanted.isdisjoint(doc_types):
+            continue
+        # Only the hits shown are turned into models, each from its own manifest.
+        item = get_registry_item(registry_root, doc_kind, item_id)
+        if item is None:
+            continue
+        hits.append(RegistrySearchHit(item=item, score=round(score, 4)))
+        if limit is not None and len(hits) >= limit:
+            break
+    return hits
@@ -0,0 +1,362 @@
+"""Stage a run's changes to a project and commit them together with its config.
+
+A Transaction collects every change that one install or update run makes under a
+project. New file contents are written to ``.forge/txn/files/`` first, and
+deletions are only recorded. commit() then:
+
+1. writes the new ``.forge/config.yaml`` as one more staged file;
+2. writes a journal listing every change (``.forge/txn/journal.json``, tmp + rename);
+3. renames each staged file over its destination and moves deleted paths into
+   ``.forge/txn/trash/``;
+4. removes the journal and the staging area.
+
+The next transaction on the project recovers from an interrupted run. If the run
+died while staging, no journal exists and the project was never touched, so the
+staging area is discarded (rolled back). If it died while committing, the
+journal is replayed (resumed). Every step is idempotent: a staged file that is
+gone was already moved, and a trash slot that exists was already filled.
+
+A dry-run transaction goes through the same install, update, and remove code
+but never touches the project. Registry files are compared by hash and only
+recorded, not staged. Small generated files such as settings.json are staged in
+a temporary directory. commit() then returns a ChangePlan instead of applying
+anything (see get_change_plans).
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import threading
+from contextlib import ExitStack
+from pathlib import Path
+from typing import Literal
+
+from forge.core.models import ChangePlan, PlannedItemChange, ProjectConfig
+from forge.core.project import config_path, load_config, write_config_file
+from forge.core.registry_cache import file_lock
+
+TXN_DIRNAME = "txn"
+JOURNAL_VERSION = 1
+
+RecoveryOutcome = Literal["resumed", "rolled back"]
+
+_change_plans: list[ChangePlan] = []
+
+
+def _txn_dir(project_root: Path) -> Path:
+    return Path(project_root) / ".forge" / TXN_DIRNAME
+
+
+def _lock_path(project_root: Path) -> Path:
+    return Path(project_root) / ".forge" / "txn.lock"
+
+
+def _exists(path: Path) -> bool:
+    return path.is_symlink() or path.exists()
+
+
+def _remove(path: Path) -> None:
+    if path.is_dir() and not path.is_symlink():
+        shutil.rmtree(path, ignore_errors=True)
+    elif _exists(path):
+        path.unlink()
+
+
+def _move_into_place(staged: Path, dest: Path) -> None:
+    """Rename staged over dest; across filesystems, copy next to dest first and rename that."""
+    try:
+        os.replace(staged, dest)
+    except OSError:
+        if not _exists(staged) or (dest.is_dir() and not dest.is_symlink()):
+            raise
+        tmp = dest.with_name(f".{dest.name}.forge-tmp")
+        shutil.copy2(staged, tmp, follow_symlinks=False)
+        os.replace(tmp, dest)
+        staged.unlink()
+
+
+def _apply_journal(project_root: Path, txn_dir: Path, ops: list[list[str]]) -> None:
+    """Carry out journal ops in order; safe to repeat after a crash part-way through."""
+    made: set[Path] = set()
+    for op, name, rel in ops:
+        dest = project_root / rel
+        if op == "write":
+            staged = txn_dir / "files" / name
+            if not _exists(staged):
+                continue  # moved by an earlier, interrupted commit
+            if dest.parent not in made:
+                dest.parent.mkdir(parents=True, exist_ok=True)
+                made.add(dest.parent)
+            _move_into_place(staged, dest)
+        elif op == "delete":
+            slot = txn_dir / "trash" / name
+            if _exists(slot) or not _exists(dest):
+                continue
+            slot.parent.mkdir(parents=True, exist_ok=True)
+            try:
+                os.replace(dest, slot)
+            except OSError:
+                _remove(dest)
+        elif op == "prune":
+            try:
+                dest.rmdir()
+            except OSError:
+                pass  # missing or not empty
+
+
+def _write_journal(path: Path, ops: list[list[str]]) -> None:
+    tmp = path.with_name(f"{path.name}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"version": JOURNAL_VERSION, "ops": ops}, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def get_change_plans() -> list[ChangePlan]:
+    """Return the plans computed by dry-run transactions in this process, oldest first."""
+    return list(_change_plans)
+
+
+def clear_change_plans() -> None:
+    """Forget recorded change plans (e.g. between CLI invocations in tests)."""
+    _change_plans.clear()
+
+
+def _item_versions(config: ProjectConfig | None) -> dict[tuple[str, str], str]:
+    if config is None:
+        return {}
+    versions = {(i.kind, i.id): i.version for i in config.installed}
+    versions |= {("bundle", b.id): b.version for b in config.installed_bundles}
+    return versions
+
+
+def _hook_entries(settings_path: Path) -> set[str]:
+    """Return 'Event: command' for every hook command in a settings.json file."""
+    from forge.core.setup import load_claude_settings
+
+    hooks = load_claude_settings(settings_path).get("hooks", {})
+    return {
+        f"{event}: {h.get('command', '')}"
+        for event, entries in hooks.items()
+        for entry in entries
+        for h in entry.get("hooks", [])
+    }
+
+
+def recover_transaction(project_root: Path) -> RecoveryOutcome | None:
+    """Finish or discard a transaction that a previous run left behind.
+
+    Callers must hold the project's transaction lock (Transaction does).
+
+    Returns:
+        "resumed" if an interrupted commit was completed, "rolled back" if
+        uncommitted staged changes were discarded, None if there was nothing to do.
+    """
+    root = Path(project_root)
+    txn_dir = _txn_dir(root)
+    if not txn_dir.exists():
+        return None
+    outcome: RecoveryOutcome = "rolled back"
+    try:
+        journal = json.loads((txn_dir / "journal.json").read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        journal = None
+    if isinstance(journal, dict) and journal.get("version") == JOURNAL_VERSION:
+        _apply_journal(root, txn_dir, journal.get("ops", []))
+        outcome = "resumed"
+    shutil.rmtree(txn_dir, ignore_errors=True)
+    return outcome
+
+
+class Transaction:
+    """All file and config changes of one run under a project, applied together by commit().
+
+    Use as a context manager: entering takes the project's transaction lock and
+    recovers an interrupted earlier run. Leaving without commit() discards every
+    staged change. Staging methods are thread-safe. With dry_run, nothing in the
+    project is locked, recovered, or changed, and commit() returns the plan.
+
+    Callers load the config before the lock is taken, so it can be stale. A
+    recovered run or a concurrent one may have committed in between. Pass it as
+    config: once the lock is held and recovery is done, its installed and
+    installed_bundles rows are reloaded from .forge/config.yaml. Settings the
+    caller may have changed (registry, tool, link_mode, project_types) are kept.
+    Decisions based on installed rows belong inside the with block.
+
+    Attributes:
+        recovered: What recovery did when the transaction started (see recover_transaction).
+        dry_run: Whether commit() only plans.
+    """
+
+    def __init__(
+        self, project_root: Path, dry_run: bool = False, config: ProjectConfig | None = None
+    ) -> None:
+        self.project_root = Path(project_root)
+        self.dry_run = dry_run
+        self.config = config
+        self.dir = (
+            Path(tempfile.mkdtemp(prefix="forge-plan-")) if dry_run else _txn_dir(self.project_root)
+        )
+        self.recovered: RecoveryOutcome | None = None
+        self._ops: list[list[str]] = []
+        self._latest: dict[Path, Path] = {}
+        self._kept: list[Path] = []
+        self._count = 0
+        self._mutex = threading.Lock()
+        self._stack = ExitStack()
+        self._done = False
+
+    def __enter__(self) -> "Transaction":
+        if self.dry_run:
+            (self.dir / "files").mkdir(parents=True, exist_ok=True)
+            self._reload_installed()
+            return self
+        self._stack.enter_context(file_lock(_lock_path(self.project_root)))
+        try:
+            self.recovered = recover_transaction(self.project_root)
+            (self.dir / "files").mkdir(parents=True, exist_ok=True)
+            self._reload_installed()
+        except BaseException:
+            self._stack.close()
+            raise
+        return self
+
+    def _reload_installed(self) -> None:
+        """Reload self.config's installed rows from the config file (see the class docstring)."""
+        if self.config is None:
+            return
+        current = load_config(self.project_root)
+        if current is not None:
+            self.config.installed = current.installed
+            self.config.installed_bundles = current.installed_bundles
+
+    def __exit__(self, *exc_info: object) -> None:
+        try:
+            if not self._done:
+                self.rollback()
+        finally:
+            self._stack.close()
+
+    def _rel(self, path: Path) -> str:
+        try:
+            return Path(path).relative_to(self.project_root).as_posix()
+        except ValueError:
+            return str(path)
+
+    def _next_name(self) -> str:
+        with self._mutex:
+            self._count += 1
+            return str(self._count)
+
+    def staging_path(self) -> Path:
+        """Return a fresh path in the staging area to build a file's new content at."""
+        return self.dir / "files" / self._next_name()
+
+    def add_write(self, staged: Path | None, dest: Path) -> None:
+        """Record that staged (from staging_path) replaces dest on commit.
+
+        In a dry run staged may be None: dest changes, but its content was not produced.
+        """
+        with self._mutex:
+            self._ops.append(["write", staged.name if staged is not None else "", self._rel(dest)])
+            if staged is not None:
+                self._latest[Path(dest)] = staged
+
+    def keep(self, dest: Path) -> None:
+        """Record that dest was found up to date (listed as unchanged in a dry-run plan)."""
+        with self._mutex:
+            self._kept.append(Path(dest))
+
+    def current(self, dest: Path) -> Path:
+        """Return the path holding dest's content as of this transaction (staged or on disk)."""
+        with self._mutex:
+            return self._latest.get(Path(dest), Path(dest))
+
+    def delete(self, path: Path) -> None:
+        """Remove path (file, link, or directory tree) on commit."""
+        name = self._next_name()
+        with self._mutex:
+            self._ops.append(["delete", name, self._rel(path)])
+            self._latest.pop(Path(path), None)
+
+    def prune(self, directory: Path) -> None:
+        """Remove directory on commit if it is empty by then."""
+        with self._mutex:
+            self._ops.append(["prune", "", self._rel(directory)])
+
+    def commit(self, config: ProjectConfig | None = None) -> ChangePlan | None:
+        """Apply every staged change and, if given, write config as .forge/config.yaml.
+
+        Returns:
+            In a dry run, the plan (also recorded for get_change_plans); otherwise None.
+        """
+        if self.dry_run:
+            plan = self.plan(config)
+            _change_plans.append(plan)
+            self.rollback()
+            return plan
+        if config is not None:
+            staged = self.staging_path()
+            write_config_file(staged, config)
+            self.add_write(staged, config_path(self.project_root))
+        if self._ops:
+            _write_journal(self.dir / "journal.json", self._ops)
+            # From here on the run is durable: if applying fails, the next transaction resumes it.
+            self._done = True
+            _apply_journal(self.project_root, self.dir, self._ops)
+        shutil.rmtree(self.dir, ignore_errors=True)
+        self._done = True
+        return None
+
+    def plan(self, config: ProjectConfig | None = None) -> ChangePlan:
+        """Describe what committing the changes recorded so far (and config) would do."""
+        plan = ChangePlan()
+        old = _item_versions(load_config(self.project_root))
+        if config is not None:
+            new = _item_versions(config)
+            for (kind, item_id), version in new.items():
+                if old.get((kind, item_id)) != version:
+                    plan.items.append(
+                        PlannedItemChange(
+                            kind=kind,
+                            id=item_id,
+                            old_version=old.get((kind, item_id)),
+                            new_version=version,
+                        )
+                    )
+            for (kind, item_id), version in old.items():
+                if (kind, item_id) not in new:
+                    plan.items.append(PlannedItemChange(kind=kind, id=item_id, old_version=version))
+
+        settings_rel = ".claude/settings.json"
+        final: dict[str, str] = {}  # rel -> last op on it
+        for op, _, rel in self._ops:
+            if op != "prune" and rel not in (
+                settings_rel,
+                self._rel(config_path(self.project_root)),
+            ):
+                final.pop(rel, None)
+                final[rel] = op
+        for rel, op in final.items():
+            if op == "delete":
+                plan.delete.append(rel)
+            elif _exists(self.project_root / rel):
+                plan.overwrite.append(rel)
+            else:
+                plan.create.append(rel)
+        plan.unchanged = sorted({r for r in map(self._rel, self._kept) if r not in final})
+
+        settings_path = self.project_root / settings_rel
+        staged_settings = self.current(settings_path)
+        if staged_settings != settings_path:
+            before, after = _hook_entries(settings_path), _hook_entries(staged_settings)
+            plan.hooks_added = sorted(after - before)
+            plan.hooks_removed = sorted(before - after)
+        return plan
+
+    def rollback(self) -> None:
+        """Discard every staged change; the project is left as it was."""
+        shutil.rmtree(self.dir, ignore_errors=True)
+        self._done = True
@@ -0,0 +1,185 @@
+"""Registry transports that do not need a git remote: local directories and archives.
+
+``registry.url`` is interpreted as follows:
+
+- ``file://`` URL of a plain directory (not a git repository): read in place, no cache.
+- ``.tar.gz``/``.tgz``/``.tar``/``.zip`` file (plain path or ``file://``): extracted
+  once into a cache snapshot keyed by the archive's SHA-256.
+- ``.bundle`` file: a git bundle, fetched by git like any remote (plain path).
+- anything else (including ``file://`` bare repositories and git checkouts): a
+  git remote, so ``registry.ref`` is honoured.
+"""
+
+import hashlib
+import shutil
+import tarfile
+import tempfile
+import time
+import zipfile
+from pathlib import Path, PurePosixPath
+from typing import Literal
+from urllib.parse import urlparse
+from urllib.request import url2pathname
+
+from forge.core.models import FetchStatus, RegistryCacheEntry, RegistrySnapshot
+from forge.core.registry_cache import (
+    cache_lock,
+    load_cache_entry,
+    load_snapshot,
+    record_fetch,
+    registry_cache_key,
+    save_cache_entry,
+    save_snapshot,
+    snapshot_path,
+    touch_snapshot,
+)
+
+TransportKind = Literal["git", "directory", "archive"]
+
+ARCHIVE_SUFFIXES: tuple[str, ...] = (".tar.gz", ".tgz", ".tar", ".zip")
+
+
+def _is_git_repo(path: Path) -> bool:
+    """Return True for a bare repository or a checkout (.git is a directory or a gitdir file)."""
+    return ((path / "HEAD").is_file() and (path / "objects").is_dir()) or (path / ".git").exists()
+
+
+def parse_registry_url(url: str) -> tuple[TransportKind, str]:
+    """Return (transport kind, location) for a registry URL.
+
+    The location is a filesystem path for directory and archive transports, and the
+    URL (or bundle path) to hand to git for the git transport.
+    """
+    local: Path | None = None
+    if url.startswith("file://"):
+        local = Path(url2pathname(urlparse(url).path))
+    elif "://" not in url and not url.startswith("git@"):
+        local = Path(url).expanduser()
+
+    if local is None:
+        return "git", url
+    name = local.name.lower()
+    if name.endswith(ARCHIVE_SUFFIXES):
+        return "archive", str(local)
+    if name.endswith(".bundle"):
+        return "git", str(local)
+    if url.startswith("file://") and not _is_git_repo(local):
+        return "directory", str(local)
+    return "git", url
+
+
+def file_sha256(path: Path) -> str:
+    """Return the hex SHA-256 of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _safe_member(name: str) -> bool:
+    """Return True if an archive member name stays inside the extraction directory."""
+    p = PurePosixPath(name)
+    return not p.is_absolute() and ".." not in p.parts
+
+
+def _extract_archive(archive: Path, dest: Path) -> None:
+    """Extract archive into dest, refusing members that escape it or are links."""
+    if archive.name.lower().endswith(".zip"):
+        with zipfile.ZipFile(archive) as zf:
+            for name in zf.namelist():
+                if not _safe_member(name):
+                    raise RuntimeError(f"Unsafe path in registry archive: {name}")
+            zf.extractall(dest)
+        return
+    with tarfile.open(archive) as tf:
+        members = []
+        for m in tf.getmembers():
+            if not _safe_member(m.name) or m.issym() or m.islnk() or m.isdev():
+                raise RuntimeError(f"Unsafe member in registry archive: {m.name}")
+            members.append(m)
+        tf.extractall(dest, members=members)
+
+
+def _registry_root_in(extracted: Path) -> Path:
+    """Return the registry root inside an extracted archive (descends a single top-level dir)."""
+    from forge.core.registry import REGISTRY_CATEGORIES
+
+    if any((extracted / c).is_dir() for c in REGISTRY_CATEGORIES):
+        return extracted
+    children = [c for c in extracted.iterdir() if not c.name.startswith(".")]
+    if len(children) == 1 and children[0].is_dir():
+        return children[0]
+    return extracted
+
+
+def fetch_directory_registry(url: str, ref: str, location: str) -> Path:
+    """Return a local registry directory in place.
+
+    Raises:
+        RuntimeError: If the directory does not exist.
+    """
+    path = Path(location)
+    if not path.is_dir():
+        raise RuntimeError(f"Registry directory not found: {path}")
+    record_fetch(url, ref, "local", None, path)
+    return path
+
+
+def fetch_archive_registry(url: str, ref: str, location: str, root: Path) -> Path:
+    """Extract a registry archive into the cache (once per content hash) and return its root.
+
+    The url+ref entry remembers the archive's size and mtime so an unchanged archive
+    is not re-hashed on every run.
+
+    Raises:
+        RuntimeError: If the archive is missing or unsafe to extract.
+    """
+    archive = Path(location)
+    if not archive.is_file():
+        raise RuntimeError(f"Registry archive not found: {archive}")
+    stat = archive.stat()
+    entry_path = root / registry_cache_key(url, ref)
+    entry = load_cache_entry(entry_path)
+    if (
+        entry is not None
+        and entry.source_size == stat.st_size
+        and entry.source_mtime_ns == stat.st_mtime_ns
+        and load_snapshot(snapshot_path(root, url, entry.commit)) is not None
+    ):
+        digest = entry.commit
+    else:
+        digest = file_sha256(archive)
+
+    snapshot = snapshot_path(root, url, digest)
+    status: FetchStatus = "hit"
+    if load_snapshot(snapshot) is None:
+        with cache_lock(root, url):
+            if load_snapshot(snapshot) is None:
+                snapshot.parent.mkdir(parents=True, exist_ok=True)
+                if snapshot.exists():
+                    shutil.rmtree(snapshot)
+                tmp = Path(tempfile.mkdtemp(prefix=".extract-", dir=snapshot.parent))
+                try:
+                    _extract_archive(archive, tmp)
+                    _registry_root_in(tmp).rename(snapshot)
+                finally:
+                    shutil.rmtree(tmp, ignore_errors=True)
+                save_snapshot(
+                    snapshot, RegistrySnapshot(url=url, commit=digest, created_at=time.time())
+                )
+                status = "extracted"
+    save_cache_entry(
+        entry_path,
+        RegistryCacheEntry(
+            url=url,
+            ref=ref,
+            commit=digest,
+            checked_at=time.time(),
+            source_size=stat.st_size,
+            source_mtime_ns=stat.st_mtime_ns,
+        ),
+    )
+    touch_snapshot(snapshot)
+    record_fetch(url, ref, status, digest, snapshot)
+    return snapshot
@@ -3,23 +3,56 @@
 from pathlib import Path
 
 from forge.core.bundle_sync import sync_bundle_with_registry
-from forge.core.install import install_item
-from forge.core.models import ProjectConfig, RegistryItem
-from forge.core.project import load_config, save_config
-from forge.core.registry import fetch_registry, get_registry_items
-from forge.core.remove import remove_item
+from forge.core.install import copy_registry_item_to_project, copy_registry_items_to_project
+from forge.core.models import InstalledItem, LinkMode, ProjectConfig, RegistryItem
+from forge.core.project import load_config
+from forge.core.registry import (
+    fetch_registry,
+    get_catalog,
+    get_registry_item,
+    resolve_bundle_members,
+)
+from forge.core.transaction import Transaction
 from forge.core.validation import is_compatible_with_project_types
 
 
-def _items_by_kind_id(items: list[RegistryItem]) -> dict[tuple[str, str], RegistryItem]:
-    """Build (kind, id) -> RegistryItem map including bundles and leaf items."""
-    return {(i.kind, i.id): i for i in items}
+def _refresh_installed_row(config: ProjectConfig, item: RegistryItem) -> None:
+    """Point item's config.installed row at its new version and the config's registry ref."""
+    for n, inst in enumerate(config.installed):
+        if inst.kind == item.kind and inst.id == item.id:
+            config.installed[n] = InstalledItem(
+                kind=item.kind,
+                id=item.id,
+                version=item.version,
+                source_registry_ref=config.registry.ref,
+            )
+
+
+def _reinstall_item(
+    registry_root: Path,
+    item: RegistryItem,
+    project_root: Path,
+    config: ProjectConfig,
+    link_mode: LinkMode | None = None,
+    txn: Transaction | None = None,
+) -> None:
+    """Re-copy an installed item over its files and refresh its config row. Does not save config.
+
+    Files are synced in place rather than removed and re-added, so unchanged files
+    keep their mtimes.
+    """
+    copy_registry_item_to_project(
+        registry_root, item, project_root, config.tool, link_mode or config.link_mode, txn
+    )
+    _refresh_installed_row(config, item)
 
 
 def update_bundle(
     project_root: Path,
     config: ProjectConfig,
     bundle_id: str,
+    link_mode: LinkMode | None = None,
+    dry_run: bool = False,
 ) -> bool:
     """Re-sync one installed bundle from the registry (membership and file content)."""
     root = Path(project_root)
@@ -27,26 +60,26 @@ def update_bundle(
         return False
 
     registry_root = fetch_registry(config.registry.url, config.registry.ref)
-    all_items = get_registry_items(registry_root)
-    items_by_kind_id = _items_by_kind_id(all_items)
-    key = ("bundle", bundle_id)
-    if key not in items_by_kind_id:
-        return False
-    bundle_item = items_by_kind_id[key]
-    if bundle_item.kind != "bundle" or not bundle_item.items:
+    bundle_item = get_registry_item(registry_root, "bundle", bundle_id)
+    if bundle_item is None or not bundle_item.items:
         return False
     if not is_compatible_with_project_types(bundle_item, config.project_types):
         return False
 
-    sync_bundle_with_registry(
-        registry_root,
-        root,
-        config,
-        bundle_item,
-        items_by_kind_id,
-        config.registry.ref,
-    )
-    save_config(root, config)
+    with Transaction(root, dry_run, config) as txn:
+        if not any(b.id == bundle_id for b in config.installed_bundles):
+            return False  # removed by a run that committed after config was loaded
+        sync_bundle_with_registry(
+            registry_root,
+            root,
+            config,
+            bundle_item,
+            resolve_bundle_members(registry_root, bundle_item),
+            config.registry.ref,
+            link_mode,
+            txn=txn,
+        )
+        txn.commit(config)
     return True
 
 
@@ -55,6 +88,8 @@ def update_item(
     config: ProjectConfig,
     kind: str,
     item_id: str,
+    link_mode: LinkMode | None = None,
+    dry_run: bool = False,
 ) -> bool:
     """Update one installed item: re-fetch registry, re-install, update config.
 
@@ -63,6 +98,8 @@ def update_item(
         config: Current project config.
         kind: agent, rule, skill, workflow, or prompt.
         item_id: Id of the installed item.
+        link_mode: How to materialize files (default: config.link_mode).
+        dry_run: Only plan the changes (see Transaction); project and config file stay unchanged.
 
     Returns:
         True if the item was installed and updated; False if not in installed list.
@@ -75,34 +112,40 @@ def update_item(
         return False
 
     registry_root = fetch_registry(config.registry.url, config.registry.ref)
-    all_items = get_registry_items(registry_root)
-    items_by_kind_id = _items_by_kind_id(all_items)
-    key = (kind, item_id)
-    if key not in items_by_kind_id:
+    new_item = get_registry_item(registry_root, kind, item_id)
+    if new_item is None:
         return False
-    new_item = items_by_kind_id[key]
     if not is_compatible_with_project_types(new_item, config.project_types):
         return False
 
-    remove_item(project_root, config, kind, item_id)
-    config = load_config(project_root)
-    if config is None:
-        return False
-    install_item(registry_root, new_item, root, config, config.registry.ref)
+    with Transaction(root, dry_run, config) as txn:
+        if not any(i.kind == kind and i.id == item_id for i in config.installed):
+            return False  # removed by a run that committed after config was loaded
+        _reinstall_item(registry_root, new_item, root, config, link_mode, txn)
+        txn.commit(config)
     return True
 
 
-def update_all(project_root: Path) -> list[tuple[str, str]]:
+def update_all(
+    project_root: Path, link_mode: LinkMode | None = None, dry_run: bool = False
+) -> list[tuple[str, str]]:
     """Update all installed items. Re-fetch registry and re-install each.
 
+    Bundles are reconciled first, then standalone items; all their files are
+    copied in one batch (see copy_registry_items_to_project) and committed with
+    the config in one Transaction, so the config is written once and a failure
+    leaves the project as it was.
+
     Args:
         project_root: Project root.
+        link_mode: How to materialize files (default: the config's link_mode).
+        dry_run: Only plan the changes (see Transaction); project and config file stay unchanged.
 
     Returns:
         List of (kind, id) that were successfully updated.
 
     Raises:
-        RuntimeError: If config missing or registry fetch fails.
+        RuntimeError: If config missing, registry fetch fails, or files cannot be copied.
     """
     root = Path(project_root)
     config = load_config(root)
@@ -110,57 +153,50 @@ def update_all(project_root: Path) -> list[tuple[str, str]]:
         raise RuntimeError("No project config found; run forge init first")
 
     registry_root = fetch_registry(config.registry.url, config.registry.ref)
-    all_items = get_registry_items(registry_root)
-    items_by_kind_id = _items_by_kind_id(all_items)
+    catalog = get_catalog(registry_root)
     updated: list[tuple[str, str]] = []
-
-    bundle_ids = [b.id for b in config.installed_bundles]
-    for bid in bundle_ids:
-        config = load_config(root)
-        if config is None:
-            break
-        key = ("bundle", bid)
-        if key not in items_by_kind_id:
-            continue
-        bundle_item = items_by_kind_id[key]
-        if bundle_item.kind != "bundle" or not bundle_item.items:
-            continue
-        if not is_compatible_with_project_types(bundle_item, config.project_types):
-            continue
-        if not any(b.id == bid for b in config.installed_bundles):
-            continue
-        sync_bundle_with_registry(
+    batch: dict[tuple[str, str], RegistryItem] = {}
+
+    with Transaction(root, dry_run, config) as txn:
+        for bid in [b.id for b in config.installed_bundles]:
+            bundle_item = catalog.get(("bundle", bid))
+            if bundle_item is None or not bundle_item.items:
+                continue
+            if not is_compatible_with_project_types(bundle_item, config.project_types):
+                continue
+            sync_bundle_with_registry(
+                registry_root,
+                root,
+                config,
+                bundle_item,
+                catalog,
+                config.registry.ref,
+                link_mode,
+                copy_members=False,
+                txn=txn,
+            )
+            for ref in bundle_item.items:
+                batch.setdefault((ref.kind, ref.id), catalog[(ref.kind, ref.id)])
+            updated.append(("bundle", bid))
+
+        for inst in list(config.installed):
+            key = (inst.kind, inst.id)
+            if key not in catalog:
+                continue
+            new_item = catalog[key]
+            if not is_compatible_with_project_types(new_item, config.project_types):
+                continue
+            _refresh_installed_row(config, new_item)
+            batch.setdefault(key, new_item)
+            updated.append(key)
+
+        copy_registry_items_to_project(
             registry_root,
+            list(batch.values()),
             root,
-            config,
-            bundle_item,
-            items_by_kind_id,
-            config.registry.ref,
+            config.tool,
+            link_mode or config.link_mode,
+            txn,
         )
-        save_config(root, config)
-        updated.append(("bundle", bid))
-
-    config = load_config(root)
-    if config is None:
-        return updated
-
-    to_update = list(config.installed)
-
-    for inst in to_update:
-        key = (inst.kind, inst.id)
-        if key not in items_by_kind_id:
-            continue
-        new_item = items_by_kind_id[key]
-        if not is_compatible_with_project_types(new_item, config.project_types):
-            continue
-        remove_item(root, config, inst.kind, inst.id)
-        config = load_config(root)
-        if config is None:
-            continue
-        install_item(registry_root, new_item, root, config, config.registry.ref)
-        updated.append((inst.kind, inst.id))
-        config = load_config(root)
-        if config is None:
-            break
-
+        txn.commit(config)
     return updated
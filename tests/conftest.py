@@ -1,5 +1,7 @@
 """Pytest fixtures: temp registry and project dirs."""
 
+import os
+import subprocess
 import tempfile
 from pathlib import Path
 
@@ -107,3 +109,30 @@ def claude_code_project_root(tmp_path: Path) -> Path:
         encoding="utf-8",
     )
     return root
+
+
+def git_commit_all(repo: Path, message: str = "update") -> str:
+    """Stage everything in repo, commit, and return the new HEAD SHA."""
+    env = {
+        **os.environ,
+        "GIT_AUTHOR_NAME": "forge",
+        "GIT_AUTHOR_EMAIL": "forge@example.com",
+        "GIT_COMMITTER_NAME": "forge",
+        "GIT_COMMITTER_EMAIL": "forge@example.com",
+    }
+    subprocess.run(["git", "add", "-A"], cwd=repo, check=True, capture_output=True)
+    subprocess.run(
+        ["git", "commit", "-q", "-m", message], cwd=repo, check=True, capture_output=True, env=env
+    )
+    out = subprocess.run(["git", "rev-parse", "HEAD"], cwd=repo, check=True, capture_output=True)
+    return out.stdout.decode().strip()
+
+
+@pytest.fixture
+def git_registry(registry_root: Path) -> Path:
+    """Turn the registry fixture into a git repo with one commit on main."""
+    subprocess.run(
+        ["git", "init", "-q", "-b", "main"], cwd=registry_root, check=True, capture_output=True
+    )
+    git_commit_all(registry_root, "initial")
+    return registry_root
@@ -0,0 +1,189 @@
+"""Tests for registry cache listing, LRU garbage collection, and forge cache CLI."""
+
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from forge.cli.main import app
+from forge.core.cache_gc import clear_cache, gc_cache, list_cache_entries, mirror_sizes
+from forge.core.git import run_git
+from forge.core.registry import fetch_registry, get_registry_items
+from forge.core.registry_cache import catalog_db_path, catalog_path, entry_meta_path, mirror_path
+from tests.conftest import git_commit_all
+
+runner = CliRunner()
+
+
+def _second_registry(git_registry: Path, tmp_path: Path) -> Path:
+    other = tmp_path / "other-registry"
+    shutil.copytree(git_registry, other)
+    return other
+
+
+def test_list_cache_entries_reports_refs_and_size(git_registry: Path, tmp_path: Path) -> None:
+    cache = tmp_path / "cache"
+    snap = fetch_registry(str(git_registry), "main", cache_dir=cache)
+    infos = list_cache_entries(cache)
+    assert len(infos) == 1
+    assert infos[0].path == str(snap)
+    assert infos[0].refs == ["main"]
+    assert infos[0].size_bytes > 0
+    assert infos[0].last_used > 0
+
+
+def test_gc_evicts_unreferenced_snapshot(git_registry: Path, tmp_path: Path) -> None:
+    cache = tmp_path / "cache"
+    url = str(git_registry)
+    old = fetch_registry(url, "main", cache_dir=cache)
+    get_registry_items(old)
+    catalog_db_path(old).write_bytes(b"")
+    (git_registry / "rules" / "test-rule" / "RULE.md").write_text("# v2\n", encoding="utf-8")
+    git_commit_all(git_registry, "v2")
+    new = fetch_registry(url, "main", cache_dir=cache)
+
+    evicted = gc_cache(cache, grace_seconds=0)
+    assert [e.path for e in evicted] == [str(old)]
+    assert not old.exists()
+    assert not catalog_path(old).exists()
+    assert not catalog_db_path(old).exists()
+    assert new.is_dir()
+    assert mirror_path(cache, url).is_dir()
+
+
+def test_gc_drops_bare_snapshot_pin(
+    git_registry: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("FORGE_CACHE_MODE", "bare")
+    cache = tmp_path / "cache"
+    url = str(git_registry)
+    old = fetch_registry(url, "main", cache_dir=cache)
+    old_commit = old.name
+    (git_registry / "rules" / "test-rule" / "RULE.md").write_text("# v2\n", encoding="utf-8")
+    git_commit_all(git_registry, "v2")
+    fetch_registry(url, "main", cache_dir=cache)
+
+    assert [e.commit for e in gc_cache(cache, grace_seconds=0)] == [old_commit]
+    refs = run_git(
+        ["for-each-ref", "--format=%(refname)", "refs/forge/snapshots/"],
+        cwd=mirror_path(cache, url),
+    )
+    assert old_commit not in refs and refs
+
+
+def test_gc_size_cap_evicts_least_recently_used(git_registry: Path, tmp_path: Path) -> None:
+    cache = tmp_path / "cache"
+    other = _second_registry(git_registry, tmp_path)
+    old_snap = fetch_registry(str(other), "main", cache_dir=cache)
+    new_snap = fetch_registry(str(git_registry), "main", cache_dir=cache)
+    os.utime(entry_meta_path(old_snap), (1_000, 1_000))
+
+    infos = {i.url: i for i in list_cache_entries(cache)}
+    keep = infos[str(git_registry)].size_bytes + mirror_sizes(cache)[str(git_registry)]
+    evicted = gc_cache(cache, max_bytes=keep, grace_seconds=0)
+
+    assert [e.url for e in evicted] == [str(other)]
+    assert not old_snap.exists()
+    assert not mirror_path(cache, str(other)).exists()
+    assert new_snap.is_dir()
+
+
+def test_gc_respects_grace_period(git_registry: Path, tmp_path: Path) -> None:
+    cache = tmp_path / "cache"
+    fetch_registry(str(git_registry), "main", cache_dir=cache)
+    assert gc_cache(cache, max_bytes=0) == []
+
+
+def test_gc_rechecks_snapshot_under_lock(
+    git_registry: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    from contextlib import contextmanager
+
+    from forge.core import cache_gc
+
+    cache = tmp_path / "cache"
+    snap = fetch_registry(str(git_registry), "main", cache_dir=cache)
+    os.utime(entry_meta_path(snap), (1_000, 1_000))
+    real_lock = cache_gc.cache_lock
+
+    @contextmanager
+    def _lock_after_concurrent_fetch(root: Path, url: str):
+        # Another run used the snapshot between gc's listing and gc taking the lock.
+        os.utime(entry_meta_path(snap))
+        with real_lock(root, url):
+            yield
+
+    monkeypatch.setattr(cache_gc, "cache_lock", _lock_after_concurrent_fetch)
+    assert gc_cache(cache, max_age_seconds=60, grace_seconds=0) == []
+    assert snap.is_dir()
+
+
+def test_fetch_registry_enforces_env_cap(
+    git_registry: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    cache = tmp_path / "cache"
+    other = _second_registry(git_registry, tmp_path)
+    old_snap = fetch_registry(str(other), "main", cache_dir=cache)
+    os.utime(entry_meta_path(old_snap), (1_000, 1_000))
+    monkeypatch.setenv("FORGE_CACHE_MAX_AGE_DAYS", "1")
+    fetch_registry(str(git_registry), "main", cache_dir=cache)
+    assert not old_snap.exists()
+
+
+def test_clear_cache_removes_everything(git_registry: Path, tmp_path: Path) -> None:
+    cache = tmp_path / "cache"
+    fetch_registry(str(git_registry), "main", cache_dir=cache)
+    assert clear_cache(cache) == 1
+    assert list_cache_entries(cache) == []
+    assert not (cache / "mirrors").exists()
+
+
+def test_cache_ls_cli(git_registry: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+    fetch_registry(str(git_registry), "main")
+    result = runner.invoke(app, ["cache", "ls"])
+    assert result.exit_code == 0
+    assert "main" in result.output
+    assert "1 snapshot(s), 1 mirror(s)" in result.output
+
+    result = runner.invoke(app, ["cache", "clear", "--yes"])
+    assert result.exit_code == 0
+    assert "1 snapshot(s) removed" in result.output
+
+
+def test_gc_store_keeps_linked_assets_after_snapshot_eviction(
+    git_registry: Path, tmp_path: Path, project_root: Path
+) -> None:
+    from forge.core.cache_gc import gc_store, store_usage
+    from forge.core.install import copy_registry_item_to_project
+
+    cache = tmp_path / "cache"
+    url = str(git_registry)
+    old = fetch_registry(url, "main", cache_dir=cache)
+    items = {(i.kind, i.id): i for i in get_registry_items(old)}
+    copy_registry_item_to_project(
+        old, items[("rule", "test-rule")], project_root, "cursor", "symlink"
+    )
+    copy_registry_item_to_project(
+        old, items[("agent", "test-agent")], project_root, "cursor", "hardlink"
+    )
+    copy_registry_item_to_project(
+        old, items[("skill", "test-skill")], project_root, "cursor", "reflink"
+    )
+    assert store_usage(cache)[0] == 3
+    assert gc_store(cache, grace_seconds=0) == (0, 0)
+
+    (git_registry / "rules" / "test-rule" / "RULE.md").write_text("# v2\n", encoding="utf-8")
+    git_commit_all(git_registry, "v2")
+    fetch_registry(url, "main", cache_dir=cache)
+    assert [e.path for e in gc_cache(cache, grace_seconds=0)] == [str(old)]
+
+    # The reflinked skill owns its blocks; the symlinked rule and hard-linked agent
+    # still need the store.
+    removed, freed = gc_store(cache, grace_seconds=0)
+    assert removed == 1 and freed > 0
+    assert store_usage(cache)[0] == 2
+    assert (project_root / ".cursor" / "rules" / "test-rule" / "RULE.md").read_text() != "# v2\n"
+    assert (project_root / ".cursor" / "agents" / "test-agent.md").is_file()
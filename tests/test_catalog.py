@@ -0,0 +1,103 @@
+"""Tests for compact catalog records (CatalogItem)."""
+
+import pickle
+
+import pytest
+
+from forge.core.catalog import Catalog, CatalogItem, is_compatible_mask, project_type_mask
+from forge.core.models import BundleItemRef, RegistryItem
+
+
+def _bundle() -> RegistryItem:
+    return RegistryItem(
+        kind="bundle",
+        id="b",
+        version="1.0.0",
+        project_types=["backend", "data"],
+        description="Bundle",
+        path="bundles/b",
+        items=[BundleItemRef(kind="rule", id="r"), BundleItemRef(kind="skill", id="s")],
+    )
+
+
+def test_catalog_item_round_trips() -> None:
+    item = _bundle()
+    record = CatalogItem.from_registry_item(item)
+    assert record.to_registry_item() == item
+    assert CatalogItem.from_row(record.to_row()) == record
+    assert CatalogItem.from_dict(item.model_dump()) == record
+    assert pickle.loads(pickle.dumps(record)) == record
+
+
+def test_catalog_items_share_interned_values() -> None:
+    a = CatalogItem.from_registry_item(_bundle())
+    b = CatalogItem.from_row(a.to_row())
+    assert a.project_types is b.project_types
+    assert a.items is not None and b.items is not None
+    assert all(x is y for x, y in zip(a.items, b.items))
+
+
+def test_project_type_mask_filtering() -> None:
+    record = CatalogItem("rule", "r", "1.0.0", ["backend", "custom"], None, "rules/r")
+    assert is_compatible_mask(record, project_type_mask(["backend"]), ["backend"])
+    assert not is_compatible_mask(record, project_type_mask(["frontend"]), ["frontend"])
+    assert is_compatible_mask(record, project_type_mask(["custom"]), ["custom"])
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {"kind": "nope", "id": "x", "version": "1", "project_types": ["backend"], "path": "p"},
+        {"kind": "rule", "id": "", "version": "1", "project_types": ["backend"], "path": "p"},
+        {"kind": "rule", "id": "x", "version": "1", "project_types": [], "path": "p"},
+        {
+            "kind": "bundle",
+            "id": "x",
+            "version": "1",
+            "project_types": ["data"],
+            "path": "p",
+            "items": [{"kind": "bundle", "id": "y"}],
+        },
+    ],
+)
+def test_from_dict_rejects_invalid_items(data: dict) -> None:
+    with pytest.raises(ValueError):
+        CatalogItem.from_dict(data)
+
+
+def _records() -> list[CatalogItem]:
+    return [
+        CatalogItem("rule", "r1", "1.0.0", ["backend"], None, "rules/r1"),
+        CatalogItem("rule", "r2", "1.0.0", ["data", "backend"], None, "rules/r2"),
+        CatalogItem("skill", "s1", "1.0.0", ["frontend"], None, "skills/s1"),
+        CatalogItem("rule", "r3", "1.0.0", ["infra"], None, "rules/r3"),
+        CatalogItem(
+            "bundle", "b1", "1.0.0", ["backend"], None, "bundles/b1",
+            [("rule", "r1"), ("skill", "s1")],
+        ),
+    ]
+
+
+def test_catalog_queries_use_indexes_and_keep_order() -> None:
+    catalog = Catalog(_records())
+    assert len(catalog) == 5
+    assert [r.id for r in catalog.query(kind="rule")] == ["r1", "r2", "r3"]
+    rules = catalog.query(kind="rule", project_types=["backend", "data"])
+    assert [r.id for r in rules] == ["r1", "r2"]
+    rules = catalog.query(kind="rule", project_types=["infra", "backend"])
+    assert [r.id for r in rules] == ["r1", "r2", "r3"]
+    assert [r.id for r in catalog.query(project_types=["frontend"])] == ["s1"]
+    assert catalog.query(kind="agent") == []
+    assert [r.id for r in catalog.query()] == ["r1", "r2", "s1", "r3", "b1"]
+
+
+def test_catalog_mapping_and_reverse_bundle_index() -> None:
+    catalog = Catalog(_records())
+    assert ("rule", "r1") in catalog
+    assert ("rule", "missing") not in catalog
+    item = catalog[("rule", "r2")]
+    assert isinstance(item, RegistryItem) and item.project_types == ["data", "backend"]
+    assert catalog[("rule", "r2")] is item
+    assert catalog.record("skill", "s1") is not None
+    assert [b.id for b in catalog.bundles_containing("skill", "s1")] == ["b1"]
+    assert catalog.bundles_containing("rule", "r2") == []
@@ -0,0 +1,119 @@
+"""Tests for the optional SQLite catalog store (FORGE_CATALOG_STORE=sqlite)."""
+
+from pathlib import Path
+
+import pytest
+
+from forge.core import registry
+from forge.core.catalog import Catalog, CatalogItem
+from forge.core.catalog_sqlite import SqliteCatalog, build_sqlite_store
+from forge.core.list_items import list_items
+from forge.core.registry import (
+    fetch_registry,
+    get_catalog_store,
+    get_registry_item,
+    resolve_bundle_members,
+)
+from forge.core.registry_cache import CATALOG_STORE_ENV, catalog_db_path
+from forge.core.search import search_registry
+
+
+def _records() -> list[CatalogItem]:
+    return [
+        CatalogItem(
+            "rule", "fastapi", "1.0.0", ["backend"], "FastAPI conventions", "rules/fastapi"
+        ),
+        CatalogItem("rule", "react", "1.0.0", ["frontend"], "React components", "rules/react"),
+        CatalogItem("skill", "sql", "2.0.0", ["data", "backend"], None, "skills/sql"),
+        CatalogItem(
+            "rule", "fastapi", "9.9.9", ["backend"], "duplicate is ignored", "rules/fastapi"
+        ),
+        CatalogItem(
+            "bundle", "web", "1.0.0", ["backend", "frontend"], "Web", "bundles/web",
+            [("rule", "fastapi"), ("rule", "react"), ("skill", "missing")],
+        ),
+    ]
+
+
+@pytest.fixture
+def store(tmp_path: Path) -> SqliteCatalog:
+    path = tmp_path / "abc.sqlite"
+    build_sqlite_store(path, "abc", _records())
+    opened = SqliteCatalog.open(path, "abc")
+    assert opened is not None
+    yield opened
+    opened.close()
+
+
+def test_store_matches_in_memory_catalog(store: SqliteCatalog) -> None:
+    catalog = Catalog(_records())
+    assert store.get("rule", "fastapi") == catalog.record("rule", "fastapi")
+    assert store.get("bundle", "web") == catalog.record("bundle", "web")
+    assert store.get("rule", "nope") is None
+    for kind, types in [
+        (None, None),
+        ("rule", None),
+        (None, ["backend"]),
+        ("rule", ["frontend", "data"]),
+    ]:
+        assert store.query(kind, types) == catalog.query(kind, types)
+    assert store.query(project_types=[]) == []
+    assert store.bundles_containing("rule", "react") == catalog.bundles_containing("rule", "react")
+
+
+def test_store_get_many_skips_missing(store: SqliteCatalog) -> None:
+    found = store.get_many([("rule", "react"), ("skill", "missing"), ("rule", "fastapi")])
+    assert list(found) == [("rule", "react"), ("rule", "fastapi")]
+
+
+def test_store_search_descriptions_ranks_ids_first(store: SqliteCatalog) -> None:
+    assert store.has_fts
+    hits = store.search_descriptions("fastapi components")
+    assert [r.id for r, _ in hits][0] == "fastapi"
+    assert {r.id for r, _ in hits} == {"fastapi", "react"}
+    assert hits[0][1] >= hits[1][1]
+    assert [r.id for r, _ in store.search_descriptions("fastapi", project_types=["frontend"])] == []
+    assert store.search_descriptions("!!!") == []
+
+
+def test_store_open_rejects_other_commit(tmp_path: Path) -> None:
+    path = tmp_path / "abc.sqlite"
+    assert SqliteCatalog.open(path, "abc") is None
+    build_sqlite_store(path, "abc", _records())
+    assert SqliteCatalog.open(path, "def") is None
+
+
+def test_registry_uses_store_when_enabled(
+    git_registry: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    repo_path = fetch_registry(str(git_registry), "main", cache_dir=tmp_path / "cache")
+    assert get_catalog_store(repo_path) is None
+    monkeypatch.setenv(CATALOG_STORE_ENV, "sqlite")
+    store = get_catalog_store(repo_path)
+    assert store is not None and catalog_db_path(repo_path).is_file()
+    assert get_catalog_store(repo_path) is store
+
+    def _fail(*args: object, **kwargs: object) -> None:
+        raise AssertionError("store should answer without parsing manifests")
+
+    monkeypatch.setattr(registry, "_parse_registry_item", _fail)
+    monkeypatch.setattr(registry, "get_catalog", _fail)
+    bundle = get_registry_item(repo_path, "bundle", "test-bundle")
+    assert bundle is not None
+    assert sorted(resolve_bundle_members(repo_path, bundle)) == [
+        ("rule", "test-rule"),
+        ("skill", "test-skill"),
+    ]
+    rules = list_items("", "", ["backend"], category="rule", registry_root=repo_path)
+    assert [r.id for r in rules] == ["test-rule"]
+    assert [h.item.id for h in search_registry(repo_path, "test rule", kind="rule")] == [
+        "test-rule"
+    ]
+
+
+def test_store_not_used_for_plain_directories(
+    registry_root: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv(CATALOG_STORE_ENV, "sqlite")
+    assert get_catalog_store(registry_root) is None
+    assert get_registry_item(registry_root, "rule", "test-rule") is not None
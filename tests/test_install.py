@@ -5,7 +5,7 @@ from pathlib import Path
 import pytest
 
 from forge.core.install import install_bundle, install_item
-from forge.core.models import ProjectConfig, RegistryConfig
+from forge.core.models import ProjectConfig, RegistryConfig, RegistryItem
 from forge.core.project import load_config, save_config
 from forge.core.registry import get_registry_items
 
@@ -162,3 +162,258 @@ def test_install_hook_idempotent(registry_root: Path, claude_code_project_root:
     settings_path = claude_code_project_root / ".claude" / "settings.json"
     settings = json.loads(settings_path.read_text())
     assert len(settings["hooks"]["PostToolUse"]) == 1
+
+
+def test_reinstall_leaves_unchanged_files_untouched(
+    registry_root: Path, project_root: Path
+) -> None:
+    import os
+
+    from forge.core.install import copy_registry_item_to_project
+
+    items = get_registry_items(registry_root)
+    rule = next(i for i in items if i.kind == "rule" and i.id == "test-rule")
+    first = copy_registry_item_to_project(registry_root, rule, project_root, "cursor")
+    assert (first.written, first.skipped) == (1, 0)
+    dest = project_root / ".cursor" / "rules" / "test-rule" / "RULE.md"
+    os.utime(dest, (1_000, 1_000))
+
+    again = copy_registry_item_to_project(registry_root, rule, project_root, "cursor")
+    assert (again.written, again.skipped) == (0, 1)
+    assert dest.stat().st_mtime == 1_000
+
+    (registry_root / "rules" / "test-rule" / "RULE.md").write_text("# Changed\n", encoding="utf-8")
+    changed = copy_registry_item_to_project(registry_root, rule, project_root, "cursor")
+    assert (changed.written, changed.skipped) == (1, 0)
+    assert dest.read_text() == "# Changed\n"
+
+
+def test_reinstall_hook_keeps_settings_and_drops_stale_entries(
+    registry_root: Path, claude_code_project_root: Path
+) -> None:
+    import json
+    import os
+
+    from forge.core.install import copy_registry_item_to_project
+
+    items = get_registry_items(registry_root)
+    hook = next(i for i in items if i.kind == "hook" and i.id == "test-hook")
+    copy_registry_item_to_project(registry_root, hook, claude_code_project_root, "claude-code")
+    settings_path = claude_code_project_root / ".claude" / "settings.json"
+    os.utime(settings_path, (1_000, 1_000))
+
+    report = copy_registry_item_to_project(
+        registry_root, hook, claude_code_project_root, "claude-code"
+    )
+    assert report.written == 0 and report.skipped == 2
+    assert settings_path.stat().st_mtime == 1_000
+
+    hooks_json = registry_root / "hooks" / "test-hook" / "hooks.json"
+    defs = json.loads(hooks_json.read_text())
+    for entries in defs.values():
+        for entry in entries:
+            entry["matcher"] = "Edit"
+    hooks_json.write_text(json.dumps(defs), encoding="utf-8")
+    report = copy_registry_item_to_project(
+        registry_root, hook, claude_code_project_root, "claude-code"
+    )
+    assert report.written == 1
+    entries = json.loads(settings_path.read_text())["hooks"]["PostToolUse"]
+    assert [e["matcher"] for e in entries] == ["Edit"]
+
+
+def _snapshot_rule(git_registry: Path, tmp_path: Path) -> tuple[Path, RegistryItem]:
+    from forge.core.registry import fetch_registry
+
+    snapshot = fetch_registry(str(git_registry), "main", cache_dir=tmp_path / "cache")
+    rule = next(i for i in get_registry_items(snapshot) if i.kind == "rule" and i.id == "test-rule")
+    return snapshot, rule
+
+
+def test_install_hardlink_from_snapshot(
+    git_registry: Path, tmp_path: Path, project_root: Path
+) -> None:
+    import os
+
+    from forge.core.install import copy_registry_item_to_project
+    from forge.core.remove import remove_member_files
+
+    snapshot, rule = _snapshot_rule(git_registry, tmp_path)
+    source = snapshot / "rules" / "test-rule" / "RULE.md"
+    dest = project_root / ".cursor" / "rules" / "test-rule" / "RULE.md"
+    report = copy_registry_item_to_project(snapshot, rule, project_root, "cursor", "hardlink")
+    assert (report.written, report.linked) == (1, 1)
+    # The link shares a read-only store entry, never the snapshot file itself.
+    assert not os.path.samefile(source, dest) and dest.read_bytes() == source.read_bytes()
+    assert not dest.stat().st_mode & 0o222 and source.stat().st_nlink == 1
+    report = copy_registry_item_to_project(snapshot, rule, project_root, "cursor", "hardlink")
+    assert (report.written, report.skipped) == (0, 1)
+
+    # Switching back to copies gives the project its own writable inode.
+    report = copy_registry_item_to_project(snapshot, rule, project_root, "cursor", "copy")
+    assert report.written == 1 and dest.stat().st_nlink == 1 and dest.stat().st_mode & 0o200
+    copy_registry_item_to_project(snapshot, rule, project_root, "cursor", "hardlink")
+    remove_member_files(project_root, "rule", "test-rule", "cursor")
+    assert not dest.exists() and source.is_file()
+
+
+def test_copy_and_dry_run_installs_leave_the_store_alone(
+    git_registry: Path, tmp_path: Path, claude_code_project_root: Path
+) -> None:
+    from forge.core.asset_store import asset_store
+    from forge.core.install import copy_registry_item_to_project
+    from forge.core.registry import fetch_registry
+    from forge.core.registry_cache import store_index_path
+    from forge.core.transaction import Transaction
+
+    root = claude_code_project_root
+    snapshot = fetch_registry(str(git_registry), "main", cache_dir=tmp_path / "cache")
+    items = {(i.kind, i.id): i for i in get_registry_items(snapshot)}
+    hook, agent = items[("hook", "test-hook")], items[("agent", "test-agent")]
+    copy_registry_item_to_project(snapshot, hook, root, "claude-code", "copy")
+    assert (root / ".claude" / "hooks" / "test-hook.sh").is_file()
+    with Transaction(root, dry_run=True) as txn:
+        copy_registry_item_to_project(snapshot, agent, root, "claude-code", "symlink", txn=txn)
+        plan = txn.commit()
+    assert plan is not None and plan.create == [".claude/agents/test-agent.md"]
+    assert asset_store(tmp_path / "cache").entries() == []
+    assert not store_index_path(snapshot).exists()
+
+
+def test_install_symlink_and_remove_dangling(
+    git_registry: Path, tmp_path: Path, project_root: Path
+) -> None:
+    import shutil
+
+    from forge.core.install import copy_registry_item_to_project
+    from forge.core.remove import remove_member_files
+
+    snapshot, rule = _snapshot_rule(git_registry, tmp_path)
+    dest = project_root / ".cursor" / "rules" / "test-rule" / "RULE.md"
+    copy_registry_item_to_project(snapshot, rule, project_root, "cursor", "symlink")
+    assert dest.is_symlink() and dest.resolve().parent == tmp_path / "store"
+
+    # Links point into the asset store, so they survive the snapshot's eviction.
+    content = (snapshot / "rules" / "test-rule" / "RULE.md").read_bytes()
+    shutil.rmtree(snapshot)
+    assert dest.read_bytes() == content
+
+    dest.resolve().unlink()
+    remove_member_files(project_root, "rule", "test-rule", "cursor")
+    assert not dest.is_symlink() and not dest.parent.exists()
+
+
+def test_link_modes_fall_back_to_copy(
+    registry_root: Path, git_registry: Path, tmp_path: Path, project_root: Path
+) -> None:
+    from forge.core.install import copy_registry_item_to_project
+
+    rule = next(
+        i for i in get_registry_items(registry_root) if i.kind == "rule" and i.id == "test-rule"
+    )
+    report = copy_registry_item_to_project(registry_root, rule, project_root, "cursor", "symlink")
+    dest = project_root / ".cursor" / "rules" / "test-rule" / "RULE.md"
+    assert (report.written, report.linked) == (1, 0) and not dest.is_symlink()
+
+    snapshot, rule = _snapshot_rule(git_registry, tmp_path)
+    copy_registry_item_to_project(snapshot, rule, project_root, "cursor", "reflink")
+    assert dest.read_bytes() == (snapshot / "rules" / "test-rule" / "RULE.md").read_bytes()
+    assert not dest.is_symlink() and dest.stat().st_nlink == 1
+
+
+def test_install_uses_config_link_mode(
+    git_registry: Path, tmp_path: Path, project_root: Path
+) -> None:
+    snapshot, rule = _snapshot_rule(git_registry, tmp_path)
+    config = load_config(project_root)
+    assert config is not None
+    config.link_mode = "symlink"
+    install_item(snapshot, rule, project_root, config, "main")
+    assert (project_root / ".cursor" / "rules" / "test-rule" / "RULE.md").is_symlink()
+    loaded = load_config(project_root)
+    assert loaded is not None and loaded.link_mode == "symlink"
+
+
+def test_copy_items_in_parallel_with_hooks_serial(
+    registry_root: Path, claude_code_project_root: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    import json
+
+    from forge.core.install import copy_registry_items_to_project
+
+    monkeypatch.setenv("FORGE_INSTALL_WORKERS", "4")
+    items = [i for i in get_registry_items(registry_root) if i.kind not in ("bundle", "workflow")]
+    reports = copy_registry_items_to_project(
+        registry_root, items, claude_code_project_root, "claude-code"
+    )
+    assert [(r.kind, r.id) for r in reports] == [(i.kind, i.id) for i in items]
+    assert all(r.written > 0 for r in reports)
+    assert (claude_code_project_root / ".claude" / "rules" / "test-rule" / "RULE.md").is_file()
+    settings = json.loads((claude_code_project_root / ".claude" / "settings.json").read_text())
+    assert len(settings["hooks"]["PostToolUse"]) == 1
+
+    again = copy_registry_items_to_project(
+        registry_root, items, claude_code_project_root, "claude-code"
+    )
+    assert all(r.written == 0 for r in again)
+
+
+def test_copy_items_reports_failures_per_item(registry_root: Path, project_root: Path) -> None:
+    from forge.core.install import MaterializeError, copy_registry_items_to_project
+
+    (registry_root / "rules" / "test-rule" / "RULE.md").unlink()
+    items = [
+        i for i in get_registry_items(registry_root) if i.kind in ("agent", "rule", "skill", "hook")
+    ]
+    with pytest.raises(MaterializeError) as exc:
+        copy_registry_items_to_project(registry_root, items, project_root, "cursor")
+    assert list(exc.value.failures) == [("rule", "test-rule"), ("hook", "test-hook")]
+    assert "rule/test-rule: RULE.md not found" in str(exc.value)
+    assert (project_root / ".cursor" / "skills" / "test-skill" / "SKILL.md").is_file()
+    assert (project_root / ".cursor" / "agents" / "test-agent.md").is_file()
+
+
+def test_install_workers(monkeypatch: pytest.MonkeyPatch) -> None:
+    from forge.core.install import MAX_INSTALL_WORKERS, PARALLEL_INSTALL_THRESHOLD, install_workers
+
+    assert install_workers(PARALLEL_INSTALL_THRESHOLD - 1) == 1
+    assert install_workers(1000) == MAX_INSTALL_WORKERS
+    monkeypatch.setenv("FORGE_INSTALL_WORKERS", "3")
+    assert install_workers(1) == 3
+
+
+def test_linked_installs_share_one_store_entry(
+    git_registry: Path, tmp_path: Path, project_root: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    import json
+    import os
+    import shutil
+
+    from forge.core.asset_store import asset_store
+    from forge.core.install import copy_registry_item_to_project
+    from forge.core.registry import fetch_registry
+    from forge.core.registry_cache import store_index_path
+
+    other_project = tmp_path / "other-project"
+    shutil.copytree(project_root, other_project)
+    snapshot, rule = _snapshot_rule(git_registry, tmp_path)
+    monkeypatch.setenv("FORGE_CACHE_MODE", "bare")
+    bare = fetch_registry(str(git_registry), "main", cache_dir=tmp_path / "bare-cache")
+
+    copy_registry_item_to_project(snapshot, rule, project_root, "cursor", "hardlink")
+    report = copy_registry_item_to_project(snapshot, rule, other_project, "cursor", "hardlink")
+    assert report.linked == 1
+    first = project_root / ".cursor" / "rules" / "test-rule" / "RULE.md"
+    second = other_project / ".cursor" / "rules" / "test-rule" / "RULE.md"
+    assert os.path.samefile(first, second)
+    assert list(json.loads(store_index_path(snapshot).read_text())) == ["rules/test-rule/RULE.md"]
+    [entry] = asset_store(tmp_path / "cache").entries()
+    assert os.path.samefile(entry, first)
+
+    # Bare snapshots have no files on disk; their blobs are streamed into the store and linked.
+    bare_project = tmp_path / "bare-project"
+    shutil.copytree(project_root / ".forge", bare_project / ".forge")
+    report = copy_registry_item_to_project(bare, rule, bare_project, "cursor", "symlink")
+    dest = bare_project / ".cursor" / "rules" / "test-rule" / "RULE.md"
+    assert report.linked == 1 and dest.is_symlink()
+    assert dest.read_bytes() == first.read_bytes()
@@ -0,0 +1,108 @@
+"""Tests for forge install CLI (several items per run, -f items file)."""
+
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from forge.cli.main import app
+from forge.core.project import load_config, save_config
+
+runner = CliRunner()
+
+
+@pytest.fixture
+def cli_project(
+    git_registry: Path, project_root: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> Path:
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+    config = load_config(project_root)
+    assert config is not None
+    config.registry.url = str(git_registry)
+    save_config(project_root, config)
+    monkeypatch.chdir(project_root)
+    return project_root
+
+
+def test_install_several_items_saves_config_once(
+    cli_project: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    saves: list[int] = []
+    from forge.core import transaction
+
+    real_write = transaction.write_config_file
+    monkeypatch.setattr(
+        transaction, "write_config_file", lambda *a: (saves.append(1), real_write(*a))
+    )
+
+    result = runner.invoke(
+        app, ["install", "rule", "test-rule", "agent", "test-agent", "bundle", "test-bundle"]
+    )
+    assert result.exit_code == 0, result.output
+    assert "Installed rule test-rule." in result.output
+    assert "Installed bundle test-bundle." in result.output
+    assert saves == [1]
+    config = load_config(cli_project)
+    assert config is not None
+    assert {(i.kind, i.id) for i in config.installed} == {
+        ("rule", "test-rule"),
+        ("agent", "test-agent"),
+    }
+    assert [b.id for b in config.installed_bundles] == ["test-bundle"]
+    assert (cli_project / ".cursor" / "skills" / "test-skill" / "SKILL.md").is_file()
+
+
+def test_install_from_items_file(cli_project: Path, tmp_path: Path) -> None:
+    items = tmp_path / "items.txt"
+    items.write_text(
+        "# team defaults\nrule test-rule\nskill test-skill  # data\n", encoding="utf-8"
+    )
+    result = runner.invoke(app, ["install", "agent", "test-agent", "-f", str(items)])
+    assert result.exit_code == 0, result.output
+    config = load_config(cli_project)
+    assert config is not None
+    assert [(i.kind, i.id) for i in config.installed] == [
+        ("agent", "test-agent"),
+        ("rule", "test-rule"),
+        ("skill", "test-skill"),
+    ]
+
+
+def test_install_nothing_when_any_item_is_missing(cli_project: Path) -> None:
+    result = runner.invoke(app, ["install", "rule", "test-rule", "nope", "skill"])
+    assert result.exit_code == 1
+    assert "No ids given after kind skill" in result.output
+
+    result = runner.invoke(app, ["install", "rule", "test-rule", "nope"])
+    assert result.exit_code == 1
+    assert "Item not found: rule/nope" in result.output
+    assert not (cli_project / ".cursor" / "rules" / "test-rule").exists()
+    config = load_config(cli_project)
+    assert config is not None and config.installed == []
+
+
+def test_install_rejects_id_before_kind(cli_project: Path) -> None:
+    result = runner.invoke(app, ["install", "test-rule"])
+    assert result.exit_code == 1
+    assert "Kind must be" in result.output
+
+
+def test_update_dry_run_prints_plan(cli_project: Path) -> None:
+    assert (
+        runner.invoke(app, ["install", "rule", "test-rule", "agent", "test-agent"]).exit_code == 0
+    )
+    agent = cli_project / ".cursor" / "agents" / "test-agent.md"
+    agent.write_text("local edit\n", encoding="utf-8")
+
+    result = runner.invoke(app, ["update", "--dry-run"])
+    assert result.exit_code == 0, result.output
+    assert "overwrite .cursor/agents/test-agent.md" in result.output
+    assert "1 file(s) unchanged" in result.output
+    assert "Updated" not in result.output
+    assert agent.read_text() == "local edit\n"
+
+    result = runner.invoke(app, ["remove", "rule", "test-rule", "--dry-run"])
+    assert result.exit_code == 0, result.output
+    assert "- rule test-rule" in result.output
+    assert "delete    .cursor/rules/test-rule" in result.output
+    assert (cli_project / ".cursor" / "rules" / "test-rule" / "RULE.md").is_file()
@@ -72,3 +72,31 @@ def test_list_installed_filtered_by_category(project_root: Path, monkeypatch: py
     assert result.exit_code == 0
     assert "r1" in result.output
     assert "a1" not in result.output
+
+
+def test_list_offline_without_cache_fails_fast(
+    project_root: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+    monkeypatch.setenv("FORGE_OFFLINE", "0")
+    monkeypatch.chdir(project_root)
+    result = runner.invoke(app, ["--offline", "list"])
+    assert result.exit_code == 1
+    assert "Offline mode" in result.output
+
+
+@pytest.mark.parametrize("before", [None, "0"])
+def test_offline_flag_does_not_leak_into_environment(
+    project_root: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, before: str | None
+) -> None:
+    import os
+
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+    if before is None:
+        monkeypatch.delenv("FORGE_OFFLINE", raising=False)
+    else:
+        monkeypatch.setenv("FORGE_OFFLINE", before)
+    monkeypatch.chdir(project_root)
+    result = runner.invoke(app, ["--offline", "list"])
+    assert "Offline mode" in result.output
+    assert os.environ.get("FORGE_OFFLINE") == before
@@ -81,3 +81,19 @@ def test_load_config_legacy_project_type_product(tmp_path: Path) -> None:
     loaded = load_config(tmp_path)
     assert loaded is not None
     assert loaded.project_types == ["product"]
+
+
+def test_link_mode_round_trip(tmp_path: Path) -> None:
+    config = ProjectConfig(project_types=["backend"], registry=RegistryConfig(url="https://x.git"))
+    save_config(tmp_path, config)
+    assert "link_mode" not in (tmp_path / ".forge" / "config.yaml").read_text()
+    config.link_mode = "hardlink"
+    save_config(tmp_path, config)
+    loaded = load_config(tmp_path)
+    assert loaded is not None and loaded.link_mode == "hardlink"
+    (tmp_path / ".forge" / "config.yaml").write_text(
+        "project_types: [backend]\nregistry:\n  url: https://x.git\nlink_mode: teleport\n",
+        encoding="utf-8",
+    )
+    loaded = load_config(tmp_path)
+    assert loaded is not None and loaded.link_mode == "copy"
@@ -2,7 +2,18 @@
 
 from pathlib import Path
 
-from forge.core.registry import get_registry_items
+import pytest
+
+from forge.core import registry
+from forge.core.registry import (
+    PARALLEL_PARSE_THRESHOLD,
+    _scan_registry_items,
+    get_registry_item,
+    get_registry_items,
+    get_registry_items_by_key,
+    parse_workers,
+    resolve_bundle_members,
+)
 
 
 def test_get_registry_items(registry_root: Path) -> None:
@@ -19,3 +30,61 @@ def test_get_registry_items(registry_root: Path) -> None:
     assert bundle.items[0].kind == "rule" and bundle.items[0].id == "test-rule"
     assert items[0].version == "1.0.0"
     assert "backend" in items[0].project_types
+
+
+def test_parallel_scan_matches_serial_order(registry_root: Path) -> None:
+    (registry_root / "prompts" / "team").mkdir(parents=True)
+    (registry_root / "prompts" / "team" / "review.md").write_text("Review.\n", encoding="utf-8")
+    for n in range(20):
+        rule_dir = registry_root / "rules" / f"rule-{n:02d}"
+        rule_dir.mkdir()
+        (rule_dir / "manifest.yaml").write_text(
+            f"version: '1.{n}.0'\nproject_types: [backend]\n", encoding="utf-8"
+        )
+    serial = _scan_registry_items(registry_root, workers=1)
+    assert _scan_registry_items(registry_root, workers=2) == serial
+    assert len(serial) == 27
+
+
+def test_parse_workers(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("FORGE_PARSE_WORKERS", raising=False)
+    assert parse_workers(10) == 1
+    assert parse_workers(PARALLEL_PARSE_THRESHOLD) >= 1
+    monkeypatch.setattr(registry, "_available_cpus", lambda: 1)
+    assert parse_workers(10_000) == 1
+    monkeypatch.setattr(registry, "_available_cpus", lambda: 16)
+    assert parse_workers(PARALLEL_PARSE_THRESHOLD - 1) == 1
+    assert parse_workers(PARALLEL_PARSE_THRESHOLD) == 8
+    monkeypatch.setenv("FORGE_PARSE_WORKERS", "3")
+    assert parse_workers(10) == 3
+    monkeypatch.setenv("FORGE_PARSE_WORKERS", "0")
+    assert parse_workers(10_000) == 1
+
+
+def test_get_registry_item_reads_single_manifest(
+    registry_root: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    (registry_root / "prompts" / "team").mkdir(parents=True)
+    (registry_root / "prompts" / "team" / "review.md").write_text("Review.\n", encoding="utf-8")
+    expected = {(i.kind, i.id): i for i in get_registry_items(registry_root)}
+
+    def _fail(*args: object, **kwargs: object) -> None:
+        raise AssertionError("single-item lookup must not walk the registry")
+
+    monkeypatch.setattr(registry, "_scan_registry_items", _fail)
+    singles = [("rule", "test-rule"), ("bundle", "test-bundle"), ("prompt", "team/review")]
+    for kind, item_id in singles:
+        assert get_registry_item(registry_root, kind, item_id) == expected[(kind, item_id)]
+    assert get_registry_item(registry_root, "rule", "missing") is None
+    assert get_registry_item(registry_root, "rule", "../rules/test-rule") is None
+    assert get_registry_item(registry_root, "nope", "test-rule") is None
+
+    bundle = expected[("bundle", "test-bundle")]
+    assert set(resolve_bundle_members(registry_root, bundle)) == {
+        ("rule", "test-rule"),
+        ("skill", "test-skill"),
+    }
+    # A few keys (e.g. forge install rule x) are looked up one by one too.
+    keys = [("rule", "test-rule"), ("rule", "missing"), ("bundle", "test-bundle")]
+    found = get_registry_items_by_key(registry_root, keys)
+    assert found == {k: expected[k] for k in keys if k in expected}
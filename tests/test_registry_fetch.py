@@ -0,0 +1,441 @@
+"""Tests for fetch_registry caching against a local git registry."""
+
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from forge.core import registry, registry_cache
+from forge.core.git import run_git
+from forge.core.registry import fetch_registry, get_registry_items
+from forge.core.registry_cache import (
+    cache_lock,
+    catalog_path,
+    clear_fetch_reports,
+    get_fetch_reports,
+    load_cache_entry,
+    load_snapshot,
+    mirror_path,
+)
+from forge.core.registry_files import DirectoryFiles, GitObjectFiles
+from forge.core.registry_index import write_registry_index
+from tests.conftest import git_commit_all
+
+
+@pytest.fixture(autouse=True)
+def _reset_reports() -> None:
+    clear_fetch_reports()
+
+
+def test_fetch_registry_clones_then_hits(git_registry: Path, tmp_path: Path) -> None:
+    url = str(git_registry)
+    cache = tmp_path / "cache"
+    first = fetch_registry(url, "main", cache_dir=cache)
+    second = fetch_registry(url, "main", cache_dir=cache)
+    assert first == second
+    assert [r.status for r in get_fetch_reports()] == ["cloned", "hit"]
+    snapshot = load_snapshot(first)
+    assert snapshot is not None
+    assert snapshot.commit == get_fetch_reports()[0].commit
+    entry = load_cache_entry(cache / registry._registry_cache_key(url, "main"))
+    assert entry is not None and entry.commit == snapshot.commit
+
+
+def test_fetch_registry_hit_skips_fetch_and_checkout(
+    git_registry: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    url = str(git_registry)
+    cache = tmp_path / "cache"
+    fetch_registry(url, "main", cache_dir=cache)
+
+    def _fail(*args: object, **kwargs: object) -> None:
+        raise AssertionError("fetch/checkout should be skipped")
+
+    monkeypatch.setattr(registry, "_fetch_into_mirror", _fail)
+    monkeypatch.setattr(registry, "_ensure_snapshot", _fail)
+    fetch_registry(url, "main", cache_dir=cache)
+    assert get_fetch_reports()[-1].status == "hit"
+
+
+def test_fetch_registry_refreshes_when_remote_moves(git_registry: Path, tmp_path: Path) -> None:
+    url = str(git_registry)
+    cache = tmp_path / "cache"
+    repo_path = fetch_registry(url, "main", cache_dir=cache)
+
+    rule_dir = git_registry / "rules" / "new-rule"
+    rule_dir.mkdir()
+    (rule_dir / "manifest.yaml").write_text(
+        "version: '1.0.0'\nproject_types: [backend]\n", encoding="utf-8"
+    )
+    (rule_dir / "RULE.md").write_text("# New\n", encoding="utf-8")
+    new_sha = git_commit_all(git_registry, "add rule")
+
+    new_path = fetch_registry(url, "main", cache_dir=cache)
+    report = get_fetch_reports()[-1]
+    assert report.status == "refreshed"
+    assert report.commit == new_sha
+    assert new_path != repo_path
+    assert ("rule", "new-rule") in {(i.kind, i.id) for i in get_registry_items(new_path)}
+    assert ("rule", "new-rule") not in {(i.kind, i.id) for i in get_registry_items(repo_path)}
+
+
+def test_fetch_registry_ttl_skips_ls_remote(
+    git_registry: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    url = str(git_registry)
+    cache = tmp_path / "cache"
+    fetch_registry(url, "main", cache_dir=cache)
+
+    monkeypatch.setenv("FORGE_CACHE_TTL", "3600")
+
+    def _fail(*args: object, **kwargs: object) -> None:
+        raise AssertionError("ls-remote should be skipped within TTL")
+
+    monkeypatch.setattr(registry, "ls_remote_commit", _fail)
+    fetch_registry(url, "main", cache_dir=cache)
+    assert get_fetch_reports()[-1].status == "hit"
+
+
+def test_fetch_registry_offline_uses_cache_without_git(
+    git_registry: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    url = str(git_registry)
+    cache = tmp_path / "cache"
+    repo_path = fetch_registry(url, "main", cache_dir=cache)
+
+    def _no_git(*args: object, **kwargs: object) -> None:
+        raise AssertionError("offline mode must not run git")
+
+    monkeypatch.setattr("subprocess.run", _no_git)
+    monkeypatch.setenv("FORGE_OFFLINE", "1")
+    assert fetch_registry(url, "main", cache_dir=cache) == repo_path
+    report = get_fetch_reports()[-1]
+    assert report.status == "offline"
+    assert report.commit == get_fetch_reports()[0].commit
+
+
+def test_fetch_registry_offline_without_cache_fails_fast(tmp_path: Path) -> None:
+    with pytest.raises(RuntimeError, match="Offline mode"):
+        fetch_registry("https://example.com/registry.git", "main", cache_dir=tmp_path, offline=True)
+
+
+def test_fetch_registry_refs_share_one_mirror(git_registry: Path, tmp_path: Path) -> None:
+    url = str(git_registry)
+    cache = tmp_path / "cache"
+    subprocess.run(["git", "tag", "v1.0.0"], cwd=git_registry, check=True, capture_output=True)
+    (git_registry / "rules" / "test-rule" / "RULE.md").write_text("# Changed\n", encoding="utf-8")
+    git_commit_all(git_registry, "change rule")
+    main_path = fetch_registry(url, "main", cache_dir=cache)
+    tag_path = fetch_registry(url, "v1.0.0", cache_dir=cache)
+    assert main_path != tag_path
+    assert (main_path / ".git").is_file()
+    assert (tag_path / ".git").is_file()
+    assert list((cache / "mirrors").iterdir()) == [mirror_path(cache, url)]
+    assert (tag_path / "rules" / "test-rule" / "RULE.md").read_text() == "# Test Rule\n"
+    assert (main_path / "rules" / "test-rule" / "RULE.md").read_text() == "# Changed\n"
+
+
+def test_fetch_registry_replaces_legacy_full_clone(git_registry: Path, tmp_path: Path) -> None:
+    url = str(git_registry)
+    cache = tmp_path / "cache"
+    repo_path = cache / registry._registry_cache_key(url, "main")
+    cache.mkdir()
+    subprocess.run(["git", "clone", "-q", url, str(repo_path)], check=True, capture_output=True)
+    snapshot = fetch_registry(url, "main", cache_dir=cache)
+    assert not repo_path.exists()
+    assert (snapshot / "rules" / "test-rule" / "RULE.md").exists()
+    assert get_fetch_reports()[-1].status == "cloned"
+
+
+def test_fetch_registry_partial_mode_materializes_on_install(
+    git_registry: Path, tmp_path: Path, project_root: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    from forge.core.install import install_item
+    from forge.core.project import load_config
+
+    subprocess.run(
+        ["git", "config", "uploadpack.allowFilter", "true"], cwd=git_registry, check=True
+    )
+    subprocess.run(
+        ["git", "config", "uploadpack.allowAnySHA1InWant", "true"], cwd=git_registry, check=True
+    )
+    monkeypatch.setenv("FORGE_CACHE_MODE", "partial")
+    url = str(git_registry)
+    repo_path = fetch_registry(url, "main", cache_dir=tmp_path / "cache")
+
+    assert (repo_path / "rules" / "test-rule" / "manifest.yaml").exists()
+    assert not (repo_path / "rules" / "test-rule" / "RULE.md").exists()
+    assert not (repo_path / "skills" / "test-skill" / "SKILL.md").exists()
+
+    items = {(i.kind, i.id): i for i in get_registry_items(repo_path)}
+    config = load_config(project_root)
+    assert config is not None
+    install_item(repo_path, items[("rule", "test-rule")], project_root, config, "main")
+
+    rule_md = project_root / ".cursor" / "rules" / "test-rule" / "RULE.md"
+    assert rule_md.read_text() == "# Test Rule\n"
+    assert not (repo_path / "skills" / "test-skill" / "SKILL.md").exists()
+
+
+def test_fetch_registry_bare_mode_reads_git_objects(
+    git_registry: Path,
+    tmp_path: Path,
+    claude_code_project_root: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    from forge.core.install import install_item
+    from forge.core.project import load_config
+    from forge.core.search import search_registry
+
+    monkeypatch.setenv("FORGE_CACHE_MODE", "bare")
+    cache = tmp_path / "cache"
+    repo_path = fetch_registry(str(git_registry), "main", cache_dir=cache)
+    snapshot = load_snapshot(repo_path)
+    assert snapshot is not None and snapshot.mode == "bare"
+    assert list(repo_path.iterdir()) == []
+    pinned = run_git(
+        ["rev-parse", f"refs/forge/snapshots/{snapshot.commit}"],
+        cwd=mirror_path(cache, str(git_registry)),
+    )
+    assert pinned == snapshot.commit
+
+    items = {(i.kind, i.id): i for i in get_registry_items(repo_path)}
+    assert items[("hook", "test-hook")] == registry.get_registry_item(
+        repo_path, "hook", "test-hook"
+    )
+    config = load_config(claude_code_project_root)
+    assert config is not None
+    install_item(repo_path, items[("rule", "test-rule")], claude_code_project_root, config, "main")
+    install_item(repo_path, items[("hook", "test-hook")], claude_code_project_root, config, "main")
+    claude = claude_code_project_root / ".claude"
+    assert (claude / "rules" / "test-rule" / "RULE.md").read_text() == "# Test Rule\n"
+    assert (claude / "hooks" / "test-hook.sh").stat().st_mode & 0o111
+    assert "PostToolUse" in (claude / "settings.json").read_text()
+    assert [h.item.id for h in search_registry(repo_path, "hook", include_body=True)] == [
+        "test-hook"
+    ]
+
+
+def test_git_object_files_match_checkout(git_registry: Path) -> None:
+    commit = run_git(["rev-parse", "HEAD"], cwd=git_registry)
+    disk = DirectoryFiles(git_registry)
+    objects = GitObjectFiles(git_registry, commit)
+    try:
+        for rel in ["rules/test-rule", "hooks/test-hook", "agents"]:
+            assert objects.walk(rel) == disk.walk(rel)
+            assert objects.list_dir(rel) == disk.list_dir(rel)
+            assert objects.is_dir(rel) and not objects.is_file(rel)
+        assert objects.read_bytes("rules/test-rule/RULE.md") == disk.read_bytes(
+            "rules/test-rule/RULE.md"
+        )
+        assert not objects.is_file("rules/missing/RULE.md")
+        with pytest.raises(FileNotFoundError):
+            objects.read_bytes("rules/missing/RULE.md")
+    finally:
+        objects.reader.close()
+
+
+def test_get_registry_items_reuses_catalog_for_snapshot(
+    git_registry: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    repo_path = fetch_registry(str(git_registry), "main", cache_dir=tmp_path / "cache")
+    first = get_registry_items(repo_path)
+    assert catalog_path(repo_path).is_file()
+
+    def _fail(*args: object, **kwargs: object) -> None:
+        raise AssertionError("manifests should not be re-parsed")
+
+    monkeypatch.setattr(registry, "_scan_registry_items", _fail)
+    monkeypatch.setattr(registry, "_scan_git_registry_items", _fail)
+    assert get_registry_items(repo_path) == first
+
+
+def test_get_registry_items_ignores_catalog_from_other_schema(
+    git_registry: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    repo_path = fetch_registry(str(git_registry), "main", cache_dir=tmp_path / "cache")
+    first = get_registry_items(repo_path)
+    monkeypatch.setattr(
+        registry_cache, "CATALOG_SCHEMA_VERSION", registry_cache.CATALOG_SCHEMA_VERSION + 1
+    )
+    calls: list[str] = []
+    real_scan = registry._scan_git_registry_items
+
+    def _counting_scan(repo: Path, commit: str) -> list | None:
+        calls.append(commit)
+        return real_scan(repo, commit)
+
+    monkeypatch.setattr(registry, "_scan_git_registry_items", _counting_scan)
+    assert get_registry_items(repo_path) == first
+    snapshot = load_snapshot(repo_path)
+    assert snapshot is not None and calls == [snapshot.commit]
+
+
+def test_get_catalog_is_built_once_per_snapshot(git_registry: Path, tmp_path: Path) -> None:
+    repo_path = fetch_registry(str(git_registry), "main", cache_dir=tmp_path / "cache")
+    catalog = registry.get_catalog(repo_path)
+    assert registry.get_catalog(repo_path) is catalog
+    assert ("rule", "test-rule") in catalog
+
+
+def test_snapshot_catalog_is_read_from_git_objects(
+    git_registry: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    (git_registry / "prompts" / "team").mkdir(parents=True)
+    (git_registry / "prompts" / "team" / "review.md").write_text("Review.\n", encoding="utf-8")
+    (git_registry / "prompts" / "README.md").write_text("# Prompts\n", encoding="utf-8")
+    git_commit_all(git_registry, "prompts")
+    repo_path = fetch_registry(str(git_registry), "main", cache_dir=tmp_path / "cache")
+    walked = registry._scan_registry_items(repo_path)
+
+    def _fail(*args: object, **kwargs: object) -> None:
+        raise AssertionError("the checkout should not be walked")
+
+    monkeypatch.setattr(registry, "_scan_registry_items", _fail)
+    # Files in the checkout are not consulted: only the commit's objects are.
+    (repo_path / "rules" / "test-rule" / "manifest.yaml").unlink()
+    items = registry.load_catalog_items(repo_path)
+    assert sorted(items, key=lambda i: (i.kind, i.id)) == sorted(
+        walked, key=lambda i: (i.kind, i.id)
+    )
+    kinds = [i.kind for i in items]
+    order = [registry.KIND_FROM_DIR[c] for c in registry.REGISTRY_CATEGORIES]
+    assert kinds == sorted(kinds, key=order.index)
+
+
+def test_git_scan_uses_index_json_from_commit(
+    git_registry: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    _path, index = write_registry_index(git_registry)
+    git_commit_all(git_registry, "index")
+    repo_path = fetch_registry(str(git_registry), "main", cache_dir=tmp_path / "cache")
+    snapshot = load_snapshot(repo_path)
+    assert snapshot is not None
+    walked = registry._scan_registry_items(repo_path)
+
+    def _fail(text: bytes) -> dict:
+        raise AssertionError("manifests should come from index.json")
+
+    with monkeypatch.context() as m:
+        m.setattr(registry, "_parse_manifest_text", _fail)
+        items = registry._scan_git_registry_items(repo_path, snapshot.commit)
+    assert items is not None
+    # Same records as the index, in the same order as a walk.
+    assert items == walked
+    assert {(i.kind, i.id) for i in items} == {(i.kind, i.id) for i in index.items}
+
+    # A manifest bumped without rebuilding the index no longer matches its recorded blob id.
+    manifest = git_registry / "rules" / "test-rule" / "manifest.yaml"
+    manifest.write_text(manifest.read_text().replace("1.0.0", "2.0.0"), encoding="utf-8")
+    commit = git_commit_all(git_registry, "bump without build-index")
+    fetch_registry(str(git_registry), "main", cache_dir=tmp_path / "cache")
+    items = registry._scan_git_registry_items(repo_path, commit)
+    assert items is not None
+    assert next(i for i in items if i.id == "test-rule").version == "2.0.0"
+
+
+def test_git_scan_returns_none_for_unknown_commit(git_registry: Path, tmp_path: Path) -> None:
+    repo_path = fetch_registry(str(git_registry), "main", cache_dir=tmp_path / "cache")
+    assert registry._scan_git_registry_items(repo_path, "0" * 40) is None
+
+
+def test_get_registry_items_does_not_cache_plain_directories(registry_root: Path) -> None:
+    get_registry_items(registry_root)
+    assert not catalog_path(registry_root).exists()
+
+
+def test_refresh_patches_catalog_from_git_diff(
+    git_registry: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    url = str(git_registry)
+    cache = tmp_path / "cache"
+    get_registry_items(fetch_registry(url, "main", cache_dir=cache))
+
+    (git_registry / "rules" / "test-rule" / "manifest.yaml").write_text(
+        "version: '2.0.0'\nproject_types: [backend]\n", encoding="utf-8"
+    )
+    (git_registry / "skills" / "test-skill" / "SKILL.md").write_text(
+        "# Content only\n", encoding="utf-8"
+    )
+    subprocess.run(["git", "rm", "-rq", "agents/test-agent"], cwd=git_registry, check=True)
+    (git_registry / "prompts" / "team").mkdir(parents=True)
+    (git_registry / "prompts" / "team" / "review.md").write_text("Review this.\n", encoding="utf-8")
+    git_commit_all(git_registry, "change catalog")
+
+    scans: list[Path] = []
+    real_scan = registry._scan_registry_items
+
+    def _counting_scan(root: Path) -> list:
+        scans.append(root)
+        return real_scan(root)
+
+    monkeypatch.setattr(registry, "_scan_registry_items", _counting_scan)
+    monkeypatch.setattr(registry, "_scan_git_registry_items", _counting_scan)
+    new_path = fetch_registry(url, "main", cache_dir=cache)
+    assert catalog_path(new_path).is_file()
+    items = get_registry_items(new_path)
+    assert scans == []
+
+    by_key = {(i.kind, i.id): i for i in items}
+    assert by_key[("rule", "test-rule")].version == "2.0.0"
+    assert ("agent", "test-agent") not in by_key
+    assert ("prompt", "team/review") in by_key
+    assert sorted(by_key) == sorted((i.kind, i.id) for i in real_scan(new_path))
+
+
+def test_patched_catalog_matches_full_rescan(git_registry: Path, tmp_path: Path) -> None:
+    from forge.core.registry_cache import load_catalog, load_snapshot, mirror_path
+
+    url = str(git_registry)
+    cache = tmp_path / "cache"
+    get_registry_items(fetch_registry(url, "main", cache_dir=cache))
+
+    for item_id in ("aaa-rule", "zzz-rule"):
+        rule_dir = git_registry / "rules" / item_id
+        rule_dir.mkdir()
+        (rule_dir / "manifest.yaml").write_text(
+            "version: '1.0.0'\nproject_types: [backend]\n", encoding="utf-8"
+        )
+    git_commit_all(git_registry, "add rules")
+
+    new_path = fetch_registry(url, "main", cache_dir=cache)
+    snapshot = load_snapshot(new_path)
+    assert snapshot is not None
+    patched = load_catalog(new_path, snapshot.commit)
+    assert patched is not None
+    rescanned = registry._scan_git_registry_items(mirror_path(cache, url), snapshot.commit)
+    assert rescanned is not None
+    assert [(i.kind, i.id) for i in patched] == [(i.kind, i.id) for i in rescanned]
+    kinds = [i.kind for i in patched]
+    assert kinds.index("hook") > max(n for n, k in enumerate(kinds) if k == "rule")
+
+
+def test_cache_lock_is_exclusive(tmp_path: Path) -> None:
+    url = "https://example.com/registry.git"
+    with cache_lock(tmp_path, url):
+        with pytest.raises(RuntimeError, match="Timed out"):
+            with cache_lock(tmp_path, url, timeout=0.1):
+                pass
+    with cache_lock(tmp_path, url, timeout=0.1):
+        pass
+
+
+def test_fetch_registry_parallel_calls_fetch_once(
+    git_registry: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    url = str(git_registry)
+    cache = tmp_path / "cache"
+    calls: list[str] = []
+    real_fetch = registry._fetch_into_mirror
+
+    def _counting_fetch(*args: object, **kwargs: object) -> str:
+        calls.append("fetch")
+        return real_fetch(*args, **kwargs)  # type: ignore[arg-type]
+
+    monkeypatch.setattr(registry, "_fetch_into_mirror", _counting_fetch)
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        paths = list(pool.map(lambda _: fetch_registry(url, "main", cache_dir=cache), range(4)))
+    assert len(set(paths)) == 1
+    assert calls == ["fetch"]
+    assert sorted(r.status for r in get_fetch_reports()) == ["cloned", "hit", "hit", "hit"]
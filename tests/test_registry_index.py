@@ -0,0 +1,104 @@
+"""Tests for the precompiled registry index (forge registry build-index)."""
+
+import json
+from pathlib import Path
+
+from typer.testing import CliRunner
+
+from forge.cli.main import app
+from forge.core.registry import get_registry_items
+from forge.core.registry_index import (
+    INDEX_FILENAME,
+    build_registry_index,
+    is_registry_index_current,
+    load_registry_index,
+    load_verified_registry_index,
+    write_registry_index,
+)
+
+runner = CliRunner()
+
+
+def _keys(items: list) -> set[tuple[str, str]]:
+    return {(i.kind, i.id) for i in items}
+
+
+def test_build_registry_index_matches_walk(registry_root: Path) -> None:
+    index = build_registry_index(registry_root)
+    assert _keys(index.items) == _keys(get_registry_items(registry_root))
+    assert [(i.kind, i.id) for i in index.items] == sorted(_keys(index.items))
+    bundle = next(i for i in index.items if i.kind == "bundle")
+    assert bundle.items is not None and len(bundle.items) == 2
+    assert set(index.content_hashes) == {i.path for i in index.items}
+
+
+def test_content_hash_changes_with_item_files(registry_root: Path) -> None:
+    before = build_registry_index(registry_root).content_hashes
+    (registry_root / "rules" / "test-rule" / "RULE.md").write_text("# Changed\n", encoding="utf-8")
+    after = build_registry_index(registry_root).content_hashes
+    assert after["rules/test-rule"] != before["rules/test-rule"]
+    assert after["skills/test-skill"] == before["skills/test-skill"]
+
+
+def test_verified_index_is_used_only_while_it_matches_the_tree(registry_root: Path) -> None:
+    _path, index = write_registry_index(registry_root)
+    verified = load_verified_registry_index(registry_root)
+    assert verified is not None and [i.to_registry_item() for i in verified] == index.items
+
+    (registry_root / "rules" / "test-rule" / "RULE.md").write_text("# Changed\n", encoding="utf-8")
+    assert load_verified_registry_index(registry_root) is None
+
+    write_registry_index(registry_root)
+    new_rule = registry_root / "rules" / "new-rule"
+    new_rule.mkdir()
+    (new_rule / "manifest.yaml").write_text(
+        "version: '1.0.0'\nproject_types: [backend]\n", encoding="utf-8"
+    )
+    (new_rule / "RULE.md").write_text("# New\n", encoding="utf-8")
+    assert load_verified_registry_index(registry_root) is None
+
+
+def test_directory_registry_ignores_stale_index(registry_root: Path) -> None:
+    write_registry_index(registry_root)
+    new_rule = registry_root / "rules" / "new-rule"
+    new_rule.mkdir()
+    (new_rule / "manifest.yaml").write_text(
+        "version: '1.0.0'\nproject_types: [backend]\n", encoding="utf-8"
+    )
+    assert ("rule", "new-rule") in _keys(get_registry_items(registry_root))
+
+
+def test_invalid_or_other_version_index_falls_back_to_walk(registry_root: Path) -> None:
+    expected = _keys(get_registry_items(registry_root))
+    (registry_root / INDEX_FILENAME).write_text("{not json", encoding="utf-8")
+    assert load_registry_index(registry_root) is None
+    assert _keys(get_registry_items(registry_root)) == expected
+
+    (registry_root / INDEX_FILENAME).write_text(
+        json.dumps({"schema_version": 999, "items": []}), encoding="utf-8"
+    )
+    assert load_registry_index(registry_root) is None
+    assert _keys(get_registry_items(registry_root)) == expected
+
+
+def test_build_index_cli_writes_and_checks(registry_root: Path) -> None:
+    result = runner.invoke(
+        app, ["registry", "build-index", "--check", "--path", str(registry_root)]
+    )
+    assert result.exit_code == 1
+
+    result = runner.invoke(app, ["registry", "build-index", "--path", str(registry_root)])
+    assert result.exit_code == 0
+    assert "6 item(s)" in result.output
+    assert is_registry_index_current(registry_root)
+
+    result = runner.invoke(
+        app, ["registry", "build-index", "--check", "--path", str(registry_root)]
+    )
+    assert result.exit_code == 0
+
+
+def test_build_index_cli_rejects_non_registry(tmp_path: Path) -> None:
+    result = runner.invoke(app, ["registry", "build-index", "--path", str(tmp_path)])
+    assert result.exit_code == 1
+    assert "Not a registry root" in result.output
@@ -0,0 +1,92 @@
+"""Tests for full-text registry search (forge search)."""
+
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from forge.cli.main import app
+from forge.core import search
+from forge.core.registry import fetch_registry
+from forge.core.registry_cache import search_index_path
+from forge.core.search import search_registry, tokenize
+
+runner = CliRunner()
+
+
+def _add_rule(root: Path, item_id: str, description: str, body: str) -> None:
+    rule_dir = root / "rules" / item_id
+    rule_dir.mkdir()
+    (rule_dir / "manifest.yaml").write_text(
+        f"version: '1.0.0'\nproject_types: [backend]\ndescription: {description}\n",
+        encoding="utf-8",
+    )
+    (rule_dir / "RULE.md").write_text(body, encoding="utf-8")
+
+
+def test_tokenize_splits_ids() -> None:
+    assert tokenize("framework-FastAPI_v2/extra.md") == [
+        "framework",
+        "fastapi",
+        "v2",
+        "extra",
+        "md",
+    ]
+
+
+def test_search_ranks_id_matches_first(registry_root: Path) -> None:
+    _add_rule(registry_root, "fastapi-style", "Conventions for web services", "# Style\n")
+    _add_rule(registry_root, "http-errors", "Error handling for FastAPI routes", "# Errors\n")
+    hits = search_registry(registry_root, "fastapi")
+    assert [h.item.id for h in hits] == ["fastapi-style", "http-errors"]
+    assert hits[0].score > hits[1].score
+
+
+def test_search_body_only_when_requested(registry_root: Path) -> None:
+    _add_rule(registry_root, "logging", "Structured logs", "Always include the correlation id.\n")
+    assert search_registry(registry_root, "correlation") == []
+    assert [
+        h.item.id for h in search_registry(registry_root, "correlation", include_body=True)
+    ] == ["logging"]
+
+
+def test_search_filters_kind_and_project_types(registry_root: Path) -> None:
+    assert {h.item.kind for h in search_registry(registry_root, "test")} >= {"rule", "skill"}
+    assert [h.item.id for h in search_registry(registry_root, "test", kind="skill")] == [
+        "test-skill"
+    ]
+    assert [
+        h.item.id for h in search_registry(registry_root, "test", project_types=["frontend"])
+    ] == ["test-skill"]
+
+
+def test_search_index_is_persisted_per_snapshot(
+    git_registry: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    repo_path = fetch_registry(str(git_registry), "main", cache_dir=tmp_path / "cache")
+    first = search_registry(repo_path, "rule")
+    assert search_index_path(repo_path).is_file()
+
+    def _fail(*args: object, **kwargs: object) -> None:
+        raise AssertionError("search index should be loaded, not rebuilt")
+
+    monkeypatch.setattr(search.SearchIndex, "build", _fail)
+    assert search_registry(repo_path, "rule") == first
+
+
+def test_search_cli(registry_root: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    project = tmp_path / "project"
+    (project / ".forge").mkdir(parents=True)
+    (project / ".forge" / "config.yaml").write_text(
+        f"project_types: [backend]\nregistry:\n  url: {registry_root.as_uri()}\n"
+        "  ref: main\ninstalled: []\n",
+        encoding="utf-8",
+    )
+    monkeypatch.chdir(project)
+    result = runner.invoke(app, ["search", "test", "rule"])
+    assert result.exit_code == 0
+    assert result.output.index("test-rule") < result.output.index("test-agent")
+
+    result = runner.invoke(app, ["search", "nothing-matches-this"])
+    assert result.exit_code == 0
+    assert "No items found." in result.output
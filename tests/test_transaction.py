@@ -0,0 +1,302 @@
+"""Tests for staged project changes, the commit journal, recovery, and dry-run plans."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from forge.core import transaction
+from forge.core.install import (
+    MaterializeError,
+    copy_registry_item_to_project,
+    install_item,
+    install_items,
+)
+from forge.core.project import load_config
+from forge.core.registry import fetch_registry, get_registry_item, get_registry_items
+from forge.core.remove import remove_item, remove_member_files
+from forge.core.transaction import (
+    Transaction,
+    clear_change_plans,
+    get_change_plans,
+    recover_transaction,
+)
+from forge.core.update import update_all
+from tests.conftest import git_commit_all
+
+
+def _stage_text(txn: Transaction, dest: Path, text: str) -> None:
+    staged = txn.staging_path()
+    staged.write_text(text, encoding="utf-8")
+    txn.add_write(staged, dest)
+
+
+def test_rollback_leaves_project_untouched(project_root: Path) -> None:
+    before = (project_root / ".forge" / "config.yaml").read_text()
+    rule_md = project_root / ".cursor" / "rules" / "a" / "RULE.md"
+    with Transaction(project_root) as txn:
+        _stage_text(txn, rule_md, "# A\n")
+        assert txn.current(rule_md).read_text() == "# A\n"
+    assert not (project_root / ".cursor").exists()
+    assert not (project_root / ".forge" / "txn").exists()
+    assert (project_root / ".forge" / "config.yaml").read_text() == before
+
+
+def test_commit_applies_writes_deletes_and_config(project_root: Path) -> None:
+    old = project_root / ".cursor" / "rules" / "old"
+    old.mkdir(parents=True)
+    (old / "RULE.md").write_text("# old\n", encoding="utf-8")
+    config = load_config(project_root)
+    assert config is not None
+    config.registry.ref = "v2"
+    with Transaction(project_root) as txn:
+        _stage_text(txn, project_root / ".cursor" / "rules" / "new" / "RULE.md", "# new\n")
+        txn.delete(old)
+        txn.commit(config)
+    assert (project_root / ".cursor" / "rules" / "new" / "RULE.md").read_text() == "# new\n"
+    assert not old.exists()
+    loaded = load_config(project_root)
+    assert loaded is not None and loaded.registry.ref == "v2"
+    assert not (project_root / ".forge" / "txn").exists()
+
+
+def test_interrupted_commit_is_resumed(project_root: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    real_move = transaction._move_into_place
+    moves: list[Path] = []
+
+    def _crash_after_first(staged: Path, dest: Path) -> None:
+        if moves:
+            raise KeyboardInterrupt
+        moves.append(dest)
+        real_move(staged, dest)
+
+    monkeypatch.setattr(transaction, "_move_into_place", _crash_after_first)
+    a = project_root / ".cursor" / "a.md"
+    b = project_root / ".cursor" / "b.md"
+    with pytest.raises(KeyboardInterrupt):
+        with Transaction(project_root) as txn:
+            _stage_text(txn, a, "a\n")
+            _stage_text(txn, b, "b\n")
+            txn.commit()
+    assert a.is_file() and not b.exists()
+    journal = json.loads((project_root / ".forge" / "txn" / "journal.json").read_text())
+    assert [op[0] for op in journal["ops"]] == ["write", "write"]
+
+    monkeypatch.setattr(transaction, "_move_into_place", real_move)
+    assert recover_transaction(project_root) == "resumed"
+    assert a.read_text() == "a\n" and b.read_text() == "b\n"
+    assert recover_transaction(project_root) is None
+
+
+def test_interrupted_staging_is_rolled_back(project_root: Path) -> None:
+    staged = project_root / ".forge" / "txn" / "files" / "1"
+    staged.parent.mkdir(parents=True)
+    staged.write_text("half-written", encoding="utf-8")
+    with Transaction(project_root) as txn:
+        assert txn.recovered == "rolled back"
+        txn.commit()
+    assert not (project_root / ".forge" / "txn").exists()
+
+
+def test_failed_install_changes_nothing(registry_root: Path, project_root: Path) -> None:
+    (registry_root / "skills" / "test-skill" / "SKILL.md").unlink()
+    config = load_config(project_root)
+    assert config is not None
+    items = [i for i in get_registry_items(registry_root) if i.kind in ("rule", "skill")]
+    with pytest.raises(MaterializeError):
+        install_items(registry_root, items, {}, project_root, config, "main")
+    assert not (project_root / ".cursor").exists()
+    loaded = load_config(project_root)
+    assert loaded is not None and loaded.installed == []
+
+
+def test_update_all_writes_config_once(
+    git_registry: Path, project_root: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    from forge.core.project import save_config
+
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+    config = load_config(project_root)
+    assert config is not None
+    config.registry.url = str(git_registry)
+    save_config(project_root, config)
+    items = get_registry_items(git_registry)
+    by_key = {(i.kind, i.id): i for i in items}
+    wanted = [
+        by_key[("rule", "test-rule")],
+        by_key[("agent", "test-agent")],
+        by_key[("bundle", "test-bundle")],
+    ]
+    install_items(git_registry, wanted, by_key, project_root, config, "main")
+
+    writes: list[Path] = []
+    real_write = transaction.write_config_file
+    monkeypatch.setattr(
+        transaction, "write_config_file", lambda path, c: (writes.append(path), real_write(path, c))
+    )
+    updated = update_all(project_root)
+    assert ("bundle", "test-bundle") in updated and ("rule", "test-rule") in updated
+    assert len(writes) == 1
+
+
+def test_dry_run_install_plans_without_writing(registry_root: Path, project_root: Path) -> None:
+    clear_change_plans()
+    config = load_config(project_root)
+    assert config is not None
+    rule = get_registry_item(registry_root, "rule", "test-rule")
+    assert rule is not None
+    install_item(registry_root, rule, project_root, config, "main")
+    rule_md = project_root / ".cursor" / "rules" / "test-rule" / "RULE.md"
+    rule_md.write_text("edited\n", encoding="utf-8")
+    before = (project_root / ".forge" / "config.yaml").read_text()
+
+    items = [i for i in get_registry_items(registry_root) if i.kind in ("rule", "agent")]
+    install_items(registry_root, items, {}, project_root, config, "main", dry_run=True)
+
+    assert rule_md.read_text() == "edited\n"
+    assert not (project_root / ".cursor" / "agents").exists()
+    assert (project_root / ".forge" / "config.yaml").read_text() == before
+    assert not (project_root / ".forge" / "txn").exists()
+    [plan] = get_change_plans()
+    assert [(c.kind, c.id, c.old_version) for c in plan.items] == [("agent", "test-agent", None)]
+    assert plan.create == [".cursor/agents/test-agent.md"]
+    assert plan.overwrite == [".cursor/rules/test-rule/RULE.md"]
+
+
+def test_dry_run_plans_hook_settings_and_removals(
+    registry_root: Path, claude_code_project_root: Path
+) -> None:
+    root = claude_code_project_root
+    config = load_config(root)
+    assert config is not None
+    hook = get_registry_item(registry_root, "hook", "test-hook")
+    assert hook is not None
+    entry = 'PostToolUse: "$CLAUDE_PROJECT_DIR"/.claude/hooks/test-hook.sh'
+
+    with Transaction(root, dry_run=True) as txn:
+        copy_registry_item_to_project(registry_root, hook, root, "claude-code", txn=txn)
+        plan = txn.commit()
+    assert plan is not None
+    assert plan.create == [".claude/hooks/test-hook.sh"]
+    assert plan.hooks_added == [entry]
+    assert not (root / ".claude" / "settings.json").exists()
+
+    install_item(registry_root, hook, root, config, "main")
+    with Transaction(root, dry_run=True) as txn:
+        remove_member_files(root, "hook", "test-hook", "claude-code", txn)
+        plan = txn.commit()
+    assert plan is not None
+    assert plan.delete == [".claude/hooks/test-hook.sh"]
+    assert plan.hooks_removed == [entry]
+    assert remove_item(root, config, "hook", "test-hook", dry_run=True)
+    assert (root / ".claude" / "hooks" / "test-hook.sh").is_file()
+    assert [(i.kind, i.id) for i in load_config(root).installed] == [("hook", "test-hook")]
+
+
+def test_bare_dry_run_plans_lost_exec_bit_without_chmod(
+    git_registry: Path,
+    claude_code_project_root: Path,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    script = git_registry / "hooks" / "test-hook" / "scripts" / "test-hook.sh"
+    script.chmod(0o755)
+    git_commit_all(git_registry, "executable hook")
+    monkeypatch.setenv("FORGE_CACHE_MODE", "bare")
+    bare = fetch_registry(str(git_registry), "main", cache_dir=tmp_path / "cache")
+    root = claude_code_project_root
+    config = load_config(root)
+    assert config is not None
+    hook = get_registry_item(bare, "hook", "test-hook")
+    assert hook is not None
+    install_item(bare, hook, root, config, "main")
+    dest = root / ".claude" / "hooks" / "test-hook.sh"
+    dest.chmod(0o644)
+
+    with Transaction(root, dry_run=True) as txn:
+        copy_registry_item_to_project(bare, hook, root, "claude-code", txn=txn)
+        plan = txn.commit()
+    assert plan is not None
+    assert plan.overwrite == [".claude/hooks/test-hook.sh"]
+    assert dest.stat().st_mode & 0o777 == 0o644
+
+    with Transaction(root) as txn:
+        copy_registry_item_to_project(bare, hook, root, "claude-code", txn=txn)
+        txn.commit()
+    assert dest.stat().st_mode & 0o111
+
+
+def test_lost_exec_bit_is_restored_through_the_journal(
+    registry_root: Path, claude_code_project_root: Path
+) -> None:
+    root = claude_code_project_root
+    config = load_config(root)
+    assert config is not None
+    hook = get_registry_item(registry_root, "hook", "test-hook")
+    assert hook is not None
+    install_item(registry_root, hook, root, config, "main")
+    dest = root / ".claude" / "hooks" / "test-hook.sh"
+    dest.chmod(0o644)
+
+    with Transaction(root, dry_run=True) as txn:
+        copy_registry_item_to_project(registry_root, hook, root, "claude-code", txn=txn)
+        plan = txn.commit()
+    assert plan is not None and plan.overwrite == [".claude/hooks/test-hook.sh"]
+    with pytest.raises(KeyboardInterrupt), Transaction(root) as txn:
+        copy_registry_item_to_project(registry_root, hook, root, "claude-code", txn=txn)
+        raise KeyboardInterrupt
+    assert dest.stat().st_mode & 0o777 == 0o644
+
+    with Transaction(root) as txn:
+        copy_registry_item_to_project(registry_root, hook, root, "claude-code", txn=txn)
+        txn.commit()
+    assert dest.stat().st_mode & 0o111
+
+
+def test_resumed_install_is_kept_by_the_next_run(
+    registry_root: Path, project_root: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    rule = get_registry_item(registry_root, "rule", "test-rule")
+    skill = get_registry_item(registry_root, "skill", "test-skill")
+    assert rule is not None and skill is not None
+
+    def _crash(staged: Path, dest: Path) -> None:
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(transaction, "_move_into_place", _crash)
+    config = load_config(project_root)
+    assert config is not None
+    with pytest.raises(KeyboardInterrupt):
+        install_item(registry_root, rule, project_root, config, "main")
+    monkeypatch.undo()
+
+    # Loaded before the next run recovers the interrupted one: config.yaml lacks the rule.
+    stale = load_config(project_root)
+    assert stale is not None and stale.installed == []
+    install_item(registry_root, skill, project_root, stale, "main")
+
+    loaded = load_config(project_root)
+    assert loaded is not None
+    assert {(i.kind, i.id) for i in loaded.installed} == {
+        ("rule", "test-rule"),
+        ("skill", "test-skill"),
+    }
+    assert (project_root / ".cursor" / "rules" / "test-rule" / "RULE.md").is_file()
+
+
+def test_runs_from_the_same_stale_config_do_not_lose_updates(
+    registry_root: Path, project_root: Path
+) -> None:
+    rule = get_registry_item(registry_root, "rule", "test-rule")
+    agent = get_registry_item(registry_root, "agent", "test-agent")
+    assert rule is not None and agent is not None
+    first, second = load_config(project_root), load_config(project_root)
+    assert first is not None and second is not None
+
+    install_item(registry_root, rule, project_root, first, "main")
+    install_item(registry_root, agent, project_root, second, "main")
+    assert remove_item(project_root, first, "agent", "test-agent")
+
+    loaded = load_config(project_root)
+    assert loaded is not None
+    assert [(i.kind, i.id) for i in loaded.installed] == [("rule", "test-rule")]
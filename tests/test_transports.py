@@ -0,0 +1,114 @@
+"""Tests for directory, archive, and git bundle registry transports."""
+
+import io
+import subprocess
+import tarfile
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from forge.core.registry import fetch_registry, get_registry_items
+from forge.core.registry_cache import clear_fetch_reports, get_fetch_reports
+from forge.core.transports import parse_registry_url
+
+
+@pytest.fixture(autouse=True)
+def _reset_reports() -> None:
+    clear_fetch_reports()
+
+
+def _make_tarball(registry_root: Path, dest: Path) -> Path:
+    with tarfile.open(dest, "w:gz") as tf:
+        tf.add(registry_root, arcname="registry-main")
+    return dest
+
+
+def test_parse_registry_url(tmp_path: Path) -> None:
+    bare = tmp_path / "reg.git"
+    subprocess.run(["git", "init", "-q", "--bare", str(bare)], check=True)
+    assert parse_registry_url("https://github.com/org/reg.git") == ("git", "https://github.com/org/reg.git")
+    assert parse_registry_url("git@github.com:org/reg.git")[0] == "git"
+    assert parse_registry_url(tmp_path.as_uri()) == ("directory", str(tmp_path))
+    assert parse_registry_url(bare.as_uri()) == ("git", bare.as_uri())
+    tarball, zipfile = tmp_path / "reg.tar.gz", tmp_path / "reg.zip"
+    assert parse_registry_url(str(tarball)) == ("archive", str(tarball))
+    assert parse_registry_url(zipfile.as_uri()) == ("archive", str(zipfile))
+    assert parse_registry_url(str(tmp_path / "reg.bundle")) == ("git", str(tmp_path / "reg.bundle"))
+
+
+def test_directory_registry_is_read_in_place(registry_root: Path, tmp_path: Path) -> None:
+    cache = tmp_path / "cache"
+    assert fetch_registry(registry_root.as_uri(), "main", cache_dir=cache) == registry_root
+    assert get_fetch_reports()[-1].status == "local"
+    assert not cache.exists()
+
+
+def test_file_url_to_git_checkout_honours_ref(git_registry: Path, tmp_path: Path) -> None:
+    from tests.conftest import git_commit_all
+
+    rule_md = git_registry / "rules" / "test-rule" / "RULE.md"
+    pinned = rule_md.read_text(encoding="utf-8")
+    subprocess.run(["git", "tag", "v1"], cwd=git_registry, check=True)
+    rule_md.write_text("# v2\n", encoding="utf-8")
+    git_commit_all(git_registry, "v2")
+
+    assert parse_registry_url(git_registry.as_uri())[0] == "git"
+    snapshot = fetch_registry(git_registry.as_uri(), "v1", cache_dir=tmp_path / "cache")
+    assert (snapshot / "rules" / "test-rule" / "RULE.md").read_text(encoding="utf-8") == pinned
+
+
+def test_directory_registry_missing(tmp_path: Path) -> None:
+    with pytest.raises(RuntimeError, match="not found"):
+        fetch_registry((tmp_path / "nope").as_uri(), "main", cache_dir=tmp_path)
+
+
+def test_tarball_registry_extracted_once(registry_root: Path, tmp_path: Path) -> None:
+    archive = _make_tarball(registry_root, tmp_path / "registry.tar.gz")
+    cache = tmp_path / "cache"
+    first = fetch_registry(str(archive), "main", cache_dir=cache)
+    second = fetch_registry(str(archive), "main", cache_dir=cache)
+    assert first == second
+    assert [r.status for r in get_fetch_reports()] == ["extracted", "hit"]
+    assert ("rule", "test-rule") in {(i.kind, i.id) for i in get_registry_items(first)}
+
+    (registry_root / "rules" / "test-rule" / "RULE.md").write_text("# v2\n", encoding="utf-8")
+    _make_tarball(registry_root, archive)
+    third = fetch_registry(str(archive), "main", cache_dir=cache)
+    assert third != first
+    assert (third / "rules" / "test-rule" / "RULE.md").read_text() == "# v2\n"
+
+
+def test_zip_registry(registry_root: Path, tmp_path: Path) -> None:
+    archive = tmp_path / "registry.zip"
+    with zipfile.ZipFile(archive, "w") as zf:
+        for path in registry_root.rglob("*"):
+            if path.is_file():
+                zf.write(path, path.relative_to(registry_root).as_posix())
+    root = fetch_registry(archive.as_uri(), "main", cache_dir=tmp_path / "cache")
+    assert (root / "skills" / "test-skill" / "SKILL.md").exists()
+
+
+def test_tarball_with_unsafe_member_is_rejected(tmp_path: Path) -> None:
+    archive = tmp_path / "evil.tar.gz"
+    with tarfile.open(archive, "w:gz") as tf:
+        data = b"x"
+        info = tarfile.TarInfo("../escape.txt")
+        info.size = len(data)
+        tf.addfile(info, io.BytesIO(data))
+    with pytest.raises(RuntimeError, match="Unsafe"):
+        fetch_registry(str(archive), "main", cache_dir=tmp_path / "cache")
+    assert not (tmp_path / "escape.txt").exists()
+
+
+def test_git_bundle_registry(git_registry: Path, tmp_path: Path) -> None:
+    bundle = tmp_path / "registry.bundle"
+    subprocess.run(
+        ["git", "bundle", "create", str(bundle), "main"],
+        cwd=git_registry,
+        check=True,
+        capture_output=True,
+    )
+    root = fetch_registry(str(bundle), "main", cache_dir=tmp_path / "cache")
+    assert get_fetch_reports()[-1].status == "cloned"
+    assert (root / "rules" / "test-rule" / "RULE.md").exists()